@@ -6,11 +6,44 @@ Contains methods for processing multiple documents in batch mode
 
 import asyncio
 import logging
+import os
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+from typing import (
+    List,
+    Dict,
+    Any,
+    AsyncIterator,
+    Iterable,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+)
 import time
 
 from .batch_parser import BatchParser, BatchProcessingResult
+from .estimator import CorpusEstimate, CorpusEstimator
+from .distributed import (
+    ProcessFile,
+    WorkDirectory,
+    estimate_work,
+    run_local_workers,
+)
+from .events import (
+    FILE_FAILED,
+    FILE_SUCCESS,
+    BatchEvent,
+    FileEvent,
+    stream_file_events,
+)
+from .folder_sync import FolderManifest, ManifestEntry
+from .folder_watch import FolderWatcher
+from .ingest_queue import IngestQueue
+from .pipeline import IngestionPipeline, PipelineJob, PipelineStage
+from .scanner import scan_files
+from .scheduler import WorkScheduler
+from .merge_batch import MultimodalMergeBatch, PendingMultimodalMerge
+from .utils import compute_file_hash, insert_text_content, separate_content
 
 if TYPE_CHECKING:
     from .config import RAGAnythingConfig
@@ -22,10 +55,56 @@ class BatchMixin:
     # Type hints for mixin attributes (will be available when mixed into RAGAnything)
     config: "RAGAnythingConfig"
     logger: logging.Logger
+    working_dir: str
+    lightrag: Any
+    lightrag_kwargs: Dict[str, Any]
+    _work_schedulers: Dict[str, WorkScheduler]
+    _merge_batch: Optional[MultimodalMergeBatch]
 
     # Type hints for methods that will be available from other mixins
     async def _ensure_lightrag_initialized(self) -> None: ...
-    async def process_document_complete(self, file_path: str, **kwargs) -> None: ...
+    async def process_document_complete(self, file_path: str, **kwargs) -> str: ...
+    def storage_unit_of_work(
+        self, policy: str | None = None, batch_size: int | None = None
+    ): ...
+    async def _batch_extract_entities_lightrag_style_type_aware(
+        self, lightrag_chunks: Dict[str, Any]
+    ) -> List[Tuple]: ...
+    async def _batch_add_belongs_to_relations_type_aware(
+        self, chunk_results: List[Tuple], records: List[Any]
+    ) -> List[Tuple]: ...
+    async def _batch_merge_lightrag_style_type_aware(
+        self, enhanced_chunk_results: List[Tuple], file_path: str, doc_id: str = None
+    ) -> None: ...
+    async def _flush_storages(self, *storages) -> None: ...
+    async def parse_document(
+        self,
+        file_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = None,
+        stats: Dict[str, Any] | None = None,
+        **kwargs,
+    ) -> Tuple[List[Dict[str, Any]], str]: ...
+    def parse_process_pool(self, max_workers: int | None = None): ...
+    def _get_file_reference(self, file_path: str) -> str: ...
+    def _begin_document_unit(self, doc_id: str) -> None: ...
+    async def _end_document_unit(self, doc_id: str) -> None: ...
+    async def _is_multimodal_processed(self, doc_id: str) -> bool: ...
+    async def _describe_multimodal_items(
+        self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
+    ) -> Tuple[List[Any], List[str]]: ...
+    async def _store_multimodal_records(
+        self,
+        records: List[Any],
+        checkpoint_keys: List[str],
+        file_path: str,
+        doc_id: str,
+    ) -> None: ...
+    async def _process_multimodal_content_individual(
+        self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
+    ) -> None: ...
+    async def _mark_multimodal_processing_complete(self, doc_id: str) -> None: ...
 
     # ==========================================
     # ORIGINAL BATCH PROCESSING METHOD (RESTORED)
@@ -42,6 +121,9 @@ class BatchMixin:
         file_extensions: Optional[List[str]] = None,
         recursive: bool = None,
         max_workers: int = None,
+        use_queue: bool = None,
+        use_pipeline: bool = None,
+        sync: bool = None,
     ):
         """
         Process all supported files in a folder
@@ -56,6 +138,12 @@ class BatchMixin:
             file_extensions: List of file extensions to process (optional)
             recursive: Whether to process folders recursively (optional)
             max_workers: Maximum number of workers for concurrent processing (optional)
+            use_queue: Ingest through the durable ingestion queue so an interrupted
+                run can be resumed (optional)
+            use_pipeline: Ingest through the staged parse, describe and store
+                pipeline instead of processing whole documents per worker (optional)
+            sync: Only ingest new and changed files and purge deleted ones,
+                using the folder manifest (optional)
         """
         if output_dir is None:
             output_dir = self.config.parser_output_dir
@@ -69,6 +157,26 @@ class BatchMixin:
             recursive = self.config.recursive_folder_processing
         if max_workers is None:
             max_workers = self.config.max_concurrent_files
+        if use_queue is None:
+            use_queue = self.config.use_ingest_queue
+        if use_pipeline is None:
+            use_pipeline = self.config.use_staged_pipeline
+        if sync is None:
+            sync = self.config.use_folder_sync
+
+        if sync:
+            await self.sync_folder(
+                folder_path,
+                output_dir=output_dir,
+                parse_method=parse_method,
+                display_stats=display_stats,
+                split_by_character=split_by_character,
+                split_by_character_only=split_by_character_only,
+                file_extensions=file_extensions,
+                recursive=recursive,
+                max_workers=max_workers,
+            )
+            return
 
         await self._ensure_lightrag_initialized()
 
@@ -77,14 +185,42 @@ class BatchMixin:
         if not folder_path_obj.exists():
             raise FileNotFoundError(f"Folder not found: {folder_path}")
 
-        # Collect files based on supported extensions
-        files_to_process = []
-        for file_ext in file_extensions:
-            if recursive:
-                pattern = f"**/*{file_ext}"
-            else:
-                pattern = f"*{file_ext}"
-            files_to_process.extend(folder_path_obj.glob(pattern))
+        if use_queue:
+            # Files are streamed into the on-disk queue instead of a work list
+            def queued_files():
+                for scanned in scan_files(
+                    folder_path, file_extensions, recursive, with_stat=False
+                ):
+                    yield (
+                        scanned.path,
+                        {
+                            **self._get_folder_file_kwargs(
+                                Path(scanned.path), folder_path_obj, output_dir
+                            ),
+                            "parse_method": parse_method,
+                            "split_by_character": split_by_character,
+                            "split_by_character_only": split_by_character_only,
+                        },
+                    )
+
+            Path(output_dir).mkdir(parents=True, exist_ok=True)
+            with self.open_ingest_queue() as queue:
+                added = await asyncio.to_thread(queue.enqueue, queued_files())
+            self.logger.info(f"Queued {added} new files from {folder_path}")
+            await self.process_queue(
+                max_workers=max_workers, display_stats=display_stats
+            )
+            return
+
+        # Collect files based on supported extensions in one walk of the folder
+        files_to_process = await asyncio.to_thread(
+            lambda: [
+                Path(scanned.path)
+                for scanned in scan_files(
+                    folder_path, file_extensions, recursive, with_stat=False
+                )
+            ]
+        )
 
         if not files_to_process:
             self.logger.warning(f"No supported files found in {folder_path}")
@@ -98,51 +234,128 @@ class BatchMixin:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
-        # Process files with controlled concurrency
-        semaphore = asyncio.Semaphore(max_workers)
-        tasks = []
+        if use_pipeline:
+            # The parse stage sees the long documents first
+            parse_scheduler = self.get_work_scheduler("parse")
+            if parse_scheduler is not None:
+                files_to_process = [
+                    Path(file_path)
+                    for file_path in await asyncio.to_thread(
+                        parse_scheduler.order, map(str, files_to_process)
+                    )
+                ]
+            await self.process_files_pipeline(
+                (
+                    (
+                        str(file_path),
+                        {
+                            **self._get_folder_file_kwargs(
+                                file_path, folder_path_obj, output_dir
+                            ),
+                            "parse_method": parse_method,
+                            "split_by_character": split_by_character,
+                            "split_by_character_only": split_by_character_only,
+                        },
+                    )
+                    for file_path in files_to_process
+                ),
+                display_stats=display_stats,
+            )
+            return
+
+        successful_files, failed_files = await self._process_files_concurrently(
+            [
+                (
+                    str(file_path),
+                    {
+                        **self._get_folder_file_kwargs(
+                            file_path, folder_path_obj, output_dir
+                        ),
+                        "parse_method": parse_method,
+                        "split_by_character": split_by_character,
+                        "split_by_character_only": split_by_character_only,
+                    },
+                )
+                for file_path in files_to_process
+            ],
+            max_workers,
+        )
+
+        # Display statistics if requested
+        if display_stats:
+            self.logger.info("Processing complete!")
+            self.logger.info(f"  Successful: {len(successful_files)} files")
+            self.logger.info(f"  Failed: {len(failed_files)} files")
+            if failed_files:
+                self.logger.warning("Failed files:")
+                for file_path, error in failed_files:
+                    self.logger.warning(f"  - {file_path}: {error}")
+
+    async def _process_files_concurrently(
+        self, files: List[Tuple[str, Dict[str, Any]]], max_workers: int
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """
+        Run process_document_complete for several files with bounded concurrency
+
+        Args:
+            files: List of (file_path, kwargs) pairs
+            max_workers: Maximum number of files processed at once
 
-        async def process_single_file(file_path: Path):
-            async with semaphore:
-                is_in_subdir = (
-                    lambda file_path, dir_path: len(
-                        file_path.relative_to(dir_path).parents
+        Returns:
+            Tuple of (successful file paths, (file path, error) of failed files)
+        """
+        # Start the most expensive files first; the semaphore is FIFO
+        scheduler = self.get_work_scheduler("ingest")
+        if scheduler is not None:
+            rank = {
+                file_path: index
+                for index, file_path in enumerate(
+                    await asyncio.to_thread(
+                        scheduler.order, [file_path for file_path, _ in files]
                     )
-                    > 1
-                )(file_path, folder_path_obj)
+                )
+            }
+            files = sorted(files, key=lambda item: rank[item[0]])
+
+        # Process files with controlled concurrency
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+        tasks = []
 
+        async def process_single_file(file_path: str, kwargs: Dict[str, Any]):
+            async with semaphore, self._merge_batch_member():
                 try:
+                    stats: Dict[str, Any] = {}
+                    start = time.perf_counter()
                     await self.process_document_complete(
-                        str(file_path),
-                        output_dir=(
-                            output_dir
-                            if not is_in_subdir
-                            else str(
-                                output_path
-                                / file_path.parent.relative_to(folder_path_obj)
-                            )
-                        ),
-                        parse_method=parse_method,
-                        split_by_character=split_by_character,
-                        split_by_character_only=split_by_character_only,
-                        file_name=(
-                            None
-                            if not is_in_subdir
-                            else str(file_path.relative_to(folder_path_obj))
-                        ),
+                        file_path, stats=stats, **kwargs
                     )
-                    return True, str(file_path), None
+                    # Cache hits say nothing about the cost of a file, and time
+                    # spent waiting for other documents' merges is not its own
+                    if scheduler is not None and not stats.get("parse_cache_hit"):
+                        scheduler.record(
+                            file_path,
+                            time.perf_counter()
+                            - start
+                            - stats["timings"].get("merge_wait", 0.0),
+                        )
+                    return True, file_path, None
                 except Exception as e:
                     self.logger.error(f"Failed to process {file_path}: {str(e)}")
-                    return False, str(file_path), str(e)
+                    return False, file_path, str(e)
 
-        # Create tasks for all files
-        for file_path in files_to_process:
-            task = asyncio.create_task(process_single_file(file_path))
-            tasks.append(task)
+        # Defer storage flushes according to the configured flush policy and
+        # merge the multimodal content of several documents at once
+        async with self.storage_unit_of_work(), self.multimodal_merge_batch():
+            # Create tasks for all files
+            for file_path, kwargs in files:
+                task = asyncio.create_task(process_single_file(file_path, kwargs))
+                tasks.append(task)
 
-        # Wait for all tasks to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Wait for all tasks to complete
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        if scheduler is not None:
+            await asyncio.to_thread(scheduler.save)
 
         # Process results
         successful_files = []
@@ -156,16 +369,1261 @@ class BatchMixin:
                     successful_files.append(file_path)
                 else:
                     failed_files.append((file_path, error))
+        return successful_files, failed_files
 
-        # Display statistics if requested
+    def get_work_scheduler(self, profile: str = "ingest") -> Optional[WorkScheduler]:
+        """
+        Get the work scheduler that orders batch files by estimated cost
+
+        Args:
+            profile: "ingest" for complete document ingestion or "parse" for
+                parser calls; each is calibrated separately
+
+        Returns:
+            WorkScheduler, or None when largest-first scheduling is disabled
+        """
+        if not self.config.schedule_largest_first:
+            return None
+        scheduler = self._work_schedulers.get(profile)
+        if scheduler is None:
+            calibration_path = self.config.cost_calibration_path or os.path.join(
+                self.working_dir, "raganything_cost_calibration.json"
+            )
+            scheduler = WorkScheduler(calibration_path, profile=profile)
+            self._work_schedulers[profile] = scheduler
+        return scheduler
+
+    def get_corpus_estimator(self) -> CorpusEstimator:
+        """
+        Get a corpus estimator matching the current processing settings
+
+        Returns:
+            CorpusEstimator using the enabled processors, LightRAG chunking and
+            extraction settings, and the configured concurrency
+        """
+
+        def lightrag_setting(name: str, default: Any) -> Any:
+            value = getattr(self.lightrag, name, None)
+            if value is None:
+                value = self.lightrag_kwargs.get(name)
+            return default if value is None else value
+
+        return CorpusEstimator(
+            enable_image_processing=self.config.enable_image_processing,
+            enable_table_processing=self.config.enable_table_processing,
+            enable_equation_processing=self.config.enable_equation_processing,
+            images_per_vlm_call=self.config.page_image_batch_size
+            if self.config.enable_page_image_batching
+            else 1,
+            context_tokens=self.config.max_context_tokens
+            if self.config.context_window > 0
+            else 0,
+            chunk_token_size=lightrag_setting(
+                "chunk_token_size", int(os.getenv("CHUNK_SIZE", 1200))
+            ),
+            entity_extract_max_gleaning=lightrag_setting(
+                "entity_extract_max_gleaning", 1
+            ),
+            max_concurrent_files=self.config.max_concurrent_files,
+            llm_max_async=lightrag_setting(
+                "llm_model_max_async", int(os.getenv("MAX_ASYNC", 4))
+            ),
+            llm_seconds_per_call=self.config.estimate_llm_seconds_per_call,
+            vlm_seconds_per_call=self.config.estimate_vlm_seconds_per_call,
+            staged_pipeline=self.config.use_staged_pipeline,
+            scheduler=self.get_work_scheduler("parse"),
+        )
+
+    async def estimate_folder(
+        self,
+        folder_path: str,
+        file_extensions: Optional[List[str]] = None,
+        recursive: Optional[bool] = None,
+    ) -> CorpusEstimate:
+        """
+        Estimate the content, model calls, tokens and wall time of ingesting a folder
+
+        Files are only probed, not parsed, and nothing is written.
+
+        Args:
+            folder_path: Path to the folder
+            file_extensions: List of file extensions to include (optional)
+            recursive: Whether to include subfolders (optional)
+
+        Returns:
+            CorpusEstimate of the folder
+        """
+        if file_extensions is None:
+            file_extensions = self.config.supported_file_extensions
+        if recursive is None:
+            recursive = self.config.recursive_folder_processing
+        if not Path(folder_path).exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+
+        estimator = self.get_corpus_estimator()
+        estimate = await asyncio.to_thread(
+            lambda: estimator.estimate(
+                scanned.path
+                for scanned in scan_files(
+                    folder_path, file_extensions, recursive, with_stat=False
+                )
+            )
+        )
+        self.logger.info(estimate.summary())
+        return estimate
+
+    @staticmethod
+    def _get_folder_file_kwargs(
+        file_path: Path, folder_path: Path, output_dir: str
+    ) -> Dict[str, Any]:
+        """
+        Get output directory and file name for a file inside a processed folder
+
+        Files in subfolders are parsed into the matching subfolder of output_dir
+        and named by their path relative to the folder.
+
+        Args:
+            file_path: File inside folder_path
+            folder_path: Folder being processed
+            output_dir: Output directory of the folder
+
+        Returns:
+            Dict with output_dir and file_name keyword arguments
+        """
+        if len(file_path.relative_to(folder_path).parents) <= 1:
+            return {"output_dir": output_dir, "file_name": None}
+        return {
+            "output_dir": str(
+                Path(output_dir) / file_path.parent.relative_to(folder_path)
+            ),
+            "file_name": str(file_path.relative_to(folder_path)),
+        }
+
+    # ==========================================
+    # STREAMING BATCH EVENTS
+    # ==========================================
+
+    async def process_files_stream(
+        self,
+        files: Iterable[Tuple[str, Dict[str, Any]]],
+        max_workers: int = None,
+        total: Optional[int] = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        progress_interval: float = None,
+    ) -> AsyncIterator[BatchEvent]:
+        """
+        Process files and yield an event as soon as each one finishes
+
+        File events carry the document ID, per-stage timings (parse, text,
+        multimodal) and content block counts. Progress events with throughput
+        and ETA are yielded periodically and at the end. Set cancel_event, or
+        stop iterating, to cancel the rest of the batch.
+
+        Args:
+            files: Iterable of (file_path, kwargs) pairs for process_document_complete
+            max_workers: Maximum number of files processed at once (optional)
+            total: Number of files, used for the ETA (optional)
+            cancel_event: Event that cancels the rest of the batch (optional)
+            progress_interval: Seconds between progress events (optional)
+
+        Yields:
+            FileEvent per finished file and periodic ProgressEvent
+        """
+        if max_workers is None:
+            max_workers = self.config.max_concurrent_files
+        if progress_interval is None:
+            progress_interval = self.config.progress_interval
+
+        await self._ensure_lightrag_initialized()
+
+        file_kwargs: Dict[str, Dict[str, Any]] = {}
+
+        def file_paths():
+            for file_path, kwargs in files:
+                file_kwargs[str(file_path)] = kwargs or {}
+                yield str(file_path)
+
+        async def process(file_path: str) -> FileEvent:
+            stats: Dict[str, Any] = {}
+            start = time.perf_counter()
+            async with self._merge_batch_member():
+                try:
+                    doc_id = await self.process_document_complete(
+                        file_path, stats=stats, **file_kwargs.pop(file_path)
+                    )
+                except Exception as e:
+                    self.logger.error(f"Failed to process {file_path}: {str(e)}")
+                    status, doc_id, error = FILE_FAILED, None, str(e)
+                else:
+                    status, error = FILE_SUCCESS, None
+            return FileEvent(
+                file_path,
+                status,
+                duration=time.perf_counter() - start,
+                timings=stats.get("timings", {}),
+                blocks=stats.get("blocks", {}),
+                doc_id=doc_id,
+                error=error,
+            )
+
+        async with self.storage_unit_of_work(), self.multimodal_merge_batch():
+            async for event in stream_file_events(
+                file_paths(),
+                process,
+                max_workers=max_workers,
+                total=total,
+                cancel_event=cancel_event,
+                progress_interval=progress_interval,
+            ):
+                yield event
+
+    async def process_folder_stream(
+        self,
+        folder_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        file_extensions: Optional[List[str]] = None,
+        recursive: bool = None,
+        max_workers: int = None,
+        cancel_event: Optional[asyncio.Event] = None,
+        progress_interval: float = None,
+    ) -> AsyncIterator[BatchEvent]:
+        """
+        Streaming variant of process_folder_complete
+
+        Args:
+            folder_path: Path to the folder containing files to process
+            output_dir: Directory for parsed outputs (optional)
+            parse_method: Parsing method to use (optional)
+            split_by_character: Character to split by (optional)
+            split_by_character_only: Whether to split only by character (optional)
+            file_extensions: List of file extensions to process (optional)
+            recursive: Whether to process folders recursively (optional)
+            max_workers: Maximum number of files processed at once (optional)
+            cancel_event: Event that cancels the rest of the batch (optional)
+            progress_interval: Seconds between progress events (optional)
+
+        Yields:
+            FileEvent per finished file and periodic ProgressEvent
+        """
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if file_extensions is None:
+            file_extensions = self.config.supported_file_extensions
+        if recursive is None:
+            recursive = self.config.recursive_folder_processing
+
+        folder_path_obj = Path(folder_path)
+        if not folder_path_obj.exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        files_to_process = await asyncio.to_thread(
+            lambda: [
+                Path(scanned.path)
+                for scanned in scan_files(
+                    folder_path, file_extensions, recursive, with_stat=False
+                )
+            ]
+        )
+
+        async for event in self.process_files_stream(
+            (
+                (
+                    str(file_path),
+                    {
+                        **self._get_folder_file_kwargs(
+                            file_path, folder_path_obj, output_dir
+                        ),
+                        "parse_method": parse_method,
+                        "split_by_character": split_by_character,
+                        "split_by_character_only": split_by_character_only,
+                    },
+                )
+                for file_path in files_to_process
+            ),
+            max_workers=max_workers,
+            total=len(files_to_process),
+            cancel_event=cancel_event,
+            progress_interval=progress_interval,
+        ):
+            yield event
+
+    # ==========================================
+    # DURABLE INGESTION QUEUE
+    # ==========================================
+
+    def open_ingest_queue(self, queue_path: Optional[str] = None) -> IngestQueue:
+        """
+        Open the durable ingestion queue
+
+        Args:
+            queue_path: Path of the queue database (defaults to the working directory)
+
+        Returns:
+            IngestQueue; close it when done
+        """
+        if queue_path is None:
+            queue_path = self.config.ingest_queue_path or os.path.join(
+                self.working_dir, "raganything_ingest_queue.db"
+            )
+        return IngestQueue(
+            queue_path,
+            lease_seconds=self.config.ingest_lease_seconds,
+            max_attempts=self.config.ingest_max_attempts,
+        )
+
+    async def enqueue_files(
+        self,
+        file_paths: List[str],
+        queue_path: Optional[str] = None,
+        requeue_finished: bool = False,
+        **kwargs,
+    ) -> int:
+        """
+        Add files to the durable ingestion queue
+
+        Args:
+            file_paths: Files to ingest
+            queue_path: Path of the queue database (optional)
+            requeue_finished: Ingest files again even if they are done or failed
+            **kwargs: Arguments stored with each job for process_document_complete
+
+        Returns:
+            Number of jobs added or requeued
+        """
+        with self.open_ingest_queue(queue_path) as queue:
+            return await asyncio.to_thread(
+                queue.enqueue,
+                ((str(file_path), kwargs) for file_path in file_paths),
+                requeue_finished,
+            )
+
+    async def process_queue(
+        self,
+        queue_path: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        resume: bool = True,
+        display_stats: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Ingest queued files with a pool of workers leasing jobs from the queue
+
+        Each job is marked done only after process_document_complete returned
+        and, with a deferred flush policy, its writes have been flushed.
+        Failed jobs are retried up to ingest_max_attempts times. Leases are
+        renewed while a job runs, so only jobs of dead workers expire.
+
+        Args:
+            queue_path: Path of the queue database (optional)
+            max_workers: Number of concurrent workers (optional)
+            resume: Return jobs left running by a previous, interrupted run to
+                pending; assumes no other process consumes the queue
+            display_stats: Whether to log statistics at the end
+
+        Returns:
+            Queue statistics after the run
+        """
+        if max_workers is None:
+            max_workers = self.config.max_concurrent_files
+
+        await self._ensure_lightrag_initialized()
+
+        with self.open_ingest_queue(queue_path) as queue:
+            if resume:
+                interrupted = queue.requeue_running()
+                if interrupted:
+                    self.logger.info(
+                        f"Resuming {interrupted} jobs interrupted in a previous run"
+                    )
+
+            stats_interval = max(1, self.config.ingest_stats_interval)
+            finished = 0
+
+            async def renew_lease(job):
+                while True:
+                    await asyncio.sleep(max(1.0, queue.lease_seconds / 3))
+                    await asyncio.to_thread(queue.renew, job)
+
+            async def complete_job(job, renewer):
+                renewer.cancel()
+                await asyncio.to_thread(queue.complete, job)
+
+            async def worker(worker_id: str, unit_of_work):
+                nonlocal finished
+                while True:
+                    job = await asyncio.to_thread(queue.lease, worker_id)
+                    if job is None:
+                        return
+
+                    renewer = asyncio.create_task(renew_lease(job))
+                    try:
+                        async with self._merge_batch_member():
+                            doc_id = await self.process_document_complete(
+                                job.file_path, **job.payload
+                            )
+                    except Exception as e:
+                        renewer.cancel()
+                        retry = await asyncio.to_thread(queue.fail, job, str(e))
+                        self.logger.error(
+                            f"Failed to process {job.file_path} "
+                            f"(attempt {job.attempts}"
+                            f"{', will retry' if retry else ', giving up'}): {e}"
+                        )
+                    except BaseException:
+                        renewer.cancel()
+                        raise
+                    else:
+                        if unit_of_work is None:
+                            await complete_job(job, renewer)
+                        else:
+                            # A job is done only once the document's writes are
+                            # durable; until then its lease is kept and a crash
+                            # leaves it running, so it is resumed
+                            await unit_of_work.when_durable(
+                                doc_id,
+                                lambda job=job, renewer=renewer: complete_job(
+                                    job, renewer
+                                ),
+                            )
+
+                    finished += 1
+                    if finished % stats_interval == 0:
+                        await asyncio.to_thread(queue.log_stats)
+
+            async with self.storage_unit_of_work() as unit_of_work:
+                async with self.multimodal_merge_batch():
+                    await asyncio.gather(
+                        *(
+                            worker(f"{os.getpid()}-{index}", unit_of_work)
+                            for index in range(max(1, max_workers))
+                        )
+                    )
+
+            stats = queue.get_stats()
+            if display_stats:
+                self.logger.info("Queue processing complete!")
+                self.logger.info(f"  Done: {stats['done']} files")
+                self.logger.info(f"  Failed: {stats['failed']} files")
+                for file_path, error in queue.failed_jobs():
+                    self.logger.warning(f"  - {file_path}: {error}")
+
+        return stats
+
+    # ==========================================
+    # DISTRIBUTED FOLDER INGESTION
+    # ==========================================
+
+    def process_folder_distributed(
+        self,
+        folder_path: str,
+        work_dir: Optional[str] = None,
+        num_workers: Optional[int] = None,
+        output_dir: Optional[str] = None,
+        parse_method: Optional[str] = None,
+        file_extensions: Optional[List[str]] = None,
+        recursive: Optional[bool] = None,
+        worker_index_offset: int = 0,
+        total_workers: Optional[int] = None,
+        poll_interval: float = 5.0,
+        process_file: Optional[ProcessFile] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ingest a folder with several worker processes sharing a work directory
+
+        The first call creates the manifest of the work directory: every file
+        with its estimated cost, split largest-first into one bin per worker.
+        Worker processes are then forked on this host; they claim files with
+        lock files, steal files from other bins once their own is empty and
+        take over the claims of crashed workers. Running the same call again
+        resumes the work recorded in the directory.
+
+        To spread the work over several hosts, share the work directory and
+        the input folder at the same paths, use LightRAG storage backends
+        shared between the hosts, and call this on every host with the same
+        total_workers and a distinct worker_index_offset.
+
+        Must be called before this instance initializes its LightRAG storages,
+        and from synchronous code, since the workers are forked.
+
+        Args:
+            folder_path: Path to the folder containing files to process
+            work_dir: Shared work directory (defaults to the working directory)
+            num_workers: Number of worker processes on this host (optional)
+            output_dir: Directory for parsed outputs (optional)
+            parse_method: Parsing method to use (optional)
+            file_extensions: List of file extensions to process (optional)
+            recursive: Whether to process folders recursively (optional)
+            worker_index_offset: Index of the first worker on this host
+            total_workers: Number of workers on all hosts (defaults to num_workers)
+            poll_interval: Seconds between checks while other workers finish
+            process_file: Coroutine function called with the file path and the
+                process_document_complete arguments instead of it (optional)
+
+        Returns:
+            Dict with file counts by state, errors and per-worker stats
+        """
+        if work_dir is None:
+            work_dir = self.config.distributed_work_dir or os.path.join(
+                self.working_dir, "raganything_distributed"
+            )
+        if num_workers is None:
+            num_workers = self.config.distributed_workers
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if file_extensions is None:
+            file_extensions = self.config.supported_file_extensions
+        if recursive is None:
+            recursive = self.config.recursive_folder_processing
+        if total_workers is None:
+            total_workers = num_workers
+
+        if not Path(folder_path).exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+
+        work = WorkDirectory(work_dir, lease_seconds=self.config.claim_lease_seconds)
+        if not os.path.exists(work.manifest_path):
+            scheduler = self.get_work_scheduler("ingest") or WorkScheduler(
+                profile="ingest"
+            )
+            files = estimate_work(
+                (
+                    scanned.path
+                    for scanned in scan_files(
+                        folder_path, file_extensions, recursive, with_stat=False
+                    )
+                ),
+                total_workers,
+                scheduler,
+            )
+            created = work.create_manifest(
+                files,
+                total_workers,
+                options={
+                    "folder_path": os.path.abspath(folder_path),
+                    "output_dir": os.path.abspath(output_dir),
+                    "parse_method": parse_method,
+                },
+            )
+            if created:
+                self.logger.info(
+                    f"Created work manifest with {len(files)} files "
+                    f"for {total_workers} workers in {work.path}"
+                )
+
+        manifest = work.load_manifest()
+        if os.path.abspath(folder_path) != manifest["options"].get("folder_path"):
+            self.logger.warning(
+                f"Work directory {work.path} was created for "
+                f"{manifest['options'].get('folder_path')}, not {folder_path}"
+            )
+
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        worker_stats = run_local_workers(
+            self,
+            work,
+            num_workers,
+            worker_index_offset=worker_index_offset,
+            poll_interval=poll_interval,
+            process_file=process_file,
+        )
+
+        stats = work.get_stats()
+        stats["workers"] = worker_stats
+        self.logger.info("Distributed processing complete!")
+        self.logger.info(f"  Successful: {stats['successful']} files")
+        self.logger.info(f"  Failed: {stats['failed']} files")
+        for worker in worker_stats:
+            self.logger.info(
+                f"  Worker {worker['worker']}: {worker['processed']} processed, "
+                f"{worker['stolen']} stolen, {worker['recovered']} recovered, "
+                f"{worker['lost']} lost, {worker['busy_seconds']:.1f}s busy"
+            )
+        for file_path, error in stats["errors"].items():
+            self.logger.warning(f"  - {file_path}: {error}")
+        return stats
+
+    # ==========================================
+    # INCREMENTAL FOLDER SYNC
+    # ==========================================
+
+    def open_folder_manifest(
+        self, manifest_path: Optional[str] = None
+    ) -> FolderManifest:
+        """
+        Open the folder manifest used by sync_folder
+
+        Args:
+            manifest_path: Path of the manifest database (defaults to the working directory)
+
+        Returns:
+            FolderManifest; close it when done
+        """
+        if manifest_path is None:
+            manifest_path = self.config.folder_manifest_path or os.path.join(
+                self.working_dir, "raganything_folder_manifest.db"
+            )
+        return FolderManifest(manifest_path)
+
+    async def _purge_document(self, doc_id: str) -> bool:
+        """
+        Delete a document's chunks, graph contributions and status
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            True if the document was deleted or did not exist
+        """
+        try:
+            result = await self.lightrag.adelete_by_doc_id(doc_id)
+        except Exception as e:
+            self.logger.error(f"Failed to purge document {doc_id}: {e}")
+            return False
+
+        if result.status not in ("success", "not_found"):
+            self.logger.error(f"Failed to purge document {doc_id}: {result.message}")
+            return False
+        return True
+
+    async def sync_folder(
+        self,
+        folder_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        display_stats: bool = True,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        file_extensions: Optional[List[str]] = None,
+        recursive: bool = None,
+        max_workers: int = None,
+        manifest_path: Optional[str] = None,
+        purge_deleted: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Bring the knowledge base in line with a folder
+
+        Compares the folder with its manifest, ingests new and changed files
+        and purges the documents of deleted files and the previous documents
+        of changed files. Unchanged files are recognized by size and
+        modification time and are never opened. A file that fails to ingest
+        keeps its previous manifest entry, so the next sync retries it.
+
+        Args:
+            folder_path: Path to the folder to synchronize
+            output_dir: Directory for parsed outputs (optional)
+            parse_method: Parsing method to use (optional)
+            display_stats: Whether to log statistics at the end
+            split_by_character: Character to split by (optional)
+            split_by_character_only: Whether to split only by character (optional)
+            file_extensions: List of file extensions to include (optional)
+            recursive: Whether to include subfolders (optional)
+            max_workers: Maximum number of files ingested concurrently (optional)
+            manifest_path: Path of the manifest database (optional)
+            purge_deleted: Whether to delete the documents of removed files
+
+        Returns:
+            Dict with counts of added, modified, deleted, unchanged and failed files
+        """
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if file_extensions is None:
+            file_extensions = self.config.supported_file_extensions
+        if recursive is None:
+            recursive = self.config.recursive_folder_processing
+        if max_workers is None:
+            max_workers = self.config.max_concurrent_files
+
+        folder_path_obj = Path(folder_path)
+        if not folder_path_obj.exists():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+        root = str(folder_path_obj.resolve())
+
+        await self._ensure_lightrag_initialized()
+
+        with self.open_folder_manifest(manifest_path) as manifest:
+            delta = await asyncio.to_thread(
+                manifest.compute_delta, root, file_extensions, recursive
+            )
+            manifest.record(root, delta.touched)
+            self.logger.info(
+                f"Folder sync of {folder_path}: {len(delta.added)} new, "
+                f"{len(delta.modified)} changed, {len(delta.deleted)} deleted, "
+                f"{delta.unchanged + len(delta.touched)} unchanged"
+            )
+
+            purged = 0
+            failed_files = []
+            if purge_deleted:
+                # LightRAG allows only one deletion at a time
+                for entry in delta.deleted:
+                    manifest.remove([entry.path])
+                    if not entry.doc_id or manifest.is_doc_referenced(entry.doc_id):
+                        continue
+                    if await self._purge_document(entry.doc_id):
+                        purged += 1
+                    else:
+                        # Keep the entry so the next sync retries the purge
+                        manifest.record(root, [entry])
+
+            to_ingest = [(entry, None) for entry in delta.added] + delta.modified
+            replaced = []
+            semaphore = asyncio.Semaphore(max(1, max_workers))
+
+            async def record_entry(
+                entry: ManifestEntry, previous: Optional[ManifestEntry]
+            ):
+                await asyncio.to_thread(manifest.record, root, [entry])
+                if previous is not None and previous.doc_id != entry.doc_id:
+                    replaced.append(previous.doc_id)
+
+            async def ingest(
+                entry: ManifestEntry,
+                previous: Optional[ManifestEntry],
+                unit_of_work,
+            ):
+                async with semaphore, self._merge_batch_member():
+                    try:
+                        if entry.content_hash is None:
+                            entry.content_hash = await asyncio.to_thread(
+                                compute_file_hash, entry.path
+                            )
+                        entry.doc_id = await self.process_document_complete(
+                            entry.path,
+                            **self._get_folder_file_kwargs(
+                                Path(entry.path), Path(root), output_dir
+                            ),
+                            parse_method=parse_method,
+                            split_by_character=split_by_character,
+                            split_by_character_only=split_by_character_only,
+                        )
+                    except Exception as e:
+                        self.logger.error(f"Failed to sync {entry.path}: {e}")
+                        failed_files.append((entry.path, str(e)))
+                        return
+
+                    if unit_of_work is None:
+                        await record_entry(entry, previous)
+                    else:
+                        # An entry recorded before the document's writes are
+                        # durable would hide the file from the next sync after a crash
+                        await unit_of_work.when_durable(
+                            entry.doc_id,
+                            lambda entry=entry, previous=previous: record_entry(
+                                entry, previous
+                            ),
+                        )
+
+            if to_ingest:
+                async with self.storage_unit_of_work() as unit_of_work:
+                    async with self.multimodal_merge_batch():
+                        await asyncio.gather(
+                            *(
+                                ingest(entry, previous, unit_of_work)
+                                for entry, previous in to_ingest
+                            )
+                        )
+
+            # Purged after the new version is stored, so a failed update keeps the old one
+            for doc_id in replaced:
+                if (
+                    doc_id
+                    and not manifest.is_doc_referenced(doc_id)
+                    and await self._purge_document(doc_id)
+                ):
+                    purged += 1
+
+        stats = {
+            "added": len(delta.added),
+            "modified": len(delta.modified),
+            "deleted": len(delta.deleted),
+            "unchanged": delta.unchanged + len(delta.touched),
+            "purged_documents": purged,
+            "failed": len(failed_files),
+        }
         if display_stats:
-            self.logger.info("Processing complete!")
+            self.logger.info("Folder sync complete!")
+            for name, count in stats.items():
+                self.logger.info(f"  {name.replace('_', ' ').capitalize()}: {count}")
+            for file_path, error in failed_files:
+                self.logger.warning(f"  - {file_path}: {error}")
+        return stats
+
+    # ==========================================
+    # CONTINUOUS FOLDER WATCHING
+    # ==========================================
+
+    async def watch_folder(
+        self,
+        folder_path: str,
+        output_dir: str = None,
+        parse_method: str = None,
+        split_by_character: str | None = None,
+        split_by_character_only: bool = False,
+        file_extensions: Optional[List[str]] = None,
+        recursive: bool = None,
+        max_workers: int = None,
+        stop_event: Optional[asyncio.Event] = None,
+        process_existing: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Ingest files as they arrive in a folder until stop_event is set
+
+        Arrivals are detected with inotify where available and by polling
+        directory modification times otherwise, so the tree is never rescanned
+        as a whole. Files are ingested once they stopped changing for
+        watch_debounce_seconds, in batches of up to watch_batch_size files,
+        each batch with its own storage unit of work and merge batch.
+
+        Args:
+            folder_path: Folder to watch
+            output_dir: Directory for parsed outputs (optional)
+            parse_method: Parsing method to use (optional)
+            split_by_character: Character to split by (optional)
+            split_by_character_only: Whether to split only by character (optional)
+            file_extensions: List of file extensions to ingest (optional)
+            recursive: Whether to watch subfolders (optional)
+            max_workers: Maximum number of files ingested concurrently (optional)
+            stop_event: Event that stops the watch; runs until cancelled if None
+            process_existing: Also ingest the files present when the watch starts
+
+        Returns:
+            Dict with the number of batches, ingested files and failed files
+        """
+        if output_dir is None:
+            output_dir = self.config.parser_output_dir
+        if parse_method is None:
+            parse_method = self.config.parse_method
+        if file_extensions is None:
+            file_extensions = self.config.supported_file_extensions
+        if recursive is None:
+            recursive = self.config.recursive_folder_processing
+        if max_workers is None:
+            max_workers = self.config.max_concurrent_files
+
+        folder_path_obj = Path(folder_path).resolve()
+        if not folder_path_obj.is_dir():
+            raise FileNotFoundError(f"Folder not found: {folder_path}")
+
+        await self._ensure_lightrag_initialized()
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        watcher = FolderWatcher(
+            str(folder_path_obj),
+            file_extensions,
+            recursive=recursive,
+            debounce_seconds=self.config.watch_debounce_seconds,
+            poll_interval=self.config.watch_poll_interval,
+            batch_size=self.config.watch_batch_size,
+            batch_window=self.config.watch_batch_window,
+            use_inotify=self.config.watch_use_inotify,
+        )
+        initial_files = []
+        if process_existing:
+            initial_files = await asyncio.to_thread(
+                lambda: [
+                    scanned.path
+                    for scanned in scan_files(
+                        folder_path_obj, file_extensions, recursive, with_stat=False
+                    )
+                ]
+            )
+
+        stats = {"batches": 0, "successful": 0, "failed": 0}
+        async for batch in watcher.batches(stop_event, initial_files):
+            self.logger.info(f"Ingesting {len(batch)} new files from {folder_path}")
+            successful_files, failed_files = await self._process_files_concurrently(
+                [
+                    (
+                        file_path,
+                        {
+                            **self._get_folder_file_kwargs(
+                                Path(file_path), folder_path_obj, output_dir
+                            ),
+                            "parse_method": parse_method,
+                            "split_by_character": split_by_character,
+                            "split_by_character_only": split_by_character_only,
+                        },
+                    )
+                    for file_path in batch
+                ],
+                max_workers,
+            )
+            stats["batches"] += 1
+            stats["successful"] += len(successful_files)
+            stats["failed"] += len(failed_files)
+            for file_path, error in failed_files:
+                self.logger.warning(f"  - {file_path}: {error}")
+
+        self.logger.info(
+            f"Stopped watching {folder_path}: {stats['successful']} files ingested, "
+            f"{stats['failed']} failed in {stats['batches']} batches"
+        )
+        return stats
+
+    # ==========================================
+    # STAGED INGESTION PIPELINE
+    # ==========================================
+
+    async def process_files_pipeline(
+        self,
+        files: Iterable[Tuple[str, Dict[str, Any]]],
+        display_stats: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Ingest files through separate parse, describe and store stages
+
+        Parsing runs in a thread or process pool, multimodal description and
+        text insertion run as LLM-bound asyncio workers, and storage plus the
+        knowledge graph merge run in their own workers. The stages are
+        connected by bounded queues, so a slow stage pauses the ones feeding
+        it instead of letting parsed documents pile up in memory.
+
+        Args:
+            files: Iterable of (file_path, kwargs) pairs; kwargs are the
+                arguments process_document_complete would receive
+            display_stats: Whether to log statistics at the end
+
+        Returns:
+            Dict with successful files, failed files and per-stage pipeline stats
+        """
+        await self._ensure_lightrag_initialized()
+        parse_scheduler = self.get_work_scheduler("parse")
+
+        async def parse(job: PipelineJob):
+            parser_kwargs = dict(job.kwargs)
+            output_dir = (
+                parser_kwargs.pop("output_dir", None) or self.config.parser_output_dir
+            )
+            parse_method = parser_kwargs.pop("parse_method", None)
+            doc_id = parser_kwargs.pop("doc_id", None)
+            file_name = parser_kwargs.pop("file_name", None)
+            job.state["split_by_character"] = parser_kwargs.pop(
+                "split_by_character", None
+            )
+            job.state["split_by_character_only"] = parser_kwargs.pop(
+                "split_by_character_only", False
+            )
+            display = parser_kwargs.pop("display_stats", None)
+
+            parse_stats: Dict[str, Any] = {}
+            start = time.perf_counter()
+            content_list, content_based_doc_id = await self.parse_document(
+                job.file_path,
+                output_dir,
+                parse_method,
+                display,
+                stats=parse_stats,
+                **parser_kwargs,
+            )
+            # Results served from the parse cache say nothing about the cost
+            if parse_scheduler is not None and not parse_stats.get("parse_cache_hit"):
+                parse_scheduler.record(job.file_path, time.perf_counter() - start)
+            text_content, multimodal_items = separate_content(content_list)
+            job.state.update(
+                doc_id=doc_id or content_based_doc_id,
+                file_name=file_name or self._get_file_reference(job.file_path),
+                content_list=content_list,
+                text_content=text_content,
+                multimodal_items=multimodal_items,
+            )
+
+        async def describe(job: PipelineJob):
+            state = job.state
+            doc_id = state["doc_id"]
+            self._begin_document_unit(doc_id)
+
+            # Set per task, so documents described concurrently keep their own context
+            if state["multimodal_items"] and hasattr(
+                self, "set_content_source_for_context"
+            ):
+                self.set_content_source_for_context(
+                    state["content_list"], self.config.content_format
+                )
+
+            if state["text_content"].strip():
+                await insert_text_content(
+                    self.lightrag,
+                    input=state["text_content"],
+                    file_paths=state["file_name"],
+                    split_by_character=state["split_by_character"],
+                    split_by_character_only=state["split_by_character_only"],
+                    ids=doc_id,
+                )
+
+            state["records"] = None
+            if not state["multimodal_items"] or await self._is_multimodal_processed(
+                doc_id
+            ):
+                state["multimodal_items"] = []
+                return
+
+            try:
+                state["records"] = await self._describe_multimodal_items(
+                    state["multimodal_items"], state["file_name"], doc_id
+                )
+            except Exception as e:
+                # The store stage falls back to individual processing
+                self.logger.error(
+                    f"Error describing multimodal content of {job.file_path}: {e}"
+                )
+
+        async def store(job: PipelineJob):
+            state = job.state
+            doc_id = state["doc_id"]
+            multimodal_items = state.pop("multimodal_items")
+            described = state.pop("records")
+            state.pop("content_list")
+            state.pop("text_content")
+
+            async with self._merge_batch_member():
+                if multimodal_items:
+                    try:
+                        if described is None:
+                            raise RuntimeError("multimodal description failed")
+                        records, checkpoint_keys = described
+                        if records:
+                            await self._store_multimodal_records(
+                                records, checkpoint_keys, state["file_name"], doc_id
+                            )
+                    except Exception as e:
+                        self.logger.warning(
+                            f"Falling back to individual multimodal processing "
+                            f"for {job.file_path}: {e}"
+                        )
+                        await self._process_multimodal_content_individual(
+                            multimodal_items, state["file_name"], doc_id
+                        )
+                await self._mark_multimodal_processing_complete(doc_id)
+            await self._end_document_unit(doc_id)
+
+        # Documents only join a merge batch while they are in the store stage,
+        # so it needs at least one worker per document of a batch
+        store_workers = max(
+            self.config.pipeline_store_workers,
+            self.config.multimodal_merge_batch_size,
+        )
+        pipeline = IngestionPipeline(
+            [
+                PipelineStage("parse", parse, self.config.pipeline_parse_workers),
+                PipelineStage(
+                    "describe", describe, self.config.pipeline_describe_workers
+                ),
+                PipelineStage("store", store, store_workers),
+            ],
+            queue_size=self.config.pipeline_queue_size,
+        )
+
+        use_process_pool = self.config.parse_executor.lower() == "process"
+        async with AsyncExitStack() as stack:
+            if use_process_pool:
+                await stack.enter_async_context(self.parse_process_pool())
+            await stack.enter_async_context(self.storage_unit_of_work())
+            await stack.enter_async_context(self.multimodal_merge_batch())
+            jobs = await pipeline.run(
+                PipelineJob(str(file_path), kwargs or {}) for file_path, kwargs in files
+            )
+
+        if parse_scheduler is not None:
+            await asyncio.to_thread(parse_scheduler.save)
+
+        successful_files = [job.file_path for job in jobs if job.error is None]
+        failed_files = [
+            (job.file_path, f"{job.failed_stage}: {job.error}")
+            for job in jobs
+            if job.error is not None
+        ]
+        stats = pipeline.get_stats()
+
+        if display_stats:
+            self.logger.info("Pipeline processing complete!")
             self.logger.info(f"  Successful: {len(successful_files)} files")
             self.logger.info(f"  Failed: {len(failed_files)} files")
-            if failed_files:
-                self.logger.warning("Failed files:")
-                for file_path, error in failed_files:
-                    self.logger.warning(f"  - {file_path}: {error}")
+            for name, stage in stats["stages"].items():
+                self.logger.info(
+                    f"  Stage {name}: {stage['processed']} processed, "
+                    f"{stage['concurrency']} workers, "
+                    f"{stage['utilization']:.0%} utilized, "
+                    f"{stage['blocked_seconds']:.1f}s blocked"
+                )
+            for file_path, error in failed_files:
+                self.logger.warning(f"  - {file_path}: {error}")
+
+        return {
+            "successful_files": successful_files,
+            "failed_files": failed_files,
+            "pipeline": stats,
+        }
+
+    # ==========================================
+    # CROSS-DOCUMENT MULTIMODAL MERGE BATCHING
+    # ==========================================
+
+    @asynccontextmanager
+    async def multimodal_merge_batch(self, batch_size: int | None = None):
+        """
+        Merge the multimodal content of several documents together
+
+        Inside the context, documents stop after storing their multimodal chunks
+        and wait for a combined entity extraction and knowledge graph merge that
+        covers every document of the batch. The number of merges then grows with
+        the number of batches instead of the number of documents.
+
+        Args:
+            batch_size: Documents per merge (defaults to config.multimodal_merge_batch_size)
+
+        Yields:
+            Active MultimodalMergeBatch, or None when batching is disabled
+        """
+        if batch_size is None:
+            batch_size = self.config.multimodal_merge_batch_size
+
+        if self._merge_batch is not None or batch_size <= 1:
+            yield self._merge_batch
+            return
+
+        self._merge_batch = MultimodalMergeBatch(
+            self._merge_multimodal_batch, batch_size
+        )
+        try:
+            yield self._merge_batch
+        finally:
+            merge_batch = self._merge_batch
+            self._merge_batch = None
+            await merge_batch.flush()
+            self.logger.info(
+                f"Merged multimodal content of {merge_batch.merged_documents} documents "
+                f"in {merge_batch.merge_count} batches"
+            )
+
+    @asynccontextmanager
+    async def _merge_batch_member(self):
+        """Track a document in the active merge batch, if any"""
+        if self._merge_batch is None:
+            yield
+            return
+
+        async with self._merge_batch.member():
+            yield
+
+    async def _merge_multimodal_batch(self, batch: List[PendingMultimodalMerge]):
+        """
+        Run entity extraction and graph merge for the multimodal chunks of a batch
+
+        Args:
+            batch: Documents whose multimodal chunks are already stored
+        """
+        combined_chunks = {}
+        combined_records = []
+        chunk_to_doc = {}
+        for pending in batch:
+            combined_chunks.update(pending.lightrag_chunks)
+            combined_records.extend(pending.records)
+            for chunk_id in pending.lightrag_chunks:
+                chunk_to_doc[chunk_id] = pending.doc_id
+
+        self.logger.info(
+            f"Merging multimodal content of {len(batch)} documents "
+            f"({len(combined_chunks)} chunks)"
+        )
+
+        # Stage 4: One entity relation extraction for all documents
+        chunk_results = await self._batch_extract_entities_lightrag_style_type_aware(
+            combined_chunks
+        )
+
+        # Stage 5: Add belongs_to relations (multimodal-specific)
+        enhanced_chunk_results = await self._batch_add_belongs_to_relations_type_aware(
+            chunk_results, combined_records
+        )
+
+        # Record per-document entity and relation lists before the graph changes,
+        # since a merge without doc_id does not write them
+        await self._update_full_kg_indexes(
+            enhanced_chunk_results, chunk_to_doc, [p.doc_id for p in batch]
+        )
+
+        # Stage 6: One graph merge for all documents
+        await self._batch_merge_lightrag_style_type_aware(
+            enhanced_chunk_results, f"{len(batch)} documents", doc_id=None
+        )
+
+    async def _update_full_kg_indexes(
+        self,
+        chunk_results: List[Tuple],
+        chunk_to_doc: Dict[str, str],
+        doc_ids: List[str],
+    ):
+        """
+        Add extracted entities and relations to full_entities/full_relations per document
+
+        Args:
+            chunk_results: List of (maybe_nodes, maybe_edges) per chunk
+            chunk_to_doc: Mapping from chunk ID to document ID
+            doc_ids: Document IDs of the batch
+        """
+        doc_entities = {doc_id: set() for doc_id in doc_ids}
+        doc_relations = {doc_id: set() for doc_id in doc_ids}
+
+        for maybe_nodes, maybe_edges in chunk_results:
+            chunk_id = None
+            for records in list(maybe_nodes.values()) + list(maybe_edges.values()):
+                if records:
+                    chunk_id = records[0].get("source_id")
+                    break
+
+            doc_id = chunk_to_doc.get(chunk_id)
+            if doc_id is None:
+                continue
+
+            doc_entities[doc_id].update(maybe_nodes.keys())
+            for src_id, tgt_id in maybe_edges.keys():
+                doc_entities[doc_id].update((src_id, tgt_id))
+                doc_relations[doc_id].add(tuple(sorted((src_id, tgt_id))))
+
+        existing_entities = await self.lightrag.full_entities.get_by_ids(doc_ids)
+        existing_relations = await self.lightrag.full_relations.get_by_ids(doc_ids)
+        update_time = int(time.time())
+
+        entities_data = {}
+        relations_data = {}
+        for doc_id, entity_entry, relation_entry in zip(
+            doc_ids, existing_entities, existing_relations
+        ):
+            entity_names = doc_entities[doc_id]
+            if entity_entry:
+                entity_names |= set(entity_entry.get("entity_names", []))
+
+            relation_pairs = doc_relations[doc_id]
+            if relation_entry:
+                relation_pairs |= {
+                    tuple(pair) for pair in relation_entry.get("relation_pairs", [])
+                }
+
+            entities_data[doc_id] = {
+                "entity_names": sorted(entity_names),
+                "count": len(entity_names),
+                "update_time": update_time,
+            }
+            relations_data[doc_id] = {
+                "relation_pairs": [list(pair) for pair in sorted(relation_pairs)],
+                "count": len(relation_pairs),
+                "update_time": update_time,
+            }
+
+        await self.lightrag.full_entities.upsert(entities_data)
+        await self.lightrag.full_relations.upsert(relations_data)
+        await self._flush_storages(
+            self.lightrag.full_entities, self.lightrag.full_relations
+        )
 
     # ==========================================
     # NEW ENHANCED BATCH PROCESSING METHODS
@@ -212,6 +1670,10 @@ class BatchMixin:
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            executor=self.config.parse_executor,
+            max_tasks_per_worker=self.config.parser_max_tasks_per_worker or None,
+            scheduler=self.get_work_scheduler("parse"),
+            estimator=self.get_corpus_estimator(),
         )
 
         # Process batch
@@ -264,6 +1726,10 @@ class BatchMixin:
             max_workers=max_workers,
             show_progress=show_progress,
             skip_installation_check=True,  # Skip installation check for better UX
+            executor=self.config.parse_executor,
+            max_tasks_per_worker=self.config.parser_max_tasks_per_worker or None,
+            scheduler=self.get_work_scheduler("parse"),
+            estimator=self.get_corpus_estimator(),
         )
 
         # Process batch asynchronously
@@ -366,29 +1832,33 @@ class BatchMixin:
             )
 
             # Process files with RAG (this could be parallelized in the future)
-            for file_path in parse_result.successful_files:
-                try:
-                    # Process the successfully parsed file with RAG
-                    await self.process_document_complete(
-                        file_path,
-                        output_dir=output_dir,
-                        parse_method=parse_method,
-                        **kwargs,
-                    )
+            async with self.storage_unit_of_work():
+                for file_path in parse_result.successful_files:
+                    try:
+                        # Process the successfully parsed file with RAG
+                        await self.process_document_complete(
+                            file_path,
+                            output_dir=output_dir,
+                            parse_method=parse_method,
+                            **kwargs,
+                        )
 
-                    # Get some statistics about the processed content
-                    # This would require additional tracking in the RAG system
-                    rag_results[file_path] = {"status": "success", "processed": True}
+                        # Get some statistics about the processed content
+                        # This would require additional tracking in the RAG system
+                        rag_results[file_path] = {
+                            "status": "success",
+                            "processed": True,
+                        }
 
-                except Exception as e:
-                    self.logger.error(
-                        f"Failed to process {file_path} with RAG: {str(e)}"
-                    )
-                    rag_results[file_path] = {
-                        "status": "failed",
-                        "error": str(e),
-                        "processed": False,
-                    }
+                    except Exception as e:
+                        self.logger.error(
+                            f"Failed to process {file_path} with RAG: {str(e)}"
+                        )
+                        rag_results[file_path] = {
+                            "status": "failed",
+                            "error": str(e),
+                            "processed": False,
+                        }
 
         processing_time = time.time() - start_time
 
@@ -7,15 +7,28 @@ with progress reporting and error handling.
 
 import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import time
 
 from tqdm import tqdm
 
 from .parser import MineruParser, DoclingParser
+from .events import (
+    FILE_FAILED,
+    FILE_SUCCESS,
+    BatchEvent,
+    FileEvent,
+    stream_file_events,
+)
+from .estimator import CorpusEstimate, CorpusEstimator
+from .parser_pool import ParserProcessPool, ParseTimeoutError
+from .scanner import scan_files
+from .scheduler import WorkScheduler
 
 
 @dataclass
@@ -29,6 +42,7 @@ class BatchProcessingResult:
     errors: Dict[str, str]
     output_dir: str
     dry_run: bool = False
+    estimate: Optional[CorpusEstimate] = None  # Set by dry runs
 
     @property
     def success_rate(self) -> float:
@@ -47,6 +61,7 @@ class BatchProcessingResult:
             f"  Processing time: {self.processing_time:.2f} seconds\n"
             f"  Output directory: {self.output_dir}\n"
             f"  Dry run: {self.dry_run}"
+            + (f"\n{self.estimate.summary()}" if self.estimate is not None else "")
         )
 
 
@@ -65,6 +80,10 @@ class BatchParser:
         show_progress: bool = True,
         timeout_per_file: int = 300,
         skip_installation_check: bool = False,
+        executor: str = "thread",
+        max_tasks_per_worker: Optional[int] = None,
+        scheduler: Optional[WorkScheduler] = None,
+        estimator: Optional[CorpusEstimator] = None,
     ):
         """
         Initialize batch parser
@@ -75,12 +94,28 @@ class BatchParser:
             show_progress: Whether to show progress bars
             timeout_per_file: Timeout in seconds for each file
             skip_installation_check: Skip parser installation check (useful for testing)
+            executor: "thread" to parse in worker threads or "process" to parse in
+                worker processes that are killed when a file times out
+            max_tasks_per_worker: Files after which a worker process is replaced
+                (process executor only, None keeps workers)
+            scheduler: Work scheduler that orders files largest-first and
+                learns from their parse times (None keeps the given order)
+            estimator: Corpus estimator used by dry runs (defaults to one using
+                max_workers and the scheduler)
         """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor: {executor}")
+
         self.parser_type = parser_type
         self.max_workers = max_workers
         self.show_progress = show_progress
         self.timeout_per_file = timeout_per_file
+        self.executor = executor
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.scheduler = scheduler
+        self.estimator = estimator
         self.logger = logging.getLogger(__name__)
+        self._pool: Optional[ParserProcessPool] = None
 
         # Initialize parser
         if parser_type == "mineru":
@@ -135,28 +170,112 @@ class BatchParser:
                     self.logger.warning(f"Unsupported file type: {path}")
 
             elif path.is_dir():
-                if recursive:
-                    # Recursively find all files
-                    for file_path in path.rglob("*"):
-                        if (
-                            file_path.is_file()
-                            and file_path.suffix.lower() in supported_extensions
-                        ):
-                            supported_files.append(str(file_path))
-                else:
-                    # Only files in the directory (not subdirectories)
-                    for file_path in path.glob("*"):
-                        if (
-                            file_path.is_file()
-                            and file_path.suffix.lower() in supported_extensions
-                        ):
-                            supported_files.append(str(file_path))
+                # One walk per directory, matching on the precomputed suffix set
+                supported_files.extend(
+                    scanned.path
+                    for scanned in scan_files(
+                        path, supported_extensions, recursive, with_stat=False
+                    )
+                )
 
             else:
                 self.logger.warning(f"Path does not exist: {path}")
 
         return supported_files
 
+    def _parse_file(
+        self, file_path: str, output_dir: str, parse_method: str = "auto", **kwargs
+    ) -> Dict[str, int]:
+        """
+        Parse a single file into its own output directory
+
+        Args:
+            file_path: Path to the file to process
+            output_dir: Output directory
+            parse_method: Parsing method
+            **kwargs: Additional parser arguments
+
+        Returns:
+            Dict of content block counts by type
+        """
+        start_time = time.time()
+
+        # Create file-specific output directory
+        file_name = Path(file_path).stem
+        file_output_dir = Path(output_dir) / file_name
+        file_output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Parse the document
+        content_list = self.parser.parse_document(
+            file_path=file_path,
+            output_dir=str(file_output_dir),
+            method=parse_method,
+            **kwargs,
+        )
+
+        processing_time = time.time() - start_time
+
+        self.logger.info(
+            f"Successfully processed {file_path} "
+            f"({len(content_list)} content blocks, {processing_time:.2f}s)"
+        )
+
+        blocks: Dict[str, int] = {}
+        for block in content_list:
+            block_type = (
+                block.get("type", "unknown") if isinstance(block, dict) else "unknown"
+            )
+            blocks[block_type] = blocks.get(block_type, 0) + 1
+        return blocks
+
+    def _parse_with_deadline(
+        self, file_path: str, output_dir: str, parse_method: str = "auto", **kwargs
+    ) -> Dict[str, int]:
+        """
+        Parse a file with the configured executor
+
+        With the process executor the file is parsed in a worker process that
+        is killed once timeout_per_file has passed. With the thread executor
+        the file is parsed in the calling thread and the deadline is enforced
+        by the caller.
+
+        Returns:
+            Dict of content block counts by type
+        """
+        if self._pool is None:
+            return self._parse_file(file_path, output_dir, parse_method, **kwargs)
+        return self._pool.parse(
+            file_path,
+            output_dir,
+            parse_method,
+            timeout=self.timeout_per_file,
+            **kwargs,
+        )
+
+    @contextmanager
+    def _worker_pool(self):
+        """Start the worker processes of the process executor for one batch"""
+        if self.executor != "process" or self._pool is not None:
+            yield
+            return
+
+        self._pool = ParserProcessPool(
+            self.parser_type,
+            max_workers=self.max_workers,
+            max_tasks_per_worker=self.max_tasks_per_worker,
+        )
+        try:
+            yield
+        finally:
+            pool = self._pool
+            self._pool = None
+            pool.close()
+            if pool.killed_workers or pool.recycled_workers:
+                self.logger.info(
+                    f"Parser workers: {pool.killed_workers} killed, "
+                    f"{pool.recycled_workers} recycled"
+                )
+
     def process_single_file(
         self, file_path: str, output_dir: str, parse_method: str = "auto", **kwargs
     ) -> Tuple[bool, str, Optional[str]]:
@@ -173,28 +292,10 @@ class BatchParser:
             Tuple of (success, file_path, error_message)
         """
         try:
-            start_time = time.time()
-
-            # Create file-specific output directory
-            file_name = Path(file_path).stem
-            file_output_dir = Path(output_dir) / file_name
-            file_output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Parse the document
-            content_list = self.parser.parse_document(
-                file_path=file_path,
-                output_dir=str(file_output_dir),
-                method=parse_method,
-                **kwargs,
-            )
-
-            processing_time = time.time() - start_time
-
-            self.logger.info(
-                f"Successfully processed {file_path} "
-                f"({len(content_list)} content blocks, {processing_time:.2f}s)"
-            )
-
+            start = time.perf_counter()
+            self._parse_with_deadline(file_path, output_dir, parse_method, **kwargs)
+            if self.scheduler is not None:
+                self.scheduler.record(file_path, time.perf_counter() - start)
             return True, file_path, None
 
         except Exception as e:
@@ -219,7 +320,8 @@ class BatchParser:
             output_dir: Base output directory
             parse_method: Parsing method for all files
             recursive: Whether to search directories recursively
-            dry_run: When True, only list files without processing them
+            dry_run: When True, list the files and estimate the cost of
+                ingesting them without processing them
             **kwargs: Additional parser arguments
 
         Returns:
@@ -244,18 +346,25 @@ class BatchParser:
 
         self.logger.info(f"Found {len(supported_files)} files to process")
 
+        if self.scheduler is not None:
+            supported_files = self.scheduler.order(supported_files)
+
         if dry_run:
             self.logger.info(
                 f"Dry run enabled. {len(supported_files)} files would be processed."
             )
+            estimator = self.estimator or CorpusEstimator(
+                max_concurrent_files=self.max_workers, scheduler=self.scheduler
+            )
             return BatchProcessingResult(
                 successful_files=supported_files,
                 failed_files=[],
                 total_files=len(supported_files),
-                processing_time=0.0,
+                processing_time=time.time() - start_time,
                 errors={},
                 output_dir=output_dir,
                 dry_run=True,
+                estimate=estimator.estimate(supported_files),
             )
 
         # Create output directory
@@ -276,34 +385,82 @@ class BatchParser:
                 unit="file",
             )
 
+        # Threads drive the parsing; with the process executor they only wait
+        # on their worker process
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        started_at: Dict[str, float] = {}
+
+        def run_file(file_path: str):
+            started_at[file_path] = time.monotonic()
+            return self.process_single_file(
+                file_path, output_dir, parse_method, **kwargs
+            )
+
+        def record_failure(file_path: str, error_msg: str):
+            failed_files.append(file_path)
+            errors[file_path] = error_msg
+            if pbar:
+                pbar.update(1)
+
+        future_to_file = {}
         try:
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            with self._worker_pool():
                 # Submit all tasks
                 future_to_file = {
-                    executor.submit(
-                        self.process_single_file,
-                        file_path,
-                        output_dir,
-                        parse_method,
-                        **kwargs,
-                    ): file_path
+                    executor.submit(run_file, file_path): file_path
                     for file_path in supported_files
                 }
 
-                # Process completed tasks
-                for future in as_completed(
-                    future_to_file, timeout=self.timeout_per_file
-                ):
-                    success, file_path, error_msg = future.result()
-
-                    if success:
-                        successful_files.append(file_path)
-                    else:
-                        failed_files.append(file_path)
-                        errors[file_path] = error_msg
-
-                    if pbar:
-                        pbar.update(1)
+                pending = set(future_to_file)
+                while pending:
+                    # Worker processes enforce their own deadline; threads
+                    # cannot be stopped, so late files are abandoned instead
+                    timeout = None
+                    if self._pool is None and self.timeout_per_file:
+                        now = time.monotonic()
+                        deadlines = [
+                            started_at[future_to_file[future]] + self.timeout_per_file
+                            for future in pending
+                            if future_to_file[future] in started_at
+                        ]
+                        timeout = (
+                            max(0.0, min(deadlines) - now)
+                            if deadlines
+                            else self.timeout_per_file
+                        )
+
+                    done, pending = wait(
+                        pending, timeout=timeout, return_when=FIRST_COMPLETED
+                    )
+
+                    # Process completed tasks
+                    for future in done:
+                        success, file_path, error_msg = future.result()
+                        if success:
+                            successful_files.append(file_path)
+                            if pbar:
+                                pbar.update(1)
+                        else:
+                            record_failure(file_path, error_msg)
+
+                    if self._pool is None and self.timeout_per_file:
+                        now = time.monotonic()
+                        for future in list(pending):
+                            file_path = future_to_file[future]
+                            started = started_at.get(file_path)
+                            if (
+                                started is not None
+                                and now - started >= self.timeout_per_file
+                            ):
+                                pending.discard(future)
+                                self.logger.error(
+                                    f"Failed to process {file_path}: timed out after "
+                                    f"{self.timeout_per_file}s (left running in its thread)"
+                                )
+                                record_failure(
+                                    file_path,
+                                    f"Timed out after {self.timeout_per_file}s",
+                                )
 
         except Exception as e:
             self.logger.error(f"Batch processing failed: {str(e)}")
@@ -311,14 +468,16 @@ class BatchParser:
             for future in future_to_file:
                 if not future.done():
                     file_path = future_to_file[future]
-                    failed_files.append(file_path)
-                    errors[file_path] = f"Processing interrupted: {str(e)}"
-                    if pbar:
-                        pbar.update(1)
+                    if file_path in errors:
+                        continue
+                    record_failure(file_path, f"Processing interrupted: {str(e)}")
 
         finally:
+            executor.shutdown(wait=False, cancel_futures=True)
             if pbar:
                 pbar.close()
+            if self.scheduler is not None:
+                self.scheduler.save()
 
         processing_time = time.time() - start_time
 
@@ -355,7 +514,8 @@ class BatchParser:
             output_dir: Base output directory
             parse_method: Parsing method for all files
             recursive: Whether to search directories recursively
-            dry_run: When True, only list files without processing them
+            dry_run: When True, list the files and estimate the cost of
+                ingesting them without processing them
             **kwargs: Additional parser arguments
 
         Returns:
@@ -374,6 +534,102 @@ class BatchParser:
             **kwargs,
         )
 
+    async def process_batch_stream(
+        self,
+        file_paths: List[str],
+        output_dir: str,
+        parse_method: str = "auto",
+        recursive: bool = True,
+        cancel_event: Optional[asyncio.Event] = None,
+        progress_interval: float = 5.0,
+        **kwargs,
+    ) -> AsyncIterator[BatchEvent]:
+        """
+        Parse files and yield an event as soon as each one finishes
+
+        Files that exceed timeout_per_file are reported as failed. Cancelling
+        the batch (cancel_event or closing the generator) stops new files from
+        starting; parser calls already running finish in the background with
+        the thread executor and are killed with the process executor.
+
+        Args:
+            file_paths: List of file paths or directories to process
+            output_dir: Base output directory
+            parse_method: Parsing method for all files
+            recursive: Whether to search directories recursively
+            cancel_event: Event that cancels the rest of the batch (optional)
+            progress_interval: Seconds between progress events; 0 disables them
+            **kwargs: Additional parser arguments
+
+        Yields:
+            FileEvent per finished file and periodic ProgressEvent
+        """
+        supported_files = await asyncio.to_thread(
+            self.filter_supported_files, file_paths, recursive
+        )
+        if self.scheduler is not None:
+            supported_files = await asyncio.to_thread(
+                self.scheduler.order, supported_files
+            )
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        loop = asyncio.get_running_loop()
+
+        async def process(file_path: str) -> FileEvent:
+            start = time.perf_counter()
+            parse = loop.run_in_executor(
+                executor,
+                partial(
+                    self._parse_with_deadline,
+                    file_path,
+                    output_dir,
+                    parse_method,
+                    **kwargs,
+                ),
+            )
+            try:
+                if self._pool is None:
+                    blocks = await asyncio.wait_for(
+                        parse, timeout=self.timeout_per_file
+                    )
+                else:
+                    blocks = await parse
+            except (asyncio.TimeoutError, ParseTimeoutError):
+                error = f"Timed out after {self.timeout_per_file}s"
+                self.logger.error(f"Failed to process {file_path}: {error}")
+                return FileEvent(
+                    file_path,
+                    FILE_FAILED,
+                    duration=time.perf_counter() - start,
+                    error=error,
+                )
+            duration = time.perf_counter() - start
+            if self.scheduler is not None:
+                self.scheduler.record(file_path, duration)
+            return FileEvent(
+                file_path,
+                FILE_SUCCESS,
+                duration=duration,
+                timings={"parse": duration},
+                blocks=blocks,
+            )
+
+        try:
+            with self._worker_pool():
+                async for event in stream_file_events(
+                    supported_files,
+                    process,
+                    max_workers=self.max_workers,
+                    total=len(supported_files),
+                    cancel_event=cancel_event,
+                    progress_interval=progress_interval,
+                ):
+                    yield event
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if self.scheduler is not None:
+                await asyncio.to_thread(self.scheduler.save)
+
 
 def main():
     """Command-line interface for batch parsing"""
@@ -409,10 +665,32 @@ def main():
     parser.add_argument(
         "--timeout", type=int, default=300, help="Timeout per file (seconds)"
     )
+    parser.add_argument(
+        "--executor",
+        choices=["thread", "process"],
+        default="thread",
+        help="Parse in worker threads or in worker processes killed on timeout",
+    )
+    parser.add_argument(
+        "--max-tasks-per-worker",
+        type=int,
+        default=None,
+        help="Replace worker processes after this many files",
+    )
+    parser.add_argument(
+        "--no-schedule",
+        action="store_true",
+        help="Process files in the order found instead of largest-first",
+    )
+    parser.add_argument(
+        "--calibration",
+        default=None,
+        help="JSON file keeping the parse cost calibration between runs",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
-        help="List files that would be processed without running parsers",
+        help="List files that would be processed and estimate the cost of ingesting them",
     )
 
     args = parser.parse_args()
@@ -430,6 +708,11 @@ def main():
             max_workers=args.workers,
             show_progress=not args.no_progress,
             timeout_per_file=args.timeout,
+            executor=args.executor,
+            max_tasks_per_worker=args.max_tasks_per_worker,
+            scheduler=None
+            if args.no_schedule
+            else WorkScheduler(args.calibration, profile="parse"),
         )
 
         # Process files
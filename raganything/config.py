@@ -51,6 +51,139 @@ class RAGAnythingConfig:
     )
     """Enable equation content processing."""
 
+    enable_multimodal_checkpoint: bool = field(
+        default=get_env_value("ENABLE_MULTIMODAL_CHECKPOINT", True, bool)
+    )
+    """Persist each generated multimodal description so interrupted runs resume without regenerating it."""
+
+    multimodal_checkpoint_interval: int = field(
+        default=get_env_value("MULTIMODAL_CHECKPOINT_INTERVAL", 5, int)
+    )
+    """Number of completed multimodal descriptions between checkpoint flushes to disk."""
+
+    enable_image_dedup: bool = field(
+        default=get_env_value("ENABLE_IMAGE_DEDUP", True, bool)
+    )
+    """Describe near-duplicate images within a document once, using perceptual hashes."""
+
+    image_dedup_max_distance: int = field(
+        default=get_env_value("IMAGE_DEDUP_MAX_DISTANCE", 4, int)
+    )
+    """Maximum Hamming distance between 64-bit perceptual hashes of near-duplicate images."""
+
+    enable_corpus_image_cache: bool = field(
+        default=get_env_value("ENABLE_CORPUS_IMAGE_CACHE", False, bool)
+    )
+    """Reuse descriptions of byte-identical images across documents."""
+
+    enable_image_triage: bool = field(
+        default=get_env_value("ENABLE_IMAGE_TRIAGE", True, bool)
+    )
+    """Classify trivial images (icons, separators, blank blocks) locally before calling the vision model."""
+
+    image_triage_action: str = field(
+        default=get_env_value("IMAGE_TRIAGE_ACTION", "template", str)
+    )
+    """Handling of trivial images: 'template' stores a template description, 'skip' leaves them out."""
+
+    image_triage_min_side: int = field(
+        default=get_env_value("IMAGE_TRIAGE_MIN_SIDE", 24, int)
+    )
+    """Images whose width or height is below this many pixels are trivial."""
+
+    image_triage_min_entropy: float = field(
+        default=get_env_value("IMAGE_TRIAGE_MIN_ENTROPY", 1.0, float)
+    )
+    """Images whose grayscale histogram entropy (bits) is below this are trivial."""
+
+    image_triage_min_stddev: float = field(
+        default=get_env_value("IMAGE_TRIAGE_MIN_STDDEV", 3.0, float)
+    )
+    """Images whose per-channel pixel standard deviation is below this are trivial."""
+
+    image_triage_min_page_area_ratio: float = field(
+        default=get_env_value("IMAGE_TRIAGE_MIN_PAGE_AREA_RATIO", 0.001, float)
+    )
+    """Images whose bounding box covers less than this fraction of the page are trivial."""
+
+    enable_page_image_batching: bool = field(
+        default=get_env_value("ENABLE_PAGE_IMAGE_BATCHING", False, bool)
+    )
+    """Describe images from the same page with one multi-image vision request (requires a vision model accepting messages)."""
+
+    page_image_batch_size: int = field(
+        default=get_env_value("PAGE_IMAGE_BATCH_SIZE", 8, int)
+    )
+    """Maximum number of images per multi-image vision request."""
+
+    enable_table_analysis: bool = field(
+        default=get_env_value("ENABLE_TABLE_ANALYSIS", True, bool)
+    )
+    """Parse tables locally to summarize large tables in prompts and split huge tables into row groups."""
+
+    table_summary_row_threshold: int = field(
+        default=get_env_value("TABLE_SUMMARY_ROW_THRESHOLD", 50, int)
+    )
+    """Tables with more rows are sent to the LLM as column statistics plus sampled rows."""
+
+    table_sample_rows: int = field(default=get_env_value("TABLE_SAMPLE_ROWS", 20, int))
+    """Number of sampled rows included with a table summary."""
+
+    table_row_group_threshold: int = field(
+        default=get_env_value("TABLE_ROW_GROUP_THRESHOLD", 500, int)
+    )
+    """Tables with more rows are additionally stored as row-group chunks."""
+
+    table_row_group_size: int = field(
+        default=get_env_value("TABLE_ROW_GROUP_SIZE", 100, int)
+    )
+    """Number of rows per row-group chunk."""
+
+    enable_equation_analysis: bool = field(
+        default=get_env_value("ENABLE_EQUATION_ANALYSIS", True, bool)
+    )
+    """Normalize LaTeX to describe trivial equations locally and reuse descriptions of repeated equations."""
+
+    equation_complexity_threshold: int = field(
+        default=get_env_value("EQUATION_COMPLEXITY_THRESHOLD", 4, int)
+    )
+    """Equations with a lower complexity score get a locally generated description."""
+
+    enable_equation_cache: bool = field(
+        default=get_env_value("ENABLE_EQUATION_CACHE", True, bool)
+    )
+    """Persist equation descriptions keyed by normalized LaTeX and reuse them across the corpus."""
+
+    enable_model_routing: bool = field(
+        default=get_env_value("ENABLE_MODEL_ROUTING", True, bool)
+    )
+    """Send simple items to the small model functions when they are provided."""
+
+    router_image_max_pixels: int = field(
+        default=get_env_value("ROUTER_IMAGE_MAX_PIXELS", 262144, int)
+    )
+    """Largest image (width x height) described by the small vision model."""
+
+    router_table_max_cells: int = field(
+        default=get_env_value("ROUTER_TABLE_MAX_CELLS", 200, int)
+    )
+    """Largest table (rows x columns) described by the small model."""
+
+    router_equation_max_complexity: int = field(
+        default=get_env_value("ROUTER_EQUATION_MAX_COMPLEXITY", 30, int)
+    )
+    """Highest equation complexity score described by the small model."""
+
+    router_generic_max_chars: int = field(
+        default=get_env_value("ROUTER_GENERIC_MAX_CHARS", 2000, int)
+    )
+    """Longest generic content (characters) described by the small model."""
+
+    enable_llm_json_mode: bool = field(
+        default=get_env_value("ENABLE_LLM_JSON_MODE", False, bool)
+    )
+    """Pass response_format={"type": "json_object"} to description calls for providers with a JSON output mode."""
+
     # Batch Processing Configuration
     # ---
     max_concurrent_files: int = field(
@@ -72,6 +205,144 @@ class RAGAnythingConfig:
     )
     """Whether to recursively process subfolders in batch mode."""
 
+    flush_policy: str = field(default=get_env_value("FLUSH_POLICY", "immediate", str))
+    """Storage flush policy during ingestion: 'immediate' (after every stage), 'document' (once per document) or 'batch' (once every flush_batch_size documents)."""
+
+    flush_batch_size: int = field(default=get_env_value("FLUSH_BATCH_SIZE", 10, int))
+    """Number of completed documents per storage flush when flush_policy is 'batch'."""
+
+    multimodal_merge_batch_size: int = field(
+        default=get_env_value("MULTIMODAL_MERGE_BATCH_SIZE", 1, int)
+    )
+    """Number of documents whose multimodal entity extraction and graph merge run together during folder processing (1 merges each document separately)."""
+
+    progress_interval: float = field(
+        default=get_env_value("PROGRESS_INTERVAL", 5.0, float)
+    )
+    """Seconds between progress events of the streaming batch APIs; 0 disables them."""
+
+    use_ingest_queue: bool = field(
+        default=get_env_value("USE_INGEST_QUEUE", False, bool)
+    )
+    """Ingest folders through the durable SQLite job queue so interrupted runs resume where they stopped."""
+
+    ingest_queue_path: str = field(default=get_env_value("INGEST_QUEUE_PATH", "", str))
+    """Path of the ingestion queue database; empty uses raganything_ingest_queue.db in the working directory."""
+
+    ingest_lease_seconds: int = field(
+        default=get_env_value("INGEST_LEASE_SECONDS", 1800, int)
+    )
+    """Seconds a worker may hold a job without renewing its lease before the job is handed out again."""
+
+    ingest_max_attempts: int = field(
+        default=get_env_value("INGEST_MAX_ATTEMPTS", 3, int)
+    )
+    """Number of attempts before an ingestion job is marked as failed."""
+
+    ingest_stats_interval: int = field(
+        default=get_env_value("INGEST_STATS_INTERVAL", 100, int)
+    )
+    """Number of finished jobs between queue statistics log lines."""
+
+    use_folder_sync: bool = field(default=get_env_value("USE_FOLDER_SYNC", False, bool))
+    """Process folders incrementally: ingest only new and changed files and purge deleted ones."""
+
+    folder_manifest_path: str = field(
+        default=get_env_value("FOLDER_MANIFEST_PATH", "", str)
+    )
+    """Path of the folder sync manifest database; empty uses the working directory."""
+
+    watch_debounce_seconds: float = field(
+        default=get_env_value("WATCH_DEBOUNCE_SECONDS", 2.0, float)
+    )
+    """Seconds a watched file must stay unchanged before it is ingested."""
+
+    watch_poll_interval: float = field(
+        default=get_env_value("WATCH_POLL_INTERVAL", 1.0, float)
+    )
+    """Seconds between checks of the watched folder when inotify is unavailable."""
+
+    watch_batch_size: int = field(default=get_env_value("WATCH_BATCH_SIZE", 16, int))
+    """Maximum number of arrived files ingested together by the folder watcher."""
+
+    watch_batch_window: float = field(
+        default=get_env_value("WATCH_BATCH_WINDOW", 5.0, float)
+    )
+    """Maximum seconds an arrived file waits for more files to join its batch."""
+
+    watch_use_inotify: bool = field(
+        default=get_env_value("WATCH_USE_INOTIFY", True, bool)
+    )
+    """Use inotify to watch folders on Linux; polling is used otherwise."""
+
+    use_staged_pipeline: bool = field(
+        default=get_env_value("USE_STAGED_PIPELINE", False, bool)
+    )
+    """Ingest folders through the staged parse, describe and store pipeline instead of one task per document."""
+
+    pipeline_parse_workers: int = field(
+        default=get_env_value("PIPELINE_PARSE_WORKERS", 2, int)
+    )
+    """Number of documents parsed concurrently by the staged pipeline."""
+
+    pipeline_describe_workers: int = field(
+        default=get_env_value("PIPELINE_DESCRIBE_WORKERS", 4, int)
+    )
+    """Number of documents whose multimodal content is described concurrently by the staged pipeline."""
+
+    pipeline_store_workers: int = field(
+        default=get_env_value("PIPELINE_STORE_WORKERS", 1, int)
+    )
+    """Number of documents stored and merged into the knowledge graph concurrently by the staged pipeline."""
+
+    pipeline_queue_size: int = field(
+        default=get_env_value("PIPELINE_QUEUE_SIZE", 4, int)
+    )
+    """Capacity of the queue in front of each pipeline stage; full queues pause the stage before."""
+
+    parse_executor: str = field(default=get_env_value("PARSE_EXECUTOR", "thread", str))
+    """Executor for parser calls in the staged pipeline and batch parsing: 'thread' or 'process' (spawned worker processes)."""
+
+    parser_max_tasks_per_worker: int = field(
+        default=get_env_value("PARSER_MAX_TASKS_PER_WORKER", 0, int)
+    )
+    """Files after which a batch parsing worker process is replaced to release memory; 0 keeps workers."""
+
+    schedule_largest_first: bool = field(
+        default=get_env_value("SCHEDULE_LARGEST_FIRST", True, bool)
+    )
+    """Start batch files in order of estimated cost, largest first, so long documents do not finish last."""
+
+    cost_calibration_path: str = field(
+        default=get_env_value("COST_CALIBRATION_PATH", "", str)
+    )
+    """Path of the JSON file with the learned per-type cost calibration; empty uses the working directory."""
+
+    distributed_workers: int = field(
+        default=get_env_value("DISTRIBUTED_WORKERS", 4, int)
+    )
+    """Number of worker processes started on this host by distributed folder ingestion."""
+
+    distributed_work_dir: str = field(
+        default=get_env_value("DISTRIBUTED_WORK_DIR", "", str)
+    )
+    """Directory shared by distributed ingestion workers for the manifest and claims; empty uses the working directory."""
+
+    claim_lease_seconds: float = field(
+        default=get_env_value("CLAIM_LEASE_SECONDS", 300.0, float)
+    )
+    """Seconds without a heartbeat after which a distributed worker's claim on a file is taken over."""
+
+    estimate_llm_seconds_per_call: float = field(
+        default=get_env_value("ESTIMATE_LLM_SECONDS_PER_CALL", 6.0, float)
+    )
+    """Average duration of a text model call assumed by ingestion estimates."""
+
+    estimate_vlm_seconds_per_call: float = field(
+        default=get_env_value("ESTIMATE_VLM_SECONDS_PER_CALL", 10.0, float)
+    )
+    """Average duration of a vision model call assumed by ingestion estimates."""
+
     # Context Extraction Configuration
     # ---
     context_window: int = field(default=get_env_value("CONTEXT_WINDOW", 1, int))
@@ -85,6 +356,19 @@ class RAGAnythingConfig:
     )
     """Maximum number of tokens in extracted context."""
 
+    context_assembly: str = field(
+        default=get_env_value("CONTEXT_ASSEMBLY", "truncate", str)
+    )
+    """Context assembly strategy: 'truncate' joins all blocks and truncates, 'nearest' adds blocks nearest-first until max_context_tokens is reached."""
+
+    token_cache_size: int = field(default=get_env_value("TOKEN_CACHE_SIZE", 8192, int))
+    """Maximum number of token counts kept in the shared token count cache."""
+
+    token_count_thread_threshold: int = field(
+        default=get_env_value("TOKEN_COUNT_THREAD_THRESHOLD", 20000, int)
+    )
+    """Minimum text length (characters) tokenized in a worker thread instead of on the event loop."""
+
     include_headers: bool = field(default=get_env_value("INCLUDE_HEADERS", True, bool))
     """Whether to include document headers and titles in context."""
 
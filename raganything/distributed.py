@@ -0,0 +1,679 @@
+"""
+Distributed folder ingestion for RAGAnything
+
+Contains a work directory shared by ingestion worker processes and the
+workers that drain it. The manifest lists every file with its estimated
+cost, split into one bin per worker. A worker claims a file by creating its
+lock file exclusively, keeps the claim alive by touching the lock file, and
+records the outcome in a completion marker. A worker whose bin is empty
+steals unclaimed files from the bin with the most remaining work, and claims
+whose lock file has not been touched for a lease period are taken over, so
+the files of a crashed worker are processed by the others.
+
+Workers on one host share LightRAG storages through LightRAG's
+multi-process shared storage mode, which requires forking the workers from
+a parent process. Workers on several hosts need the shared directory
+mounted at the same path on every host and LightRAG storage backends that
+are shared between hosts (for example PostgreSQL, Neo4j or Milvus).
+"""
+
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from lightrag.utils import logger
+
+from raganything.scheduler import pack_estimates
+
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclass(slots=True)
+class WorkItem:
+    """A file listed in the distributed work manifest"""
+
+    key: str
+    path: str
+    cost: float  # Estimated seconds
+    bin: int  # Index of the worker the file is assigned to
+
+
+def _work_key(file_path: str) -> str:
+    return hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:24]
+
+
+def _write_json_atomic(path: str, data: Any) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _read_json(path: str) -> Optional[Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class WorkDirectory:
+    """
+    Work shared between ingestion workers through a directory
+
+    Layout: manifest.json lists the work, claims/<key>.lock marks a file
+    being processed and done/<key>.json records its outcome. Every state
+    change is a single atomic file system operation, so the directory can be
+    on a network file system shared by several hosts.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300.0):
+        """
+        Initialize work directory
+
+        Args:
+            path: Shared directory
+            lease_seconds: Seconds after which a claim whose lock file was not
+                touched is considered abandoned
+        """
+        self.path = os.path.abspath(path)
+        self.lease_seconds = lease_seconds
+        self._claims_dir = os.path.join(self.path, "claims")
+        self._done_dir = os.path.join(self.path, "done")
+        os.makedirs(self._claims_dir, exist_ok=True)
+        os.makedirs(self._done_dir, exist_ok=True)
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._items: List[WorkItem] = []
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST_NAME)
+
+    def _lock_path(self, item: WorkItem) -> str:
+        return os.path.join(self._claims_dir, f"{item.key}.lock")
+
+    def _done_path(self, item: WorkItem) -> str:
+        return os.path.join(self._done_dir, f"{item.key}.json")
+
+    def create_manifest(
+        self,
+        files: Iterable[Dict[str, Any]],
+        bins: int,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> bool:
+        """
+        Write the manifest unless another coordinator already did
+
+        Args:
+            files: Dicts with "path", "cost" and "bin" of every file
+            bins: Number of bins the files are split into
+            options: Settings every worker should use, such as the output directory
+
+        Returns:
+            True if this call created the manifest
+        """
+        items = [
+            {
+                "key": _work_key(entry["path"]),
+                "path": os.path.abspath(entry["path"]),
+                "cost": float(entry["cost"]),
+                "bin": int(entry["bin"]),
+            }
+            for entry in files
+        ]
+        manifest = {
+            "version": 1,
+            "created_at": time.time(),
+            "bins": bins,
+            "options": options or {},
+            "items": items,
+        }
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f)
+            # Unlike a rename, a hard link never replaces an existing manifest
+            os.link(tmp_path, self.manifest_path)
+            return True
+        except FileExistsError:
+            return False
+        finally:
+            os.unlink(tmp_path)
+
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load the manifest (cached after the first call)"""
+        if self._manifest is None:
+            manifest = _read_json(self.manifest_path)
+            if manifest is None:
+                raise FileNotFoundError(
+                    f"No readable work manifest in {self.path}; create it first"
+                )
+            self._manifest = manifest
+            self._items = [WorkItem(**item) for item in manifest["items"]]
+        return self._manifest
+
+    @property
+    def items(self) -> List[WorkItem]:
+        self.load_manifest()
+        return self._items
+
+    def _snapshot(self) -> tuple:
+        """Keys of claimed and of finished files"""
+        claimed = {
+            name[: -len(".lock")]
+            for name in os.listdir(self._claims_dir)
+            if name.endswith(".lock")
+        }
+        done = {
+            name[: -len(".json")]
+            for name in os.listdir(self._done_dir)
+            if name.endswith(".json")
+        }
+        return claimed, done
+
+    def _is_stale(self, lock_path: str) -> bool:
+        try:
+            return time.time() - os.stat(lock_path).st_mtime > self.lease_seconds
+        except FileNotFoundError:
+            return False
+
+    def _break_stale_claim(self, lock_path: str) -> bool:
+        """Remove an abandoned lock file; True if it is gone"""
+        if not self._is_stale(lock_path):
+            return False
+        observed = _read_json(lock_path)
+        moved_path = f"{lock_path}.{uuid.uuid4().hex}.stale"
+        try:
+            # Only one worker can move a given lock file away
+            os.rename(lock_path, moved_path)
+        except FileNotFoundError:
+            return True
+
+        moved = _read_json(moved_path)
+        if moved != observed or not self._is_stale(moved_path):
+            # The claim was renewed in between; put it back unless already re-claimed
+            try:
+                os.link(moved_path, lock_path)
+            except FileExistsError:
+                pass
+            os.unlink(moved_path)
+            return False
+
+        os.unlink(moved_path)
+        logger.warning(
+            f"Recovered abandoned claim of worker {(moved or {}).get('worker')} "
+            f"on {os.path.basename(lock_path)}"
+        )
+        return True
+
+    def claim(self, item: WorkItem, worker_id: str) -> Optional[str]:
+        """
+        Claim a file for processing
+
+        Args:
+            item: File to claim
+            worker_id: Name of the claiming worker
+
+        Returns:
+            Claim token, or None if the file is claimed or finished
+        """
+        if os.path.exists(self._done_path(item)):
+            return None
+
+        token = uuid.uuid4().hex
+        claim = {
+            "token": token,
+            "worker": worker_id,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "claimed_at": time.time(),
+        }
+        lock_path = self._lock_path(item)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self._break_stale_claim(lock_path):
+                    continue
+                return None
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(claim, f)
+
+            # The previous owner writes its marker before removing its lock
+            if os.path.exists(self._done_path(item)):
+                self.release(item, token)
+                return None
+            return token
+        return None
+
+    def _owns(self, item: WorkItem, token: str) -> bool:
+        claim = _read_json(self._lock_path(item))
+        return claim is not None and claim.get("token") == token
+
+    def renew(self, item: WorkItem, token: str) -> bool:
+        """Keep a claim alive; False if it was lost"""
+        if not self._owns(item, token):
+            return False
+        try:
+            os.utime(self._lock_path(item))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def release(self, item: WorkItem, token: str) -> None:
+        """Give up a claim without finishing the file"""
+        if self._owns(item, token):
+            try:
+                os.unlink(self._lock_path(item))
+            except FileNotFoundError:
+                pass
+
+    def complete(self, item: WorkItem, token: str, outcome: Dict[str, Any]) -> bool:
+        """
+        Record the outcome of a file and release its claim
+
+        Args:
+            item: Processed file
+            token: Claim token
+            outcome: Dict with at least "status" ("success" or "failed")
+
+        Returns:
+            False if the claim was lost, in which case the worker that took
+            it over records the outcome
+        """
+        if not self._owns(item, token):
+            return False
+        _write_json_atomic(
+            self._done_path(item), {**outcome, "path": item.path, "key": item.key}
+        )
+        self.release(item, token)
+        return True
+
+    def next_item(self, bin_index: int, worker_id: str) -> Optional[tuple]:
+        """
+        Claim the next file for a worker
+
+        Files of the worker's own bin come first, largest first. Then unclaimed
+        files are stolen from the back of the bin with the most remaining
+        estimated cost, and finally abandoned claims are taken over.
+
+        Args:
+            bin_index: Bin of the worker
+            worker_id: Name of the worker
+
+        Returns:
+            Tuple of (WorkItem, claim token, how it was obtained: "own",
+            "stolen" or "recovered"), or None if nothing can be claimed now
+        """
+        bins = self.load_manifest()["bins"]
+        claimed, done = self._snapshot()
+        open_items: Dict[int, List[WorkItem]] = {}
+        for item in self.items:
+            if item.key not in claimed and item.key not in done:
+                open_items.setdefault(item.bin, []).append(item)
+
+        for item in open_items.pop(bin_index % max(1, bins), []):
+            token = self.claim(item, worker_id)
+            if token is not None:
+                return item, token, "own"
+
+        victims = sorted(
+            open_items.values(),
+            key=lambda victim: sum(item.cost for item in victim),
+            reverse=True,
+        )
+        for victim in victims:
+            for item in reversed(victim):
+                token = self.claim(item, worker_id)
+                if token is not None:
+                    return item, token, "stolen"
+
+        for item in self.items:
+            if (
+                item.key in claimed
+                and item.key not in done
+                and self._is_stale(self._lock_path(item))
+            ):
+                token = self.claim(item, worker_id)
+                if token is not None:
+                    return item, token, "recovered"
+        return None
+
+    def is_finished(self) -> bool:
+        """Check whether every file has a completion marker"""
+        _, done = self._snapshot()
+        return all(item.key in done for item in self.items)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Count files by state and collect the errors of failed files"""
+        claimed, done = self._snapshot()
+        stats = {
+            "total": len(self.items),
+            "successful": 0,
+            "failed": 0,
+            "in_progress": 0,
+            "pending": 0,
+            "by_worker": {},
+            "errors": {},
+        }
+        for item in self.items:
+            if item.key in done:
+                outcome = _read_json(self._done_path(item)) or {}
+                if outcome.get("status") == "success":
+                    stats["successful"] += 1
+                else:
+                    stats["failed"] += 1
+                    stats["errors"][item.path] = outcome.get("error")
+                worker = outcome.get("worker", "unknown")
+                stats["by_worker"][worker] = stats["by_worker"].get(worker, 0) + 1
+            elif item.key in claimed:
+                stats["in_progress"] += 1
+            else:
+                stats["pending"] += 1
+        return stats
+
+
+ProcessFile = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+
+class DistributedWorker:
+    """Worker that claims files from a WorkDirectory until all are finished"""
+
+    def __init__(
+        self,
+        rag,
+        work_dir: WorkDirectory,
+        worker_index: int,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 5.0,
+        process_file: Optional[ProcessFile] = None,
+    ):
+        """
+        Initialize distributed worker
+
+        Args:
+            rag: RAGAnything instance owned by this worker process
+            work_dir: Shared work directory with a manifest
+            worker_index: Index of the worker; selects its bin of the manifest
+            worker_id: Name recorded in claims (defaults to host, pid and index)
+            poll_interval: Seconds between checks while other workers finish
+            process_file: Coroutine function called with the file path and the
+                process_document_complete arguments (defaults to
+                rag.process_document_complete)
+        """
+        self.rag = rag
+        self.work_dir = work_dir
+        self.worker_index = worker_index
+        self.worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{worker_index}"
+        )
+        self.poll_interval = poll_interval
+        self.process_file = process_file or rag.process_document_complete
+
+    def _file_kwargs(self, item: WorkItem) -> Dict[str, Any]:
+        options = self.work_dir.load_manifest()["options"]
+        kwargs = {}
+        if options.get("folder_path"):
+            kwargs.update(
+                self.rag._get_folder_file_kwargs(
+                    Path(item.path),
+                    Path(options["folder_path"]),
+                    options.get("output_dir") or self.rag.config.parser_output_dir,
+                )
+            )
+        for key in ("parse_method", "split_by_character", "split_by_character_only"):
+            if options.get(key) is not None:
+                kwargs[key] = options[key]
+        return kwargs
+
+    async def _renew_claim(
+        self, item: WorkItem, token: str, processing: asyncio.Task
+    ) -> None:
+        interval = max(1.0, self.work_dir.lease_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.work_dir.renew, item, token):
+                # The worker that took the claim over processes the file again
+                logger.warning(
+                    f"{self.worker_id} lost its claim on {item.path}; "
+                    "abandoning the file"
+                )
+                processing.cancel()
+                return
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Process files until every file of the manifest is finished
+
+        Returns:
+            Dict with the numbers of files processed, failed, stolen, recovered
+            and lost to other workers
+        """
+        stats = {
+            "worker": self.worker_id,
+            "processed": 0,
+            "failed": 0,
+            "stolen": 0,
+            "recovered": 0,
+            "lost": 0,  # Claims taken over by another worker mid-file
+            "busy_seconds": 0.0,
+        }
+        result = await self.rag._ensure_lightrag_initialized()
+        if isinstance(result, dict) and not result.get("success", True):
+            raise RuntimeError(result.get("error"))
+        try:
+            while True:
+                claimed = await asyncio.to_thread(
+                    self.work_dir.next_item, self.worker_index, self.worker_id
+                )
+                if claimed is None:
+                    if await asyncio.to_thread(self.work_dir.is_finished):
+                        break
+                    # Stay until the others finish, to take over abandoned claims
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                item, token, source = claimed
+                if source != "own":
+                    stats[source] += 1
+                start = time.perf_counter()
+                processing = asyncio.create_task(
+                    self.process_file(item.path, self._file_kwargs(item))
+                )
+                renewer = asyncio.create_task(
+                    self._renew_claim(item, token, processing)
+                )
+                try:
+                    await asyncio.wait({processing})
+                except asyncio.CancelledError:
+                    processing.cancel()
+                    await asyncio.to_thread(self.work_dir.release, item, token)
+                    raise
+                finally:
+                    renewer.cancel()
+
+                if processing.cancelled():
+                    stats["lost"] += 1
+                    continue
+
+                outcome = {"worker": self.worker_id}
+                try:
+                    result = processing.result()
+                    outcome.update(status="success")
+                    if isinstance(result, str):
+                        outcome["doc_id"] = result
+                except Exception as e:
+                    logger.error(f"{self.worker_id} failed to process {item.path}: {e}")
+                    outcome.update(status="failed", error=str(e))
+
+                duration = time.perf_counter() - start
+                outcome.update(
+                    duration=round(duration, 3), estimated=round(item.cost, 3)
+                )
+                stats["busy_seconds"] += duration
+                if not await asyncio.to_thread(
+                    self.work_dir.complete, item, token, outcome
+                ):
+                    logger.warning(
+                        f"{self.worker_id} lost its claim on {item.path} before "
+                        "recording the outcome"
+                    )
+                    stats["lost"] += 1
+                    continue
+                stats["processed"] += 1
+                if outcome["status"] == "failed":
+                    stats["failed"] += 1
+        finally:
+            await self.rag.finalize_storages()
+
+        stats["busy_seconds"] = round(stats["busy_seconds"], 3)
+        return stats
+
+
+def _local_worker_main(
+    rag,
+    work_path: str,
+    lease_seconds: float,
+    worker_index: int,
+    poll_interval: float,
+    process_file: Optional[ProcessFile],
+    results,
+) -> None:
+    """Entry point of a forked worker process"""
+    work_dir = WorkDirectory(work_path, lease_seconds)
+    worker = DistributedWorker(
+        rag,
+        work_dir,
+        worker_index,
+        poll_interval=poll_interval,
+        process_file=process_file,
+    )
+    stats = asyncio.run(worker.run())
+    results.put(stats)
+
+
+def run_local_workers(
+    rag,
+    work_dir: WorkDirectory,
+    num_workers: int,
+    worker_index_offset: int = 0,
+    poll_interval: float = 5.0,
+    process_file: Optional[ProcessFile] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fork worker processes on this host and wait until they finish
+
+    LightRAG's shared storage is switched to multi-process mode before the
+    workers are forked, so the workers share storage locks and reload data
+    written by each other. The RAGAnything instance must not have initialized
+    its LightRAG storages yet; every worker initializes its own.
+
+    Args:
+        rag: RAGAnything instance copied into every worker
+        work_dir: Shared work directory with a manifest
+        num_workers: Number of worker processes to start
+        worker_index_offset: Index of the first worker, for hosts after the first
+        poll_interval: Seconds between checks while other workers finish
+        process_file: Coroutine function processing one file (optional)
+
+    Returns:
+        List of per-worker stats of the workers that exited normally
+    """
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError(
+            "Distributed ingestion needs the fork start method to share LightRAG storage"
+        )
+    lightrag = getattr(rag, "lightrag", None)
+    status = getattr(lightrag, "_storages_status", None)
+    if status is not None and status.name in ("INITIALIZED", "FINALIZED"):
+        raise RuntimeError(
+            "LightRAG storages are already initialized in this process; "
+            "start distributed ingestion before using the instance"
+        )
+
+    from lightrag.kg import shared_storage
+
+    shared_storage.initialize_share_data(workers=num_workers)
+    if num_workers > 1 and not getattr(shared_storage, "_is_multiprocess", True):
+        raise RuntimeError(
+            "LightRAG shared storage was already initialized for a single process; "
+            "start distributed ingestion before using LightRAG in this process"
+        )
+
+    context = multiprocessing.get_context("fork")
+    results = context.SimpleQueue()
+    processes = [
+        context.Process(
+            target=_local_worker_main,
+            args=(
+                rag,
+                work_dir.path,
+                work_dir.lease_seconds,
+                worker_index_offset + index,
+                poll_interval,
+                process_file,
+                results,
+            ),
+            name=f"raganything-worker-{worker_index_offset + index}",
+        )
+        for index in range(num_workers)
+    ]
+    for process in processes:
+        process.start()
+
+    worker_stats = []
+    alive: Set[multiprocessing.Process] = set(processes)
+    while alive:
+        while not results.empty():
+            worker_stats.append(results.get())
+        for process in list(alive):
+            process.join(timeout=0.5)
+            if process.exitcode is not None:
+                alive.discard(process)
+                if process.exitcode != 0:
+                    logger.error(
+                        f"{process.name} exited with code {process.exitcode}; "
+                        "its claim is taken over once the lease expires"
+                    )
+    while not results.empty():
+        worker_stats.append(results.get())
+    return worker_stats
+
+
+def estimate_work(
+    file_paths: Iterable[str], bins: int, scheduler
+) -> List[Dict[str, Any]]:
+    """
+    Estimate files and split them into bins for create_manifest
+
+    Args:
+        file_paths: Files to distribute
+        bins: Number of workers
+        scheduler: WorkScheduler used to estimate file costs
+
+    Returns:
+        List of dicts with "path", "cost" and "bin"
+    """
+    estimates = [scheduler.estimate(file_path) for file_path in file_paths]
+    return [
+        {**asdict(estimate), "bin": index}
+        for index, packed in enumerate(pack_estimates(estimates, bins))
+        for estimate in packed
+    ]
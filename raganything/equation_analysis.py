@@ -0,0 +1,223 @@
+"""
+Local analysis of LaTeX equation content
+
+Normalizes LaTeX so that equivalent spellings of the same equation share one
+cache key, scores equation complexity, and renders deterministic descriptions
+for trivial equations so they do not have to be sent to the LLM.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+
+@dataclass
+class EquationAnalysisConfig:
+    """Configuration for local equation analysis"""
+
+    enabled: bool = True
+    complexity_threshold: int = 4  # Describe equations scoring below this locally
+    use_cache: bool = True  # Reuse descriptions of equations with equal normal form
+
+
+# Outer math delimiters, tried in order; the first match is unwrapped
+_DELIMITERS = [
+    re.compile(r"^\$\$(.*)\$\$$", re.DOTALL),
+    re.compile(r"^\$(.*)\$$", re.DOTALL),
+    re.compile(r"^\\\[(.*)\\\]$", re.DOTALL),
+    re.compile(r"^\\\((.*)\\\)$", re.DOTALL),
+    re.compile(
+        r"^\\begin\{(equation|displaymath|math|align|gather)\*?\}(.*)"
+        r"\\end\{\1\*?\}$",
+        re.DOTALL,
+    ),
+]
+
+# Macros with the same rendering, mapped to one canonical spelling
+_MACRO_ALIASES = {
+    r"\dfrac": r"\frac",
+    r"\tfrac": r"\frac",
+    r"\le": r"\leq",
+    r"\ge": r"\geq",
+    r"\ne": r"\neq",
+    r"\to": r"\rightarrow",
+    r"\gets": r"\leftarrow",
+    r"\lbrace": r"\{",
+    r"\rbrace": r"\}",
+    r"\vert": "|",
+    r"\lvert": "|",
+    r"\rvert": "|",
+    r"\land": r"\wedge",
+    r"\lor": r"\vee",
+    r"\lnot": r"\neg",
+    r"\implies": r"\Rightarrow",
+}
+
+# Macros that only affect spacing, sizing or numbering
+_LAYOUT_MACROS = re.compile(
+    r"\\(?:left|right|big|Big|bigg|Bigg|displaystyle|textstyle|nonumber|notag)"
+    r"(?![a-zA-Z])|\\label\{[^{}]*\}|\\(?:quad|qquad)(?![a-zA-Z])|\\[,;:! ]"
+)
+_MACRO = re.compile(r"\\[a-zA-Z]+")
+# Math mode ignores whitespace except where it ends a macro name before a letter
+_MACRO_TERMINATOR = re.compile(r"(\\[a-zA-Z]+)\s+(?=[a-zA-Z])")
+_WHITESPACE = re.compile(r"\s+")
+# Macros whose argument is set as text, where whitespace separates words
+_TEXT_ARGUMENT_MACRO = re.compile(
+    r"\\(?:text[a-z]*|mbox|hbox|mathrm|operatorname\*?)\s*\{"
+)
+_OPERATORS = re.compile(r"[=<>+\-*/^_|]")
+_SYMBOLS = re.compile(r"\\[a-zA-Z]+|[a-zA-Z](?:_\{?[a-zA-Z0-9]+\}?)?")
+
+# Macros counted as structure rather than as symbols in trivial descriptions
+_STRUCTURAL_MACROS = {
+    r"\frac",
+    r"\sqrt",
+    r"\mathrm",
+    r"\mathbf",
+    r"\mathit",
+    r"\mathcal",
+    r"\text",
+    r"\operatorname",
+}
+
+
+def _replace_alias(match: re.Match) -> str:
+    return _MACRO_ALIASES.get(match.group(0), match.group(0))
+
+
+def _protect_text_arguments(text: str) -> str:
+    """Collapse whitespace in text arguments to a marker kept by normalization"""
+    parts = []
+    position = 0
+    for match in _TEXT_ARGUMENT_MACRO.finditer(text):
+        if match.start() < position:
+            continue  # Nested in an argument already handled
+        depth = 1
+        end = match.end()
+        while end < len(text) and depth:
+            if text[end] == "{" and text[end - 1] != "\\":
+                depth += 1
+            elif text[end] == "}" and text[end - 1] != "\\":
+                depth -= 1
+            end += 1
+        argument = text[match.end() : end - 1] if depth == 0 else text[match.end() :]
+        parts.append(text[position : match.end()])
+        parts.append("\0".join(argument.split()))
+        parts.append("}" if depth == 0 else "")
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def normalize_latex(text: str) -> str:
+    """
+    Normalize LaTeX so equivalent spellings compare equal
+
+    Removes outer math delimiters, labels and layout-only macros, maps macro
+    aliases to one spelling and drops whitespace that math mode ignores.
+    Whitespace inside text arguments such as \\text{} is collapsed instead,
+    since it separates words there.
+
+    Args:
+        text: LaTeX source of an equation
+
+    Returns:
+        Normalized LaTeX (empty string for empty input)
+    """
+    if not text or not isinstance(text, str):
+        return ""
+
+    normalized = text.strip()
+    unwrapped = True
+    while unwrapped:
+        unwrapped = False
+        for pattern in _DELIMITERS:
+            match = pattern.match(normalized)
+            if match:
+                normalized = match.group(match.lastindex).strip()
+                unwrapped = True
+                break
+
+    normalized = _MACRO.sub(_replace_alias, normalized)
+    normalized = _LAYOUT_MACROS.sub(" ", normalized)
+    normalized = _MACRO_TERMINATOR.sub("\\1\0", normalized)
+    normalized = _protect_text_arguments(normalized)
+    normalized = _WHITESPACE.sub("", normalized).replace("\0", " ")
+    return normalized.rstrip(".,;")
+
+
+def latex_complexity(normalized: str) -> int:
+    """
+    Score the complexity of a normalized equation
+
+    The score adds the number of macros, the number of operators, the maximum
+    brace nesting depth and one point per 20 characters.
+
+    Args:
+        normalized: Equation normalized with normalize_latex
+
+    Returns:
+        Complexity score (0 for empty input)
+    """
+    if not normalized:
+        return 0
+
+    depth = max_depth = 0
+    for char in normalized:
+        if char == "{":
+            depth += 1
+            max_depth = max(max_depth, depth)
+        elif char == "}":
+            depth = max(0, depth - 1)
+
+    return (
+        len(_MACRO.findall(normalized))
+        + len(_OPERATORS.findall(normalized))
+        + max_depth
+        + len(normalized) // 20
+    )
+
+
+def _equation_symbols(normalized: str) -> List[str]:
+    """List the distinct symbols of an equation in order of appearance"""
+    symbols = []
+    for symbol in _SYMBOLS.findall(normalized):
+        if symbol in _STRUCTURAL_MACROS or symbol in symbols:
+            continue
+        symbols.append(symbol)
+    return symbols
+
+
+def describe_trivial_equation(
+    normalized: str, entity_name: str = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Render a deterministic description for a trivial equation
+
+    Args:
+        normalized: Equation normalized with normalize_latex
+        entity_name: Optional predefined entity name
+
+    Returns:
+        Tuple of (description, entity_info)
+    """
+    kind = (
+        "relation"
+        if re.search(r"=|<|>|\\(?:leq|geq|neq|approx|equiv|sim)", normalized)
+        else "expression"
+    )
+    symbols = _equation_symbols(normalized)
+
+    description = f"Simple mathematical {kind}: ${normalized}$."
+    if symbols:
+        description += f" Symbols: {', '.join(symbols)}."
+
+    entity_info = {
+        "entity_name": entity_name or f"${normalized}$ (equation)",
+        "entity_type": "equation",
+        "summary": f"Simple mathematical {kind} ${normalized}$",
+    }
+    return description, entity_info
@@ -0,0 +1,402 @@
+"""
+Pre-ingestion corpus estimation for RAGAnything
+
+Contains a cheap structural probe of input files and the estimator that
+turns the probes into the cost of an ingestion run. PDFs are scanned for
+their page tree and image XObjects (including objects packed into
+compressed object streams) without rendering or parsing them, Office files
+are read from their zip directory and metadata, and Markdown is scanned for
+tables and display equations. The probes are combined with the call pattern
+of the configured processors to project model calls, tokens and wall time.
+"""
+
+import math
+import mmap
+import os
+import re
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+from lightrag.utils import logger
+
+from raganything.scheduler import WorkScheduler, find_pdf_page_counts, get_file_type
+
+_PDF_IMAGE = re.compile(rb"/Subtype\s*/Image\b")
+_PDF_OBJECT_STREAM = re.compile(rb"/Type\s*/ObjStm\b")
+
+_OFFICE_MEDIA = re.compile(r"^(word|ppt|xl)/media/")
+_PPTX_SLIDE = re.compile(r"^ppt/slides/slide\d+\.xml$")
+_XLSX_SHEET = re.compile(r"^xl/worksheets/sheet\d+\.xml$")
+_DOCX_PAGES = re.compile(rb"<Pages>(\d+)</Pages>")
+
+_MARKDOWN_TABLE_RULE = re.compile(
+    r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)+\|?\s*$", re.M
+)
+_MARKDOWN_EQUATION = re.compile(r"\$\$.+?\$\$", re.S)
+
+# Content densities for what cannot be probed without parsing
+_TEXT_TOKENS_PER_PAGE = 500
+_TABLES_PER_PAGE = 0.15
+_EQUATIONS_PER_PAGE = 0.1
+_TEXT_CHARS_PER_TOKEN = 4
+_TEXT_TOKENS_PER_TEXT_PAGE = 750  # Pages of rendered plain text or Markdown
+_OFFICE_BYTES_PER_PAGE = 50 * 1024  # Legacy binary Office files
+_PDF_BYTES_PER_PAGE = 100 * 1024  # PDFs whose page tree is not visible
+
+# Prompt sizes of one call, in tokens
+_EXTRACTION_PROMPT_TOKENS = 1800
+_EXTRACTION_OUTPUT_TOKENS = 400
+_IMAGE_INPUT_TOKENS = 1100
+_ITEM_INPUT_TOKENS = 300  # Table body or equation
+_DESCRIPTION_PROMPT_TOKENS = 400
+_DESCRIPTION_OUTPUT_TOKENS = 300
+
+
+@dataclass(slots=True)
+class FileProbe:
+    """Content of one file as far as it can be seen without parsing"""
+
+    path: str
+    file_type: str
+    size: int
+    pages: int
+    images: int
+    tables: float  # Fractional when derived from per-page densities
+    equations: float
+    text_tokens: int
+
+
+@dataclass
+class CorpusEstimate:
+    """Projected cost of ingesting a set of files"""
+
+    files: int = 0
+    by_type: Dict[str, int] = field(default_factory=dict)
+    pages: int = 0
+    images: int = 0
+    tables: int = 0
+    equations: int = 0
+    text_tokens: int = 0
+    text_chunks: int = 0
+    llm_calls: int = 0
+    vlm_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    parse_seconds: float = 0.0  # Wall time of parsing at the configured concurrency
+    model_seconds: float = 0.0  # Wall time of model calls at the configured concurrency
+    projected_seconds: float = 0.0
+    probe_seconds: float = 0.0
+    unreadable: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Generate a summary of the estimate"""
+        types = ", ".join(f"{k}: {v}" for k, v in sorted(self.by_type.items()))
+        return (
+            f"Ingestion Estimate:\n"
+            f"  Files: {self.files} ({types})\n"
+            f"  Pages: {self.pages}\n"
+            f"  Images: {self.images}\n"
+            f"  Tables: ~{self.tables}\n"
+            f"  Equations: ~{self.equations}\n"
+            f"  Text: ~{self.text_tokens} tokens in ~{self.text_chunks} chunks\n"
+            f"  LLM calls: ~{self.llm_calls}\n"
+            f"  VLM calls: ~{self.vlm_calls}\n"
+            f"  Tokens: ~{self.input_tokens} in, ~{self.output_tokens} out\n"
+            f"  Parsing: ~{_format_duration(self.parse_seconds)}\n"
+            f"  Model calls: ~{_format_duration(self.model_seconds)}\n"
+            f"  Projected wall time: ~{_format_duration(self.projected_seconds)}\n"
+            f"  Probed in {self.probe_seconds:.2f} seconds"
+            + (f", {len(self.unreadable)} unreadable files" if self.unreadable else "")
+        )
+
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}min"
+    return f"{seconds / 3600:.1f}h"
+
+
+def _probe_pdf(file_path: str) -> tuple:
+    """Count pages and image XObjects of a PDF; pages is None when not found"""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None, 0
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            counts = find_pdf_page_counts(data)
+            images = len(_PDF_IMAGE.findall(data))
+
+            # PDF 1.5+ may pack dictionaries into compressed object streams
+            for match in _PDF_OBJECT_STREAM.finditer(data):
+                start = data.find(b"stream", match.end())
+                if start < 0:
+                    continue
+                start += len(b"stream")
+                if data[start : start + 2] == b"\r\n":
+                    start += 2
+                elif data[start : start + 1] in (b"\n", b"\r"):
+                    start += 1
+                end = data.find(b"endstream", start)
+                if end < 0:
+                    continue
+                try:
+                    objects = zlib.decompressobj().decompress(data[start:end])
+                except zlib.error:
+                    continue
+                counts.extend(find_pdf_page_counts(objects))
+                images += len(_PDF_IMAGE.findall(objects))
+
+    return (max(counts) if counts else None), images
+
+
+def _probe_office(file_path: str, ext: str) -> tuple:
+    """Count pages, images, tables and equations of an Office Open XML file"""
+    with zipfile.ZipFile(file_path) as archive:
+        names = archive.namelist()
+        images = sum(1 for name in names if _OFFICE_MEDIA.match(name))
+        tables = equations = 0
+        pages = None
+
+        if ext == ".pptx":
+            slides = [name for name in names if _PPTX_SLIDE.match(name)]
+            pages = len(slides)
+            for name in slides:
+                xml = archive.read(name)
+                tables += xml.count(b"<a:tbl>")
+                equations += xml.count(b"<m:oMath>")
+        elif ext == ".xlsx":
+            # Every sheet is described as one table
+            pages = tables = sum(1 for name in names if _XLSX_SHEET.match(name))
+        else:
+            if "word/document.xml" in names:
+                xml = archive.read("word/document.xml")
+                tables = xml.count(b"<w:tbl>")
+                equations = xml.count(b"<m:oMath>")
+            if "docProps/app.xml" in names:
+                match = _DOCX_PAGES.search(archive.read("docProps/app.xml"))
+                if match:
+                    pages = int(match.group(1))
+    return pages, images, tables, equations
+
+
+class CorpusEstimator:
+    """
+    Estimator of the model calls, tokens and time of an ingestion run
+
+    Counts are projections: tables and equations in PDFs follow fixed
+    per-page densities, and calls LightRAG makes beyond entity extraction
+    (description summaries when merging the graph) are not included.
+    """
+
+    def __init__(
+        self,
+        enable_image_processing: bool = True,
+        enable_table_processing: bool = True,
+        enable_equation_processing: bool = True,
+        images_per_vlm_call: int = 1,
+        context_tokens: int = 0,
+        chunk_token_size: int = 1200,
+        entity_extract_max_gleaning: int = 1,
+        max_concurrent_files: int = 1,
+        llm_max_async: int = 4,
+        llm_seconds_per_call: float = 6.0,
+        vlm_seconds_per_call: float = 10.0,
+        staged_pipeline: bool = False,
+        scheduler: Optional[WorkScheduler] = None,
+    ):
+        """
+        Initialize corpus estimator
+
+        Args:
+            enable_image_processing: Whether images are described by the vision model
+            enable_table_processing: Whether tables are described by the LLM
+            enable_equation_processing: Whether equations are described by the LLM
+            images_per_vlm_call: Images of one page described by one vision request
+            context_tokens: Surrounding content added to every description prompt
+            chunk_token_size: Tokens per text chunk
+            entity_extract_max_gleaning: Extra entity extraction passes per chunk
+            max_concurrent_files: Files parsed at once
+            llm_max_async: Model calls running at once
+            llm_seconds_per_call: Average duration of a text model call
+            vlm_seconds_per_call: Average duration of a vision model call
+            staged_pipeline: Whether parsing overlaps with model calls
+            scheduler: Work scheduler whose calibrated parse costs are used
+                (defaults to an uncalibrated one)
+        """
+        self.enable_image_processing = enable_image_processing
+        self.enable_table_processing = enable_table_processing
+        self.enable_equation_processing = enable_equation_processing
+        self.images_per_vlm_call = max(1, images_per_vlm_call)
+        self.context_tokens = context_tokens
+        self.chunk_token_size = max(1, chunk_token_size)
+        self.entity_extract_max_gleaning = entity_extract_max_gleaning
+        self.max_concurrent_files = max(1, max_concurrent_files)
+        self.llm_max_async = max(1, llm_max_async)
+        self.llm_seconds_per_call = llm_seconds_per_call
+        self.vlm_seconds_per_call = vlm_seconds_per_call
+        self.staged_pipeline = staged_pipeline
+        self.scheduler = scheduler or WorkScheduler(profile="parse")
+
+    def probe(self, file_path: str) -> FileProbe:
+        """
+        Probe a file without parsing it
+
+        Args:
+            file_path: Path to the file
+
+        Returns:
+            FileProbe of the file
+        """
+        file_type = get_file_type(file_path)
+        ext = os.path.splitext(file_path)[1].lower()
+        size = os.path.getsize(file_path)
+        pages = None
+        images = 0
+        tables = equations = None
+
+        if file_type == "pdf":
+            pages, images = _probe_pdf(file_path)
+        elif file_type == "office":
+            if zipfile.is_zipfile(file_path):
+                pages, images, tables, equations = _probe_office(file_path, ext)
+            else:
+                pages = max(1, size // _OFFICE_BYTES_PER_PAGE)
+        elif file_type == "image":
+            pages, images, tables, equations = 1, 1, 0, 0
+        elif file_type == "text":
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+            tables = equations = 0
+            if ext == ".md":
+                tables = len(_MARKDOWN_TABLE_RULE.findall(text))
+                equations = len(_MARKDOWN_EQUATION.findall(text))
+            text_tokens = len(text) // _TEXT_CHARS_PER_TOKEN
+            pages = max(1, math.ceil(text_tokens / _TEXT_TOKENS_PER_TEXT_PAGE))
+            return FileProbe(
+                file_path, file_type, size, pages, 0, tables, equations, text_tokens
+            )
+
+        if pages is None:
+            pages = max(1, size // _PDF_BYTES_PER_PAGE)
+        if tables is None:
+            tables = pages * _TABLES_PER_PAGE
+        if equations is None:
+            equations = pages * _EQUATIONS_PER_PAGE
+        return FileProbe(
+            file_path,
+            file_type,
+            size,
+            pages,
+            images,
+            tables,
+            equations,
+            pages * _TEXT_TOKENS_PER_PAGE if file_type != "image" else 0,
+        )
+
+    def estimate(self, file_paths: Iterable[str]) -> CorpusEstimate:
+        """
+        Probe files and project the cost of ingesting them
+
+        Args:
+            file_paths: Files to ingest
+
+        Returns:
+            CorpusEstimate with content totals, calls, tokens and wall time
+        """
+        start = time.perf_counter()
+        result = CorpusEstimate()
+        tables = equations = 0.0
+        parse_cost = 0.0
+        longest_parse = 0.0
+
+        for file_path in file_paths:
+            try:
+                probe = self.probe(file_path)
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                logger.warning(f"Cannot probe {file_path}: {e}")
+                result.unreadable.append(file_path)
+                continue
+
+            result.files += 1
+            result.by_type[probe.file_type] = result.by_type.get(probe.file_type, 0) + 1
+            result.pages += probe.pages
+            result.images += probe.images
+            result.text_tokens += probe.text_tokens
+            if probe.text_tokens:
+                result.text_chunks += math.ceil(
+                    probe.text_tokens / self.chunk_token_size
+                )
+            tables += probe.tables
+            equations += probe.equations
+            if self.enable_image_processing and probe.images:
+                # Only images of the same page share a vision request
+                result.vlm_calls += max(
+                    math.ceil(probe.images / self.images_per_vlm_call),
+                    min(probe.images, probe.pages),
+                )
+
+            cost = self.scheduler.estimate(
+                file_path, size=probe.size, pages=probe.pages
+            ).cost
+            parse_cost += cost
+            longest_parse = max(longest_parse, cost)
+
+        result.tables = round(tables)
+        result.equations = round(equations)
+
+        # Description calls of the multimodal processors
+        described_items = 0
+        if self.enable_image_processing and result.images:
+            described_items += result.images
+            result.input_tokens += (
+                result.images * _IMAGE_INPUT_TOKENS
+                + result.vlm_calls * (_DESCRIPTION_PROMPT_TOKENS + self.context_tokens)
+            )
+            result.output_tokens += result.images * _DESCRIPTION_OUTPUT_TOKENS
+        for enabled, count in (
+            (self.enable_table_processing, result.tables),
+            (self.enable_equation_processing, result.equations),
+        ):
+            if enabled and count:
+                result.llm_calls += count
+                described_items += count
+                result.input_tokens += count * (
+                    _ITEM_INPUT_TOKENS
+                    + _DESCRIPTION_PROMPT_TOKENS
+                    + self.context_tokens
+                )
+                result.output_tokens += count * _DESCRIPTION_OUTPUT_TOKENS
+
+        # Entity extraction runs on every text chunk and every description;
+        # each gleaning pass sends the content again
+        passes = 1 + max(0, self.entity_extract_max_gleaning)
+        extraction_calls = (result.text_chunks + described_items) * passes
+        extracted_tokens = (
+            result.text_tokens + described_items * _DESCRIPTION_OUTPUT_TOKENS
+        )
+        result.llm_calls += extraction_calls
+        result.input_tokens += (
+            passes * extracted_tokens + extraction_calls * _EXTRACTION_PROMPT_TOKENS
+        )
+        result.output_tokens += extraction_calls * _EXTRACTION_OUTPUT_TOKENS
+
+        # A batch takes at least as long as its longest file
+        result.parse_seconds = max(
+            parse_cost / self.max_concurrent_files, longest_parse
+        )
+        result.model_seconds = (
+            result.llm_calls * self.llm_seconds_per_call
+            + result.vlm_calls * self.vlm_seconds_per_call
+        ) / self.llm_max_async
+        # Parsing overlaps with model calls in the staged pipeline; otherwise
+        # both are counted, which is an upper bound
+        if self.staged_pipeline:
+            result.projected_seconds = max(result.parse_seconds, result.model_seconds)
+        else:
+            result.projected_seconds = result.parse_seconds + result.model_seconds
+        result.probe_seconds = time.perf_counter() - start
+        return result
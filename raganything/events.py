@@ -0,0 +1,201 @@
+"""
+Streaming batch events for RAGAnything
+
+Contains the per-file and progress events yielded by the streaming batch APIs
+and the runner that produces them. Files are processed with bounded
+concurrency, every file is reported as soon as it finishes, progress with
+throughput and ETA is reported periodically, and the rest of the batch can be
+cancelled at any point.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    Union,
+)
+
+from lightrag.utils import logger
+
+FILE_SUCCESS = "success"
+FILE_FAILED = "failed"
+FILE_CANCELLED = "cancelled"
+
+
+@dataclass
+class FileEvent:
+    """Outcome of one file"""
+
+    file_path: str
+    status: str  # FILE_SUCCESS, FILE_FAILED or FILE_CANCELLED
+    duration: float = 0.0
+    timings: Dict[str, float] = field(default_factory=dict)  # Seconds per stage
+    blocks: Dict[str, int] = field(default_factory=dict)  # Content blocks by type
+    doc_id: Optional[str] = None
+    error: Optional[str] = None
+    event: str = "file"
+
+
+@dataclass
+class ProgressEvent:
+    """Periodic batch progress"""
+
+    completed: int  # Files finished, including failed ones
+    failed: int
+    cancelled: int
+    in_flight: int
+    total: Optional[int]  # None when the number of files is not known upfront
+    elapsed_seconds: float
+    files_per_minute: float
+    eta_seconds: Optional[float]
+    final: bool = False
+    event: str = "progress"
+
+
+BatchEvent = Union[FileEvent, ProgressEvent]
+
+
+async def stream_file_events(
+    file_paths: Iterable[str],
+    process: Callable[[str], Awaitable[FileEvent]],
+    max_workers: int = 1,
+    total: Optional[int] = None,
+    cancel_event: Optional[asyncio.Event] = None,
+    progress_interval: float = 5.0,
+) -> AsyncIterator[BatchEvent]:
+    """
+    Process files concurrently and yield an event per finished file
+
+    Files are started lazily as workers become free, so file_paths may be a
+    generator. A ProgressEvent is yielded every progress_interval seconds and
+    once at the end. Setting cancel_event, or closing the generator (for
+    example by breaking out of the loop), cancels the files in flight and
+    starts no new ones. With cancel_event, the files in flight and the files
+    not yet started are reported as cancelled, so completed plus cancelled
+    in the final ProgressEvent covers every file.
+
+    Args:
+        file_paths: Files to process
+        process: Coroutine function processing one file; an exception is
+            reported as a failed FileEvent
+        max_workers: Maximum number of files processed at once
+        total: Number of files, used for the ETA (optional)
+        cancel_event: Event that cancels the rest of the batch (optional)
+        progress_interval: Seconds between progress events; 0 disables them
+
+    Yields:
+        FileEvent per finished file and periodic ProgressEvent
+    """
+    start = time.perf_counter()
+    remaining = iter(file_paths)
+    running: Dict[asyncio.Task, str] = {}
+    completed = failed = cancelled = 0
+    next_progress = start + progress_interval if progress_interval > 0 else None
+
+    async def run(file_path: str) -> FileEvent:
+        started = time.perf_counter()
+        try:
+            return await process(file_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to process {file_path}: {e}")
+            return FileEvent(
+                file_path,
+                FILE_FAILED,
+                duration=time.perf_counter() - started,
+                error=str(e),
+            )
+
+    def fill():
+        while len(running) < max(1, max_workers):
+            file_path = next(remaining, None)
+            if file_path is None:
+                return
+            running[asyncio.create_task(run(file_path))] = file_path
+
+    def progress(final: bool = False) -> ProgressEvent:
+        elapsed = time.perf_counter() - start
+        rate = completed / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if total is not None and rate > 0:
+            eta = round(max(0, total - completed - cancelled) / rate, 1)
+        return ProgressEvent(
+            completed=completed,
+            failed=failed,
+            cancelled=cancelled,
+            in_flight=len(running),
+            total=total,
+            elapsed_seconds=round(elapsed, 3),
+            files_per_minute=round(rate * 60, 2),
+            eta_seconds=eta,
+            final=final,
+        )
+
+    cancel_waiter = (
+        asyncio.create_task(cancel_event.wait()) if cancel_event is not None else None
+    )
+    try:
+        fill()
+        while running:
+            waiting: Set[asyncio.Future] = set(running)
+            if cancel_waiter is not None:
+                waiting.add(cancel_waiter)
+            timeout = (
+                max(0.0, next_progress - time.perf_counter())
+                if next_progress is not None
+                else None
+            )
+            done, _ = await asyncio.wait(
+                waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            for task in done:
+                if task is cancel_waiter:
+                    continue
+                running.pop(task)
+                event = task.result()
+                completed += 1
+                failed += event.status == FILE_FAILED
+                yield event
+
+            if cancel_waiter is not None and cancel_waiter.done():
+                break
+
+            fill()
+            if next_progress is not None and time.perf_counter() >= next_progress:
+                next_progress = time.perf_counter() + progress_interval
+                yield progress()
+
+        if running:
+            logger.info(f"Batch cancelled with {len(running)} files in flight")
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            for file_path in running.values():
+                cancelled += 1
+                yield FileEvent(file_path, FILE_CANCELLED)
+            running.clear()
+
+        if cancel_waiter is not None and cancel_waiter.done():
+            # Files never started are reported too, so the final counts add up
+            for file_path in remaining:
+                cancelled += 1
+                yield FileEvent(file_path, FILE_CANCELLED)
+
+        yield progress(final=True)
+    finally:
+        # Also reached when the consumer closes the generator early
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        if cancel_waiter is not None:
+            cancel_waiter.cancel()
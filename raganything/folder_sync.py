@@ -0,0 +1,222 @@
+"""
+Incremental folder synchronization for RAGAnything
+
+Contains a persisted manifest of the files ingested from a folder (path, size,
+modification time, content hash and document ID) and the delta computation
+between the manifest and the folder on disk. Files whose size and modification
+time are unchanged are not read, so a sync of an unchanged folder only costs a
+directory walk.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from raganything.scanner import scan_files
+from raganything.utils import compute_file_hash
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    """A file recorded in the folder manifest"""
+
+    path: str
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str] = None
+    doc_id: Optional[str] = None
+
+
+@dataclass
+class SyncDelta:
+    """Difference between a folder and its manifest"""
+
+    added: List[ManifestEntry] = field(default_factory=list)
+    modified: List[Tuple[ManifestEntry, ManifestEntry]] = field(
+        default_factory=list
+    )  # (current file, manifest entry)
+    deleted: List[ManifestEntry] = field(default_factory=list)
+    touched: List[ManifestEntry] = field(
+        default_factory=list
+    )  # New mtime, same content
+    unchanged: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    root TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT,
+    doc_id TEXT,
+    synced_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_root ON files (root);
+CREATE INDEX IF NOT EXISTS files_doc_id ON files (doc_id);
+"""
+
+
+class FolderManifest:
+    """
+    SQLite-backed manifest of the files ingested from folders
+
+    One database can hold the manifests of several folders; entries are
+    grouped by the absolute path of the folder they were synced from.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize folder manifest
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def load(self, root: str) -> Dict[str, ManifestEntry]:
+        """
+        Load the manifest entries of a folder
+
+        Args:
+            root: Folder path
+
+        Returns:
+            Dict mapping absolute file path to ManifestEntry
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, content_hash, doc_id FROM files "
+                "WHERE root = ?",
+                (os.path.abspath(root),),
+            ).fetchall()
+        return {row[0]: ManifestEntry(*row) for row in rows}
+
+    def record(self, root: str, entries: Iterable[ManifestEntry]) -> None:
+        """Insert or update entries of a folder"""
+        now = time.time()
+        rows = [
+            (
+                entry.path,
+                os.path.abspath(root),
+                entry.size,
+                entry.mtime_ns,
+                entry.content_hash,
+                entry.doc_id,
+                now,
+            )
+            for entry in entries
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files "
+                    "(path, root, size, mtime_ns, content_hash, doc_id, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def remove(self, paths: Iterable[str]) -> None:
+        """Remove entries by file path"""
+        rows = [(path,) for path in paths]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", rows)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def is_doc_referenced(self, doc_id: str) -> bool:
+        """Check whether any file in the manifest still maps to a document"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM files WHERE doc_id = ? LIMIT 1", (doc_id,)
+            ).fetchone()
+        return row is not None
+
+    def compute_delta(
+        self,
+        root: str,
+        file_extensions: Iterable[str],
+        recursive: bool = True,
+    ) -> SyncDelta:
+        """
+        Compare a folder with its manifest
+
+        Files whose size and modification time match the manifest are
+        unchanged without being read. Other known files are hashed, and a file
+        whose content hash still matches is only touched (its new mtime is
+        recorded) instead of being reported as modified.
+
+        Args:
+            root: Folder path
+            file_extensions: Extensions of files to include
+            recursive: Whether to include subfolders
+
+        Returns:
+            SyncDelta of the folder
+        """
+        known = self.load(root)
+        delta = SyncDelta()
+
+        for scanned in scan_files(root, file_extensions, recursive):
+            previous = known.pop(scanned.path, None)
+            current = ManifestEntry(scanned.path, scanned.size, scanned.mtime_ns)
+            if previous is None:
+                delta.added.append(current)
+                continue
+            if previous.size == current.size and previous.mtime_ns == current.mtime_ns:
+                delta.unchanged += 1
+                continue
+
+            current.content_hash = compute_file_hash(scanned.path)
+            if (
+                current.content_hash is not None
+                and current.content_hash == previous.content_hash
+            ):
+                current.doc_id = previous.doc_id
+                delta.touched.append(current)
+            else:
+                delta.modified.append((current, previous))
+
+        # Whatever was not seen on disk has been deleted
+        delta.deleted.extend(known.values())
+        return delta
@@ -0,0 +1,418 @@
+"""
+Folder watching for continuous ingestion
+
+Contains a watcher that reports files arriving in a folder tree in batches.
+On Linux it uses inotify through ctypes; elsewhere, or when inotify cannot
+be used, it polls directory modification times and only lists directories
+that changed. Files are reported once their size and modification time have
+stopped changing for the debounce period, so partially written files are
+not picked up.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+import time
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from lightrag.utils import logger
+
+from raganything.scanner import has_supported_suffix, normalize_suffixes
+
+# inotify event masks (see inotify(7))
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+# IN_CREATE starts the debounce of a new file and IN_CLOSE_WRITE restarts it;
+# individual writes are not watched since the debounce re-checks size and mtime
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+def _load_libc():
+    """Load libc with the inotify functions, or return None if unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def _list_directory(
+    directory: str, extensions: FrozenSet[str]
+) -> Tuple[List[str], Dict[str, int]]:
+    """
+    List the subdirectories and supported files of one directory
+
+    Returns:
+        Tuple of (subdirectory paths, dict of file path to mtime_ns)
+    """
+    subdirectories = []
+    files = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                    elif has_supported_suffix(entry.name, extensions) and (
+                        entry.is_file()
+                    ):
+                        files[entry.path] = entry.stat().st_mtime_ns
+                except OSError:
+                    continue
+    except OSError as e:
+        logger.debug(f"Cannot list {directory}: {e}")
+    return subdirectories, files
+
+
+class _InotifySource:
+    """Reports changed files from inotify events"""
+
+    def __init__(self, libc, root: str, extensions: FrozenSet[str], recursive: bool):
+        self._libc = libc
+        self.root = root
+        self.extensions = extensions
+        self.recursive = recursive
+        self._watches: Dict[int, str] = {}
+        self._changed: List[str] = []
+        self._event = asyncio.Event()
+        self._buffer = b""
+
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self._watch_tree(root, report_files=False)
+        except OSError:
+            os.close(self._fd)
+            raise
+        asyncio.get_running_loop().add_reader(self._fd, self._on_readable)
+
+    def close(self) -> None:
+        asyncio.get_running_loop().remove_reader(self._fd)
+        os.close(self._fd)
+
+    def _watch_tree(self, directory: str, report_files: bool) -> None:
+        """Watch a directory and its subdirectories"""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), _WATCH_MASK
+            )
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error in (errno.ENOENT, errno.ENOTDIR):
+                    continue  # Removed before it could be watched
+                raise OSError(error, f"inotify_add_watch failed for {current}")
+            self._watches[wd] = current
+
+            subdirectories, files = _list_directory(current, self.extensions)
+            # Files may land in a new directory before it is watched
+            if report_files:
+                self._changed.extend(files)
+            if self.recursive:
+                pending.extend(subdirectories)
+
+    def _on_readable(self) -> None:
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            self._buffer += data
+
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(self._buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(self._buffer, offset)
+            end = offset + _EVENT_HEADER.size + length
+            if end > len(self._buffer):
+                break
+            name = os.fsdecode(
+                self._buffer[offset + _EVENT_HEADER.size : end].rstrip(b"\0")
+            )
+            offset = end
+            self._handle_event(wd, mask, name)
+        self._buffer = self._buffer[offset:]
+        self._event.set()
+
+    def _handle_event(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            logger.warning("inotify event queue overflowed; rescanning watched folders")
+            for directory in list(self._watches.values()):
+                self._changed.extend(_list_directory(directory, self.extensions)[1])
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+
+        directory = self._watches.get(wd)
+        if directory is None or not name:
+            return
+        path = os.path.join(directory, name)
+
+        if mask & IN_ISDIR:
+            if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                try:
+                    self._watch_tree(path, report_files=True)
+                except OSError as e:
+                    logger.warning(f"Cannot watch {path}: {e}")
+        elif has_supported_suffix(name, self.extensions):
+            self._changed.append(path)
+
+    async def wait(self, timeout: float) -> List[str]:
+        """Wait up to timeout seconds and return the files changed meanwhile"""
+        if not self._changed:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._event.clear()
+        changed, self._changed = self._changed, []
+        return changed
+
+
+class _PollingSource:
+    """Reports changed files by polling directory modification times"""
+
+    def __init__(self, root: str, extensions: FrozenSet[str], recursive: bool):
+        self.root = root
+        self.extensions = extensions
+        self.recursive = recursive
+        self._directories: Dict[str, int] = {}  # Directory -> mtime_ns
+        self._files: Dict[str, Dict[str, int]] = {}  # Directory -> file mtimes
+        self._add_tree(root, report_files=False)
+
+    def close(self) -> None:
+        pass
+
+    def _add_tree(self, directory: str, report_files: bool) -> List[str]:
+        changed = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                self._directories[current] = os.stat(current).st_mtime_ns
+            except OSError:
+                continue
+            subdirectories, files = _list_directory(current, self.extensions)
+            self._files[current] = files
+            if report_files:
+                changed.extend(files)
+            if self.recursive:
+                pending.extend(subdirectories)
+        return changed
+
+    def _poll(self) -> List[str]:
+        changed = []
+        for directory, mtime_ns in list(self._directories.items()):
+            try:
+                current_mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                # Directory removed
+                self._directories.pop(directory, None)
+                self._files.pop(directory, None)
+                continue
+            if current_mtime == mtime_ns:
+                continue
+
+            # Only directories whose entries changed are listed again
+            self._directories[directory] = current_mtime
+            subdirectories, files = _list_directory(directory, self.extensions)
+            previous = self._files.get(directory, {})
+            changed.extend(
+                path
+                for path, file_mtime in files.items()
+                if previous.get(path) != file_mtime
+            )
+            self._files[directory] = files
+            if self.recursive:
+                for subdirectory in subdirectories:
+                    if subdirectory not in self._directories:
+                        changed.extend(self._add_tree(subdirectory, report_files=True))
+        return changed
+
+    async def wait(self, timeout: float) -> List[str]:
+        """Wait timeout seconds and return the files changed meanwhile"""
+        await asyncio.sleep(timeout)
+        return await asyncio.to_thread(self._poll)
+
+
+class FolderWatcher:
+    """
+    Watches a folder tree and yields batches of newly arrived files
+
+    A file becomes ready once its size and mtime stayed the same for
+    debounce_seconds. Ready files are grouped until batch_size files are
+    ready or the oldest ready file waited batch_window seconds.
+    """
+
+    def __init__(
+        self,
+        folder_path: str,
+        file_extensions: Iterable[str],
+        recursive: bool = True,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 1.0,
+        batch_size: int = 16,
+        batch_window: float = 5.0,
+        use_inotify: bool = True,
+    ):
+        """
+        Initialize folder watcher
+
+        Args:
+            folder_path: Folder to watch
+            file_extensions: Extensions of files to report
+            recursive: Whether to watch subfolders
+            debounce_seconds: Time a file must stay unchanged before it is reported
+            poll_interval: Seconds between checks of pending files (and between
+                directory polls without inotify)
+            batch_size: Maximum number of files per batch
+            batch_window: Maximum seconds a ready file waits for its batch to fill
+            use_inotify: Use inotify when available instead of polling
+        """
+        self.root = os.path.abspath(folder_path)
+        self.extensions = normalize_suffixes(file_extensions)
+        self.recursive = recursive
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+
+        # Path -> (size, mtime_ns, time of the last change)
+        self._pending: Dict[str, Tuple[int, int, float]] = {}
+        self._ready: List[str] = []
+        self._ready_since: Optional[float] = None
+
+    def _open_source(self):
+        libc = _load_libc() if self.use_inotify else None
+        if libc is not None:
+            try:
+                source = _InotifySource(
+                    libc, self.root, self.extensions, self.recursive
+                )
+                self.backend = "inotify"
+                return source
+            except OSError as e:
+                logger.warning(f"inotify unavailable ({e}); falling back to polling")
+        self.backend = "polling"
+        return _PollingSource(self.root, self.extensions, self.recursive)
+
+    def _track(self, paths: Iterable[str], now: float) -> None:
+        """Start or restart the debounce period of changed files"""
+        for path in dict.fromkeys(paths):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                self._pending.pop(path, None)
+                continue
+            self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+
+    def _collect_ready(self, now: float) -> None:
+        """Move pending files that stopped changing to the ready list"""
+        for path, (size, mtime_ns, changed_at) in list(self._pending.items()):
+            if now - changed_at < self.debounce_seconds:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+                continue
+
+            del self._pending[path]
+            if path not in self._ready:
+                self._ready.append(path)
+                if self._ready_since is None:
+                    self._ready_since = now
+
+    def _take_batch(self, now: float, force: bool = False) -> List[str]:
+        if not self._ready:
+            return []
+        if (
+            not force
+            and len(self._ready) < self.batch_size
+            and now - self._ready_since < self.batch_window
+        ):
+            return []
+        batch = self._ready[: self.batch_size]
+        self._ready = self._ready[self.batch_size :]
+        self._ready_since = now if self._ready else None
+        return batch
+
+    async def batches(
+        self,
+        stop_event: Optional[asyncio.Event] = None,
+        initial_files: Iterable[str] = (),
+    ) -> AsyncIterator[List[str]]:
+        """
+        Yield batches of arrived files until stop_event is set
+
+        Args:
+            stop_event: Event that ends the watch; files already ready are
+                yielded as a last batch
+            initial_files: Files to treat as arrived when the watch starts
+
+        Yields:
+            Lists of file paths
+        """
+        source = self._open_source()
+        logger.info(f"Watching {self.root} for new files ({self.backend})")
+        try:
+            self._track(initial_files, time.monotonic())
+            while stop_event is None or not stop_event.is_set():
+                # Wake up often enough to release debounced files on time
+                timeout = (
+                    min(self.poll_interval, self.debounce_seconds)
+                    if self._pending or self._ready
+                    else self.poll_interval
+                )
+                changed = await source.wait(timeout)
+                now = time.monotonic()
+                self._track(changed, now)
+                self._collect_ready(now)
+
+                batch = self._take_batch(now)
+                while batch:
+                    yield batch
+                    batch = self._take_batch(time.monotonic())
+
+            self._collect_ready(time.monotonic())
+            batch = self._take_batch(time.monotonic(), force=True)
+            while batch:
+                yield batch
+                batch = self._take_batch(time.monotonic(), force=True)
+        finally:
+            source.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of files waiting for debounce or for their batch"""
+        return {"pending": len(self._pending), "ready": len(self._ready)}
@@ -0,0 +1,371 @@
+"""
+Durable ingestion job queue for RAGAnything
+
+Contains a SQLite-backed queue of files to ingest. Workers lease jobs, so a
+job whose worker died is handed out again once its lease expires, and a
+restarted run resumes with the jobs that are not done yet. Every job keeps its
+attempts, error and timings, which also feed the throughput and backlog stats.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from lightrag.utils import logger
+
+
+class JobStatus(str, Enum):
+    """Lifecycle state of an ingestion job"""
+
+    PENDING = "pending"  # Waiting to be leased
+    RUNNING = "running"  # Leased by a worker
+    DONE = "done"  # Ingested successfully
+    FAILED = "failed"  # Gave up after max_attempts
+
+
+@dataclass(slots=True)
+class IngestJob:
+    """A leased ingestion job"""
+
+    id: int
+    file_path: str
+    payload: Dict[str, Any]
+    attempts: int
+    lease_expires_at: float
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_path TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    last_error TEXT,
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_expires_at REAL,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+"""
+
+
+class IngestQueue:
+    """
+    SQLite-backed queue of ingestion jobs with leases and retries
+
+    The database runs in WAL mode and every state change is a single
+    transaction, so the queue survives crashes at any point. Leasing marks
+    the job as running until lease_expires_at; a job that is still running
+    after its lease expired is leased again by the next caller.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        lease_seconds: float = 1800,
+        max_attempts: int = 3,
+    ):
+        """
+        Initialize ingestion queue
+
+        Args:
+            db_path: Path of the SQLite database file
+            lease_seconds: Time a worker may hold a job before it is handed out again
+            max_attempts: Number of attempts before a job is marked as failed
+        """
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._opened_at = time.time()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _transaction(self, statements: Iterable[Tuple[str, Tuple]]) -> None:
+        """Run statements in one immediate transaction"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql, params in statements:
+                    self._conn.execute(sql, params)
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(
+        self,
+        jobs: Iterable[Tuple[str, Dict[str, Any]]],
+        requeue_finished: bool = False,
+        chunk_size: int = 10000,
+    ) -> int:
+        """
+        Add jobs to the queue, ignoring files that are already queued
+
+        Args:
+            jobs: Iterable of (file_path, payload) pairs; payload holds the keyword
+                arguments for processing the file
+            requeue_finished: Also reset done and failed jobs of these files to pending
+            chunk_size: Number of jobs inserted per transaction
+
+        Returns:
+            Number of jobs that were added or requeued
+        """
+        added = 0
+        now = time.time()
+        batch = []
+
+        def flush():
+            nonlocal added
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    before = self._conn.total_changes
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO jobs (file_path, payload, enqueued_at) "
+                        "VALUES (?, ?, ?)",
+                        batch,
+                    )
+                    if requeue_finished:
+                        self._conn.executemany(
+                            "UPDATE jobs SET status = 'pending', attempts = 0, "
+                            "payload = ?, last_error = NULL, enqueued_at = ? "
+                            "WHERE file_path = ? AND status IN ('done', 'failed')",
+                            [(payload, at, path) for path, payload, at in batch],
+                        )
+                    added += self._conn.total_changes - before
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+            batch.clear()
+
+        for file_path, payload in jobs:
+            batch.append((str(file_path), json.dumps(payload or {}), now))
+            if len(batch) >= chunk_size:
+                flush()
+        if batch:
+            flush()
+        return added
+
+    def lease(self, worker: str) -> Optional[IngestJob]:
+        """
+        Lease the oldest pending job, or a running job whose lease expired
+
+        Args:
+            worker: Identifier of the leasing worker, stored for diagnostics
+
+        Returns:
+            IngestJob, or None if no job is available
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, file_path, payload, attempts FROM jobs "
+                    "WHERE status = 'pending' "
+                    "OR (status = 'running' AND lease_expires_at < ?) "
+                    "ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                job_id, file_path, payload, attempts = row
+                lease_expires_at = now + self.lease_seconds
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = ?, worker = ?, "
+                    "started_at = ?, lease_expires_at = ? WHERE id = ?",
+                    (attempts + 1, worker, now, lease_expires_at, job_id),
+                )
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+        return IngestJob(
+            id=job_id,
+            file_path=file_path,
+            payload=json.loads(payload),
+            attempts=attempts + 1,
+            lease_expires_at=lease_expires_at,
+        )
+
+    def renew(self, job: IngestJob) -> None:
+        """Extend the lease of a job that is still being processed"""
+        job.lease_expires_at = time.time() + self.lease_seconds
+        self._transaction(
+            [
+                (
+                    "UPDATE jobs SET lease_expires_at = ? "
+                    "WHERE id = ? AND status = 'running'",
+                    (job.lease_expires_at, job.id),
+                )
+            ]
+        )
+
+    def complete(self, job: IngestJob) -> None:
+        """Mark a job as done"""
+        now = time.time()
+        self._transaction(
+            [
+                (
+                    "UPDATE jobs SET status = 'done', finished_at = ?, "
+                    "duration = ? - started_at, last_error = NULL, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    (now, now, job.id),
+                )
+            ]
+        )
+
+    def fail(self, job: IngestJob, error: str) -> bool:
+        """
+        Record a failed attempt
+
+        Args:
+            job: Leased job
+            error: Error message
+
+        Returns:
+            True if the job will be retried, False if it is marked as failed
+        """
+        now = time.time()
+        retry = job.attempts < self.max_attempts
+        self._transaction(
+            [
+                (
+                    "UPDATE jobs SET status = ?, finished_at = ?, "
+                    "duration = ? - started_at, last_error = ?, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    (
+                        JobStatus.PENDING.value if retry else JobStatus.FAILED.value,
+                        now,
+                        now,
+                        error,
+                        job.id,
+                    ),
+                )
+            ]
+        )
+        return retry
+
+    def requeue_running(self) -> int:
+        """
+        Return all running jobs to pending
+
+        Only safe when no other process consumes the queue; used on restart so
+        jobs interrupted by a crash do not wait for their leases to expire.
+
+        Returns:
+            Number of jobs returned to pending
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', lease_expires_at = NULL "
+                "WHERE status = 'running'"
+            )
+            return cursor.rowcount
+
+    def retry_failed(self) -> int:
+        """Reset failed jobs to pending with a fresh attempt budget"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = 0 "
+                "WHERE status = 'failed'"
+            )
+            return cursor.rowcount
+
+    def failed_jobs(self, limit: int = 100) -> List[Tuple[str, str]]:
+        """Get (file_path, last_error) of failed jobs"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT file_path, last_error FROM jobs WHERE status = 'failed' "
+                "ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def get_stats(self, window_seconds: float = 60.0) -> Dict[str, Any]:
+        """
+        Get queue backlog, throughput and timing statistics
+
+        Args:
+            window_seconds: Window for the recent throughput
+
+        Returns:
+            Dict with per-status counts, backlog, throughput and ETA
+        """
+        now = time.time()
+        with self._lock:
+            counts = dict(
+                self._conn.execute(
+                    "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+                ).fetchall()
+            )
+            recent_done, recent_duration = self._conn.execute(
+                "SELECT COUNT(*), AVG(duration) FROM jobs "
+                "WHERE status = 'done' AND finished_at >= ?",
+                (now - window_seconds,),
+            ).fetchone()
+            total_duration, total_attempts = self._conn.execute(
+                "SELECT AVG(CASE WHEN status = 'done' THEN duration END), "
+                "SUM(attempts) FROM jobs"
+            ).fetchone()
+
+        pending = counts.get(JobStatus.PENDING.value, 0)
+        running = counts.get(JobStatus.RUNNING.value, 0)
+        backlog = pending + running
+        throughput = recent_done / window_seconds
+        return {
+            "pending": pending,
+            "running": running,
+            "done": counts.get(JobStatus.DONE.value, 0),
+            "failed": counts.get(JobStatus.FAILED.value, 0),
+            "total": sum(counts.values()),
+            "backlog": backlog,
+            "attempts": total_attempts or 0,
+            "throughput_per_minute": round(throughput * 60, 2),
+            "avg_recent_duration_seconds": round(recent_duration or 0.0, 3),
+            "avg_duration_seconds": round(total_duration or 0.0, 3),
+            "eta_seconds": round(backlog / throughput, 1) if throughput else None,
+            "uptime_seconds": round(now - self._opened_at, 1),
+        }
+
+    def log_stats(self) -> None:
+        """Log a one-line summary of the queue state"""
+        stats = self.get_stats()
+        logger.info(
+            f"Ingest queue: {stats['done']} done, {stats['failed']} failed, "
+            f"{stats['backlog']} remaining, "
+            f"{stats['throughput_per_minute']} files/min"
+        )
@@ -0,0 +1,158 @@
+"""
+Cross-document batching of multimodal entity extraction and graph merge
+
+Contains the accumulator used during folder ingestion to collect the
+multimodal chunks of several documents and run one combined entity extraction
+and knowledge graph merge for all of them.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+from lightrag.utils import logger
+
+
+@dataclass(slots=True)
+class PendingMultimodalMerge:
+    """Multimodal chunks of one document waiting for the next batch merge"""
+
+    doc_id: str
+    file_path: str
+    lightrag_chunks: Dict[str, Any]
+    records: List[Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class MultimodalMergeBatch:
+    """
+    Accumulates documents and merges their multimodal chunks together
+
+    Documents submit their stored chunks and wait until the batch containing
+    them has been extracted and merged. A batch is merged once batch_size
+    documents are waiting, or once every document currently in flight is
+    waiting, so a batch never waits for documents that cannot arrive.
+    """
+
+    def __init__(
+        self,
+        merge_func: Callable[[List[PendingMultimodalMerge]], Awaitable[None]],
+        batch_size: int,
+    ):
+        """
+        Initialize merge batch
+
+        Args:
+            merge_func: Coroutine function running extraction and merge for a batch
+            batch_size: Maximum number of documents per merge
+        """
+        self.merge_func = merge_func
+        self.batch_size = max(1, batch_size)
+
+        self.merge_count = 0
+        self.merged_documents = 0
+        self._pending: List[PendingMultimodalMerge] = []
+        self._in_flight = 0
+        self._wait_seconds: Dict[str, float] = {}
+        self._merge_lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def member(self):
+        """Track a document in flight so partial batches are merged when it leaves"""
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            await self._merge_if_ready()
+
+    async def submit(
+        self,
+        doc_id: str,
+        file_path: str,
+        lightrag_chunks: Dict[str, Any],
+        records: List[Any],
+    ) -> None:
+        """
+        Add a document to the batch and wait until its batch has been merged
+
+        Args:
+            doc_id: Document ID
+            file_path: File path for citation
+            lightrag_chunks: Stored multimodal chunks of the document
+            records: Multimodal chunk records of the document
+
+        Raises:
+            Exception: Any error raised while merging the batch
+        """
+        start = time.perf_counter()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(
+            PendingMultimodalMerge(
+                doc_id=doc_id,
+                file_path=file_path,
+                lightrag_chunks=lightrag_chunks,
+                records=records,
+                future=future,
+            )
+        )
+        try:
+            await self._merge_if_ready()
+            await future
+        finally:
+            self._wait_seconds[doc_id] = (
+                self._wait_seconds.get(doc_id, 0.0) + time.perf_counter() - start
+            )
+
+    def pop_wait_seconds(self, doc_id: str) -> float:
+        """Take the seconds a document spent waiting for its batch to be merged"""
+        return self._wait_seconds.pop(doc_id, 0.0)
+
+    async def flush(self) -> None:
+        """Merge all pending documents regardless of batch size"""
+        await self._merge_if_ready(force=True)
+
+    async def _merge_if_ready(self, force: bool = False) -> None:
+        """Take and merge the pending batch once it is full or nothing else can join"""
+        if not self._pending:
+            return
+        if not force and len(self._pending) < min(
+            self.batch_size, max(1, self._in_flight)
+        ):
+            return
+
+        # Swap the batch out before awaiting so concurrent callers cannot take it twice
+        batch = self._pending[: self.batch_size]
+        self._pending = self._pending[self.batch_size :]
+
+        async with self._merge_lock:
+            try:
+                await self.merge_func(batch)
+                self.merge_count += 1
+                self.merged_documents += len(batch)
+            except Exception as e:
+                logger.error(
+                    f"Multimodal batch merge of {len(batch)} documents failed: {e}"
+                )
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+            else:
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_result(None)
+
+        # A full batch may still be queued behind the one just merged
+        if self._pending:
+            await self._merge_if_ready(force=force)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get merge batch statistics"""
+        return {
+            "batch_size": self.batch_size,
+            "merge_count": self.merge_count,
+            "merged_documents": self.merged_documents,
+            "pending": len(self._pending),
+        }
@@ -3,6 +3,7 @@ Specialized processors for different modalities
 
 Includes:
 - ContextExtractor: Universal context extraction for multimodal content
+- ImageTriage: Local pre-classification of trivial images
 - ImageModalProcessor: Specialized processor for image content
 - TableModalProcessor: Specialized processor for table content
 - EquationModalProcessor: Specialized processor for equation content
@@ -11,10 +12,13 @@ Includes:
 
 import re
 import json
+import math
 import time
 import base64
-from typing import Dict, Any, Tuple, List
+import asyncio
+from typing import Dict, Any, Optional, Tuple, List, Union
 from pathlib import Path
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 from lightrag.utils import (
@@ -27,7 +31,58 @@ from lightrag.kg.shared_storage import get_namespace_data, get_pipeline_status_l
 from lightrag.operate import extract_entities, merge_nodes_and_edges
 
 # Import prompt templates
+from raganything.equation_analysis import (
+    EquationAnalysisConfig,
+    describe_trivial_equation,
+    latex_complexity,
+    normalize_latex,
+)
+from raganything.model_router import LARGE_TIER, ModelRouter
 from raganything.prompt import PROMPTS
+from raganything.table_analysis import TableAnalysisConfig, parse_table_body
+from raganything.token_cache import TokenCountCache
+from raganything.utils import upsert_edges_batch
+
+try:
+    from PIL import Image, ImageStat
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+# Content source of the document processed by the current task. Documents that
+# are described concurrently share the processors, so the per-instance content
+# source is only a fallback for callers outside a document task.
+_content_source: ContextVar[Optional[Tuple[Any, str]]] = ContextVar(
+    "raganything_content_source", default=None
+)
+
+# Patterns used to extract JSON from model responses, compiled once
+_THINK_BLOCKS = re.compile(
+    r"<think>.*?</think>|<thinking>.*?</thinking>", re.DOTALL | re.IGNORECASE
+)
+_JSON_CODE_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_OBJECT_SPAN = re.compile(r"\{.*\}", re.DOTALL)
+_BRACES = re.compile(r"[{}]")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_BACKSLASH_BEFORE_QUOTE = re.compile(r'(?<!\\)\\(?=")')
+_JSON_STRING = re.compile(r'"([^"]*(?:\\.[^"]*)*)"')
+_BACKSLASH_BEFORE_LETTER = re.compile(r"\\(?=[a-zA-Z])")
+_DESCRIPTION_FIELD = re.compile(
+    r'"detailed_description":\s*"([^"]*(?:\\.[^"]*)*)"', re.DOTALL
+)
+_ENTITY_NAME_FIELD = re.compile(r'"entity_name":\s*"([^"]*(?:\\.[^"]*)*)"')
+_ENTITY_TYPE_FIELD = re.compile(r'"entity_type":\s*"([^"]*(?:\\.[^"]*)*)"')
+_SUMMARY_FIELD = re.compile(r'"summary":\s*"([^"]*(?:\\.[^"]*)*)"', re.DOTALL)
+
+
+class ModalItemSkipped(Exception):
+    """Raised when a multimodal item is intentionally left out of the knowledge base"""
+
+    def __init__(self, reason: str):
+        self.reason = reason
+        super().__init__(f"Multimodal item skipped: {reason}")
 
 
 @dataclass
@@ -37,6 +92,7 @@ class ContextConfig:
     context_window: int = 1  # Window size for context extraction
     context_mode: str = "page"  # "page", "chunk", "token"
     max_context_tokens: int = 2000  # Maximum context tokens
+    context_assembly: str = "truncate"  # "truncate" or "nearest"
     include_headers: bool = True  # Whether to include headers/titles
     include_captions: bool = True  # Whether to include image/table captions
     filter_content_types: List[str] = None  # Content types to include
@@ -49,15 +105,22 @@ class ContextConfig:
 class ContextExtractor:
     """Universal context extractor supporting multiple content source formats"""
 
-    def __init__(self, config: ContextConfig = None, tokenizer=None):
+    def __init__(
+        self,
+        config: ContextConfig = None,
+        tokenizer=None,
+        token_cache: TokenCountCache = None,
+    ):
         """Initialize context extractor
 
         Args:
             config: Context extraction configuration
             tokenizer: Tokenizer for accurate token counting
+            token_cache: Shared token count cache (a private one is created if not provided)
         """
         self.config = config or ContextConfig()
         self.tokenizer = tokenizer
+        self.token_cache = token_cache or TokenCountCache(tokenizer)
 
     def extract_context(
         self,
@@ -111,6 +174,34 @@ class ContextExtractor:
             logger.error(f"Error extracting context: {e}")
             return ""
 
+    async def extract_context_async(
+        self,
+        content_source: Any,
+        current_item_info: Dict[str, Any],
+        content_format: str = "auto",
+    ) -> str:
+        """Extract context in a worker thread when tokenization is involved
+
+        Over-budget contexts are encoded in full to be truncated, which would
+        otherwise block the event loop for long documents. The thread hand-off
+        is negligible next to the model call the context is built for.
+
+        Args:
+            content_source: Source content (list, dict, or other format)
+            current_item_info: Information about current item (page_idx, index, etc.)
+            content_format: Format hint for content source
+
+        Returns:
+            Extracted context text
+        """
+        if not self.tokenizer:
+            return self.extract_context(
+                content_source, current_item_info, content_format
+            )
+        return await asyncio.to_thread(
+            self.extract_context, content_source, current_item_info, content_format
+        )
+
     def _extract_from_content_list(
         self, content_list: List[Dict], current_item_info: Dict
     ) -> str:
@@ -148,9 +239,12 @@ class ContextExtractor:
         start_page = max(0, current_page - window_size)
         end_page = current_page + window_size + 1
 
-        context_texts = []
+        current_index = current_item_info.get("index", 0)
+
+        # Candidate blocks as (distance, position, text)
+        candidates = []
 
-        for item in content_list:
+        for i, item in enumerate(content_list):
             item_page = item.get("page_idx", 0)
             item_type = item.get("type", "")
 
@@ -163,12 +257,11 @@ class ContextExtractor:
                 if text_content and text_content.strip():
                     # Add page marker for better context understanding
                     if item_page != current_page:
-                        context_texts.append(f"[Page {item_page}] {text_content}")
-                    else:
-                        context_texts.append(text_content)
+                        text_content = f"[Page {item_page}] {text_content}"
+                    distance = (abs(item_page - current_page), abs(i - current_index))
+                    candidates.append((distance, i, text_content))
 
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        return self._assemble_context(candidates)
 
     def _extract_chunk_context(
         self, content_list: List[Dict], current_item_info: Dict
@@ -188,7 +281,7 @@ class ContextExtractor:
         start_idx = max(0, current_index - window_size)
         end_idx = min(len(content_list), current_index + window_size + 1)
 
-        context_texts = []
+        candidates = []
 
         for i in range(start_idx, end_idx):
             if i != current_index:
@@ -198,10 +291,9 @@ class ContextExtractor:
                 if item_type in self.config.filter_content_types:
                     text_content = self._extract_text_from_item(item)
                     if text_content and text_content.strip():
-                        context_texts.append(text_content)
+                        candidates.append((abs(i - current_index), i, text_content))
 
-        context = "\n".join(context_texts)
-        return self._truncate_context(context)
+        return self._assemble_context(candidates)
 
     def _extract_text_from_item(self, item: Dict) -> str:
         """Extract text content from a content item
@@ -294,17 +386,92 @@ class ContextExtractor:
         start_idx = max(0, current_index - window_size)
         end_idx = min(len(text_chunks), current_index + window_size + 1)
 
-        context_texts = []
+        candidates = []
         for i in range(start_idx, end_idx):
             if i != current_index:  # Exclude current chunk
                 if i < len(text_chunks):
                     chunk_text = str(text_chunks[i]).strip()
                     if chunk_text:
-                        context_texts.append(chunk_text)
+                        candidates.append((abs(i - current_index), i, chunk_text))
+
+        return self._assemble_context(candidates)
 
-        context = "\n".join(context_texts)
+    def _assemble_context(self, candidates: List[Tuple[Any, int, str]]) -> str:
+        """Assemble context from candidate blocks using the configured strategy
+
+        Args:
+            candidates: List of (distance, position, text) tuples, where distance
+                orders blocks by proximity to the current item and position is
+                the block's place in the document
+
+        Returns:
+            Context text with blocks in document order
+        """
+        if self.config.context_assembly == "nearest":
+            return self._assemble_nearest_first(candidates)
+
+        candidates = sorted(candidates, key=lambda candidate: candidate[1])
+        context = "\n".join(text for _, _, text in candidates)
+
+        # Blocks recur across neighbouring items, so count them through the
+        # cache (plus newline separators) and only encode the joined context
+        # when it has to be truncated
+        total_tokens = sum(
+            self._count_block_tokens(text) for _, _, text in candidates
+        ) + max(0, len(candidates) - 1)
+        if total_tokens <= self.config.max_context_tokens:
+            return context
         return self._truncate_context(context)
 
+    def _assemble_nearest_first(self, candidates: List[Tuple[Any, int, str]]) -> str:
+        """Add blocks nearest-first until the token budget is exhausted
+
+        Only blocks that are kept get tokenized (plus the first block that
+        does not fit), so no tokenizer work is spent on text that is discarded
+        wholesale. If even the nearest block exceeds the budget, it is
+        truncated instead of being dropped.
+
+        Args:
+            candidates: List of (distance, position, text) tuples
+
+        Returns:
+            Context text with the selected blocks in document order
+        """
+        budget = self.config.max_context_tokens
+        selected = []
+        used_tokens = 0
+
+        for _, position, text in sorted(
+            candidates, key=lambda candidate: (candidate[0], candidate[1])
+        ):
+            # Account for the newline separator between blocks
+            cost = self._count_block_tokens(text) + (1 if selected else 0)
+            if used_tokens + cost > budget:
+                if not selected:
+                    selected.append((position, self._truncate_context(text)))
+                break
+            selected.append((position, text))
+            used_tokens += cost
+
+        selected.sort(key=lambda block: block[0])
+        return "\n".join(text for _, text in selected)
+
+    def _count_block_tokens(self, text: str) -> int:
+        """Count tokens of a context block through the shared token cache
+
+        Args:
+            text: Block text
+
+        Returns:
+            Number of tokens (characters when no tokenizer is available)
+        """
+        if not self.tokenizer:
+            return len(text)
+
+        if self.token_cache.tokenizer is None:
+            self.token_cache.set_tokenizer(self.tokenizer)
+        return self.token_cache.count(text)
+
     def _truncate_context(self, context: str) -> str:
         """Truncate context to maximum token limit
 
@@ -319,6 +486,7 @@ class ContextExtractor:
 
         # Use tokenizer if available for accurate token counting
         if self.tokenizer:
+            # One encode serves both the length check and the truncation
             tokens = self.tokenizer.encode(context)
             if len(tokens) <= self.config.max_context_tokens:
                 return context
@@ -357,6 +525,116 @@ class ContextExtractor:
                 return truncated + "..."
 
 
+@dataclass
+class ImageTriageConfig:
+    """Configuration for local image triage"""
+
+    enabled: bool = True
+    trivial_action: str = "template"  # "template" or "skip"
+    min_side: int = 24  # Minimum width/height in pixels
+    max_aspect_ratio: float = 25.0  # Thin strips above this are separators
+    min_entropy: float = 1.0  # Minimum grayscale histogram entropy in bits
+    min_stddev: float = 3.0  # Minimum per-channel pixel standard deviation
+    min_page_area_ratio: float = 0.001  # Minimum bbox area relative to the page
+
+
+class ImageTriage:
+    """CPU-only pre-classifier for images not worth a vision model call
+
+    Flags tiny icons, thin separators, blank or single-colour blocks and
+    crops that cover a negligible part of the page. Images with captions or
+    footnotes are always kept, since the document refers to them.
+    """
+
+    # MinerU content list bounding boxes use a 0-1000 page coordinate system
+    BBOX_PAGE_SIZE = 1000
+
+    def __init__(self, config: ImageTriageConfig = None):
+        """Initialize image triage
+
+        Args:
+            config: Triage thresholds and action for trivial images
+        """
+        self.config = config or ImageTriageConfig()
+        self.counts: Dict[str, int] = {}
+
+    def classify(self, content_data: Dict[str, Any]) -> Optional[str]:
+        """Decide whether an image is trivial
+
+        Args:
+            content_data: Image item with img_path and optional bbox/captions
+
+        Returns:
+            Reason the image is trivial, or None if it should be described
+        """
+        if not self.config.enabled:
+            return None
+
+        captions = content_data.get(
+            "image_caption", content_data.get("img_caption", [])
+        )
+        footnotes = content_data.get(
+            "image_footnote", content_data.get("img_footnote", [])
+        )
+        if captions or footnotes:
+            return None
+
+        # Page area ratio needs no image decoding, so check it first
+        bbox = content_data.get("bbox")
+        if isinstance(bbox, (list, tuple)) and len(bbox) == 4:
+            width = max(0.0, float(bbox[2]) - float(bbox[0]))
+            height = max(0.0, float(bbox[3]) - float(bbox[1]))
+            page_ratio = (width * height) / (self.BBOX_PAGE_SIZE**2)
+            if 0 < page_ratio < self.config.min_page_area_ratio:
+                return "small_page_area"
+
+        image_path = content_data.get("img_path")
+        if not PIL_AVAILABLE or not image_path:
+            return None
+
+        try:
+            with Image.open(image_path) as img:
+                width, height = img.size
+                if min(width, height) < self.config.min_side:
+                    return "too_small"
+                if max(width, height) / max(1, min(width, height)) > (
+                    self.config.max_aspect_ratio
+                ):
+                    return "separator"
+
+                # Statistics on a thumbnail are enough to spot flat images
+                img.thumbnail((128, 128))
+                rgb = img.convert("RGB")
+                if max(ImageStat.Stat(rgb).stddev) < self.config.min_stddev:
+                    return "flat_color"
+
+                histogram = rgb.convert("L").histogram()
+        except Exception as e:
+            logger.debug(f"Image triage could not read {image_path}: {e}")
+            return None
+
+        total = sum(histogram)
+        entropy = -sum(
+            (count / total) * math.log2(count / total) for count in histogram if count
+        )
+        if entropy < self.config.min_entropy:
+            return "low_entropy"
+
+        return None
+
+    def record(self, reason: str) -> None:
+        """Count a trivial image under the configured action and reason"""
+        for key in (
+            f"images_triaged_{self.config.trivial_action}",
+            f"images_triaged_{reason}",
+        ):
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get triage counters"""
+        return dict(self.counts)
+
+
 class BaseModalProcessor:
     """Base class for modal processors"""
 
@@ -365,6 +643,8 @@ class BaseModalProcessor:
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        small_caption_func=None,
+        model_router: ModelRouter = None,
     ):
         """Initialize base processor
 
@@ -372,9 +652,15 @@ class BaseModalProcessor:
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions
             context_extractor: Context extractor instance
+            small_caption_func: Optional faster model function for simple items
+            model_router: Optional router choosing between the two model functions
         """
         self.lightrag = lightrag
         self.modal_caption_func = modal_caption_func
+        self.small_caption_func = small_caption_func
+        self.model_router = model_router
+        # Request strict JSON from providers supporting response_format
+        self.json_mode = False
 
         # Use LightRAG's storage instances
         self.text_chunks_db = lightrag.text_chunks
@@ -398,6 +684,10 @@ class BaseModalProcessor:
             # Update tokenizer if context_extractor doesn't have one
             if self.context_extractor.tokenizer is None:
                 self.context_extractor.tokenizer = self.tokenizer
+                self.context_extractor.token_cache.set_tokenizer(self.tokenizer)
+
+        # Share the context extractor's token count cache
+        self.token_cache = self.context_extractor.token_cache
 
         # Content source for context extraction
         self.content_source = None
@@ -412,9 +702,10 @@ class BaseModalProcessor:
         """
         self.content_source = content_source
         self.content_format = content_format
+        _content_source.set((content_source, content_format))
         logger.info(f"Content source set with format: {content_format}")
 
-    def _get_context_for_item(self, item_info: Dict[str, Any]) -> str:
+    async def _get_context_for_item(self, item_info: Dict[str, Any]) -> str:
         """Get context for current processing item
 
         Args:
@@ -423,12 +714,16 @@ class BaseModalProcessor:
         Returns:
             Context text for the item
         """
-        if not self.content_source:
+        content_source, content_format = _content_source.get() or (
+            self.content_source,
+            self.content_format,
+        )
+        if not content_source:
             return ""
 
         try:
-            context = self.context_extractor.extract_context(
-                self.content_source, item_info, self.content_format
+            context = await self.context_extractor.extract_context_async(
+                content_source, item_info, content_format
             )
             if context:
                 logger.debug(
@@ -474,7 +769,7 @@ class BaseModalProcessor:
         """Create entity and text chunk"""
         # Create chunk
         chunk_id = compute_mdhash_id(str(modal_chunk), prefix="chunk-")
-        tokens = len(self.tokenizer.encode(modal_chunk))
+        tokens = await self.token_cache.count_async(modal_chunk)
 
         # Use provided doc_id or generate one from chunk_id for backward compatibility
         actual_doc_id = doc_id if doc_id else chunk_id
@@ -544,76 +839,132 @@ class BaseModalProcessor:
             chunk_results,
         )
 
-    def _robust_json_parse(self, response: str) -> dict:
-        """Robust JSON parsing with multiple fallback strategies"""
+    def _robust_json_parse(self, response: Union[str, dict]) -> dict:
+        """Robust JSON parsing with multiple fallback strategies
 
-        # Strategy 1: Try direct parsing first
-        for json_candidate in self._extract_all_json_candidates(response):
-            result = self._try_parse_json(json_candidate)
-            if result:
-                return result
+        Responses already parsed by a provider's structured-output mode are
+        returned as-is, and strict JSON is parsed without candidate extraction.
+        Otherwise the JSON candidates are extracted once and each repair
+        strategy is tried on them in order.
+        """
+        if isinstance(response, dict):
+            return response
 
-        # Strategy 2: Try with basic cleanup
-        for json_candidate in self._extract_all_json_candidates(response):
-            cleaned = self._basic_json_cleanup(json_candidate)
-            result = self._try_parse_json(cleaned)
+        # Strategy 0: Strict JSON, as returned in provider JSON mode
+        stripped = response.strip()
+        if stripped.startswith("{") and stripped.endswith("}"):
+            result = self._try_parse_json(stripped)
             if result:
                 return result
 
+        candidates = self._extract_all_json_candidates(response)
+
+        # Strategy 1: Try direct parsing first
+        # Strategy 2: Try with basic cleanup
         # Strategy 3: Try progressive quote fixing
-        for json_candidate in self._extract_all_json_candidates(response):
-            fixed = self._progressive_quote_fix(json_candidate)
-            result = self._try_parse_json(fixed)
-            if result:
-                return result
+        for repair in (None, self._basic_json_cleanup, self._progressive_quote_fix):
+            for json_candidate in candidates:
+                result = self._try_parse_json(
+                    repair(json_candidate) if repair else json_candidate
+                )
+                if result:
+                    return result
 
         # Strategy 4: Fallback to regex field extraction
         return self._extract_fields_with_regex(response)
 
+    def _validate_description_response(
+        self, response: Union[str, dict]
+    ) -> Optional[dict]:
+        """Parse a response if it contains a description and complete entity info
+
+        Returns:
+            The parsed response, which the caller reuses instead of parsing the
+            response again, or None if the response cannot be used
+        """
+        if not isinstance(response, dict) and (
+            not isinstance(response, str) or not response.strip()
+        ):
+            return None
+        try:
+            response_data = self._robust_json_parse(response)
+        except Exception:
+            return None
+
+        entity_data = response_data.get("entity_info")
+        valid = (
+            bool(response_data.get("detailed_description"))
+            and isinstance(entity_data, dict)
+            and all(
+                entity_data.get(key)
+                for key in ["entity_name", "entity_type", "summary"]
+            )
+            # Set by the regex fallback when the response has no entity name
+            and entity_data["entity_name"] != "unknown_entity"
+        )
+        return response_data if valid else None
+
+    async def _generate_response(
+        self, content_type: str, content_data: Any, *args, **kwargs
+    ) -> Union[str, dict]:
+        """Call the caption model, routing simple items to the small model if configured
+
+        Args:
+            content_type: Type of modal content
+            content_data: Parsed item content used to estimate complexity
+            *args: Positional arguments for the model function
+            **kwargs: Keyword arguments for the model function
+
+        Returns:
+            Model response, already parsed if it was validated by the router
+        """
+        if self.json_mode:
+            kwargs.setdefault("response_format", {"type": "json_object"})
+
+        if self.model_router is None:
+            return await self.modal_caption_func(*args, **kwargs)
+
+        return await self.model_router.generate(
+            content_type,
+            content_data,
+            self.small_caption_func,
+            self.modal_caption_func,
+            self._validate_description_response,
+            *args,
+            **kwargs,
+        )
+
     def _extract_all_json_candidates(self, response: str) -> list:
-        """Extract all possible JSON candidates from response"""
+        """Extract all possible JSON candidates from response, without duplicates"""
         candidates = []
 
-        import re
-
         # Pre-process: Remove thinking/reasoning tags that some models use
         # This handles models like qwen2.5-think, deepseek-r1 that wrap reasoning in tags
-        cleaned_response = re.sub(
-            r"<think>.*?</think>", "", response, flags=re.DOTALL | re.IGNORECASE
-        )
-        cleaned_response = re.sub(
-            r"<thinking>.*?</thinking>",
-            "",
-            cleaned_response,
-            flags=re.DOTALL | re.IGNORECASE,
-        )
+        cleaned_response = _THINK_BLOCKS.sub("", response)
 
         # Method 1: JSON in code blocks
-        json_blocks = re.findall(
-            r"```(?:json)?\s*(\{.*?\})\s*```", cleaned_response, re.DOTALL
-        )
-        candidates.extend(json_blocks)
+        candidates.extend(_JSON_CODE_BLOCK.findall(cleaned_response))
 
-        # Method 2: Balanced braces
+        # Method 2: Balanced braces, visiting only the brace positions
         brace_count = 0
         start_pos = -1
 
-        for i, char in enumerate(cleaned_response):
-            if char == "{":
+        for match in _BRACES.finditer(cleaned_response):
+            if match.group() == "{":
                 if brace_count == 0:
-                    start_pos = i
+                    start_pos = match.start()
                 brace_count += 1
-            elif char == "}":
+            else:
                 brace_count -= 1
                 if brace_count == 0 and start_pos != -1:
-                    candidates.append(cleaned_response[start_pos : i + 1])
+                    candidates.append(cleaned_response[start_pos : match.end()])
 
         # Method 3: Simple regex fallback
-        simple_match = re.search(r"\{.*\}", cleaned_response, re.DOTALL)
+        simple_match = _JSON_OBJECT_SPAN.search(cleaned_response)
         if simple_match:
             candidates.append(simple_match.group(0))
 
-        return candidates
+        return list(dict.fromkeys(candidates))
 
     def _try_parse_json(self, json_str: str) -> dict:
         """Try to parse JSON string, return None if failed"""
@@ -621,9 +972,10 @@ class BaseModalProcessor:
             return None
 
         try:
-            return json.loads(json_str)
+            result = json.loads(json_str)
         except (json.JSONDecodeError, ValueError):
             return None
+        return result if isinstance(result, dict) else None
 
     def _basic_json_cleanup(self, json_str: str) -> str:
         """Basic cleanup for common JSON issues"""
@@ -635,23 +987,25 @@ class BaseModalProcessor:
         json_str = json_str.replace(""", "'").replace(""", "'")  # Smart apostrophes
 
         # Fix trailing commas (simple case)
-        json_str = re.sub(r",(\s*[}\]])", r"\1", json_str)
+        json_str = _TRAILING_COMMA.sub(r"\1", json_str)
 
         return json_str
 
     def _progressive_quote_fix(self, json_str: str) -> str:
         """Progressive fixing of quote and escape issues"""
         # Only escape unescaped backslashes before quotes
-        json_str = re.sub(r'(?<!\\)\\(?=")', r"\\\\", json_str)
+        json_str = _BACKSLASH_BEFORE_QUOTE.sub(r"\\\\", json_str)
 
         # Fix unescaped backslashes in string values (more conservative)
         def fix_string_content(match):
             content = match.group(1)
             # Only escape obvious problematic patterns
-            content = re.sub(r"\\(?=[a-zA-Z])", r"\\\\", content)  # \alpha -> \\alpha
+            content = _BACKSLASH_BEFORE_LETTER.sub(
+                r"\\\\", content
+            )  # \alpha -> \\alpha
             return f'"{content}"'
 
-        json_str = re.sub(r'"([^"]*(?:\\.[^"]*)*)"', fix_string_content, json_str)
+        json_str = _JSON_STRING.sub(fix_string_content, json_str)
         return json_str
 
     def _extract_fields_with_regex(self, response: str) -> dict:
@@ -659,23 +1013,19 @@ class BaseModalProcessor:
         logger.warning("Using regex fallback for JSON parsing")
 
         # Extract detailed_description
-        desc_match = re.search(
-            r'"detailed_description":\s*"([^"]*(?:\\.[^"]*)*)"', response, re.DOTALL
-        )
+        desc_match = _DESCRIPTION_FIELD.search(response)
         description = desc_match.group(1) if desc_match else ""
 
         # Extract entity_name
-        name_match = re.search(r'"entity_name":\s*"([^"]*(?:\\.[^"]*)*)"', response)
+        name_match = _ENTITY_NAME_FIELD.search(response)
         entity_name = name_match.group(1) if name_match else "unknown_entity"
 
         # Extract entity_type
-        type_match = re.search(r'"entity_type":\s*"([^"]*(?:\\.[^"]*)*)"', response)
+        type_match = _ENTITY_TYPE_FIELD.search(response)
         entity_type = type_match.group(1) if type_match else "unknown"
 
         # Extract summary
-        summary_match = re.search(
-            r'"summary":\s*"([^"]*(?:\\.[^"]*)*)"', response, re.DOTALL
-        )
+        summary_match = _SUMMARY_FIELD.search(response)
         summary = summary_match.group(1) if summary_match else description[:100]
 
         return {
@@ -735,6 +1085,8 @@ class BaseModalProcessor:
 
         # Add "belongs_to" relationships for all extracted entities
         processed_chunk_results = []
+        belongs_to_edges = []
+        relation_vdb_data = {}
         for maybe_nodes, maybe_edges in chunk_results:
             for entity_name in maybe_nodes.keys():
                 if entity_name != modal_entity_name:  # Skip self-relationship
@@ -746,30 +1098,32 @@ class BaseModalProcessor:
                         "weight": 10.0,
                         "file_path": chunk_data.get("file_path", "manual_creation"),
                     }
-                    await self.knowledge_graph_inst.upsert_edge(
-                        entity_name, modal_entity_name, relation_data
+                    belongs_to_edges.append(
+                        (entity_name, modal_entity_name, relation_data)
                     )
 
                     relation_id = compute_mdhash_id(
                         entity_name + modal_entity_name, prefix="rel-"
                     )
-                    relation_vdb_data = {
-                        relation_id: {
-                            "src_id": entity_name,
-                            "tgt_id": modal_entity_name,
-                            "keywords": relation_data["keywords"],
-                            "content": f"{relation_data['keywords']}\t{entity_name}\n{modal_entity_name}\n{relation_data['description']}",
-                            "source_id": chunk_id,
-                            "file_path": chunk_data.get("file_path", "manual_creation"),
-                        }
+                    relation_vdb_data[relation_id] = {
+                        "src_id": entity_name,
+                        "tgt_id": modal_entity_name,
+                        "keywords": relation_data["keywords"],
+                        "content": f"{relation_data['keywords']}\t{entity_name}\n{modal_entity_name}\n{relation_data['description']}",
+                        "source_id": chunk_id,
+                        "file_path": chunk_data.get("file_path", "manual_creation"),
                     }
-                    await self.relationships_vdb.upsert(relation_vdb_data)
 
                     # Add to maybe_edges
                     maybe_edges[(entity_name, modal_entity_name)] = [relation_data]
 
             processed_chunk_results.append((maybe_nodes, maybe_edges))
 
+        # Write all belongs_to relations with one graph and one vector upsert
+        await upsert_edges_batch(self.knowledge_graph_inst, belongs_to_edges)
+        if relation_vdb_data:
+            await self.relationships_vdb.upsert(relation_vdb_data)
+
         if not batch_mode:
             # Merge with correct file_path parameter
             file_path = chunk_data.get("file_path", "manual_creation")
@@ -801,6 +1155,9 @@ class ImageModalProcessor(BaseModalProcessor):
         lightrag: LightRAG,
         modal_caption_func,
         context_extractor: ContextExtractor = None,
+        triage: ImageTriage = None,
+        small_caption_func=None,
+        model_router: ModelRouter = None,
     ):
         """Initialize image processor
 
@@ -808,8 +1165,18 @@ class ImageModalProcessor(BaseModalProcessor):
             lightrag: LightRAG instance
             modal_caption_func: Function for generating descriptions (supporting image understanding)
             context_extractor: Context extractor instance
+            triage: Optional pre-classifier that keeps trivial images away from the vision model
+            small_caption_func: Optional faster model function for simple items
+            model_router: Optional router choosing between the two model functions
         """
-        super().__init__(lightrag, modal_caption_func, context_extractor)
+        super().__init__(
+            lightrag,
+            modal_caption_func,
+            context_extractor,
+            small_caption_func=small_caption_func,
+            model_router=model_router,
+        )
+        self.triage = triage
 
     def _encode_image_to_base64(self, image_path: str) -> str:
         """Encode image to base64"""
@@ -870,10 +1237,21 @@ class ImageModalProcessor(BaseModalProcessor):
             if not image_path_obj.exists():
                 raise FileNotFoundError(f"Image file not found: {image_path}")
 
+            # Route trivial images away from the vision model
+            if self.triage is not None:
+                reason = self.triage.classify(content_data)
+                if reason:
+                    self.triage.record(reason)
+                    if self.triage.config.trivial_action == "skip":
+                        raise ModalItemSkipped(f"{reason}: {image_path}")
+                    return self._trivial_image_description(
+                        image_path, reason, entity_name
+                    )
+
             # Extract context for current item
             context = ""
             if item_info:
-                context = self._get_context_for_item(item_info)
+                context = await self._get_context_for_item(item_info)
 
             # Build detailed visual analysis prompt with context
             if context:
@@ -904,7 +1282,9 @@ class ImageModalProcessor(BaseModalProcessor):
                 raise RuntimeError(f"Failed to encode image to base64: {image_path}")
 
             # Call vision model with encoded image
-            response = await self.modal_caption_func(
+            response = await self._generate_response(
+                "image",
+                content_data,
                 vision_prompt,
                 image_data=image_base64,
                 system_prompt=PROMPTS["IMAGE_ANALYSIS_SYSTEM"],
@@ -915,6 +1295,8 @@ class ImageModalProcessor(BaseModalProcessor):
 
             return enhanced_caption, entity_info
 
+        except ModalItemSkipped:
+            raise
         except Exception as e:
             logger.error(f"Error generating image description: {e}")
             # Fallback processing
@@ -978,6 +1360,8 @@ class ImageModalProcessor(BaseModalProcessor):
                 chunk_order_index,
             )
 
+        except ModalItemSkipped:
+            raise
         except Exception as e:
             logger.error(f"Error processing image content: {e}")
             # Fallback processing
@@ -990,6 +1374,181 @@ class ImageModalProcessor(BaseModalProcessor):
             }
             return str(modal_content), fallback_entity
 
+    async def generate_page_descriptions(
+        self,
+        modal_contents: List[Any],
+        item_info: Dict[str, Any] = None,
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Describe several images from the same page with one multi-image request
+
+        The page context is sent once and the model returns a JSON array with
+        one description per image. Images that are missing, flagged by triage
+        or absent from the response get None and should be described
+        individually with generate_description_only.
+
+        Args:
+            modal_contents: Image contents from the same page
+            item_info: Item information of the first image for context extraction
+
+        Returns:
+            List aligned with modal_contents of (enhanced_caption, entity_info) or None
+        """
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(
+            modal_contents
+        )
+
+        candidates = []
+        for position, modal_content in enumerate(modal_contents):
+            if isinstance(modal_content, str):
+                try:
+                    content_data = json.loads(modal_content)
+                except json.JSONDecodeError:
+                    continue
+            else:
+                content_data = modal_content
+
+            image_path = content_data.get("img_path")
+            if not image_path or not Path(image_path).exists():
+                continue
+            # Trivial images are handled without the vision model individually
+            if self.triage is not None and self.triage.classify(content_data):
+                continue
+            image_base64 = self._encode_image_to_base64(image_path)
+            if not image_base64:
+                continue
+            candidates.append((position, content_data, image_path, image_base64))
+
+        # A single image is cheaper to describe with the regular prompt
+        if len(candidates) < 2:
+            return results
+
+        context = ""
+        if item_info:
+            context = await self._get_context_for_item(item_info)
+
+        content_parts = [
+            {
+                "type": "text",
+                "text": PROMPTS["vision_page_prompt"].format(
+                    image_count=len(candidates),
+                    context=context if context else "None",
+                ),
+            }
+        ]
+        for image_number, (_, content_data, image_path, image_base64) in enumerate(
+            candidates, start=1
+        ):
+            captions = content_data.get(
+                "image_caption", content_data.get("img_caption", [])
+            )
+            footnotes = content_data.get(
+                "image_footnote", content_data.get("img_footnote", [])
+            )
+            content_parts.append(
+                {
+                    "type": "text",
+                    "text": PROMPTS["vision_page_image_details"].format(
+                        image_number=image_number,
+                        image_path=image_path,
+                        captions=captions if captions else "None",
+                        footnotes=footnotes if footnotes else "None",
+                    ),
+                }
+            )
+            content_parts.append(
+                {
+                    "type": "image_url",
+                    "image_url": {"url": f"data:image/jpeg;base64,{image_base64}"},
+                }
+            )
+
+        messages = [
+            {"role": "system", "content": PROMPTS["IMAGE_ANALYSIS_SYSTEM"]},
+            {"role": "user", "content": content_parts},
+        ]
+        if self.model_router is not None:
+            response = await self.model_router.call_tier(
+                LARGE_TIER, self.modal_caption_func, "", messages=messages
+            )
+        else:
+            response = await self.modal_caption_func("", messages=messages)
+
+        for (position, *_), parsed in zip(
+            candidates, self._parse_page_response(response, len(candidates))
+        ):
+            results[position] = parsed
+        return results
+
+    def _parse_page_response(
+        self, response: str, image_count: int
+    ) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Fan a multi-image JSON array response out to per-image results"""
+        parsed: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * image_count
+
+        entries = None
+        if isinstance(response, list):
+            response = json.dumps(response)
+        cleaned = _THINK_BLOCKS.sub("", response or "")
+        start, end = cleaned.find("["), cleaned.rfind("]")
+        if start != -1 and end > start:
+            array_text = cleaned[start : end + 1]
+            for candidate in (array_text, self._basic_json_cleanup(array_text)):
+                try:
+                    entries = json.loads(candidate)
+                    break
+                except ValueError:
+                    continue
+        if not isinstance(entries, list):
+            logger.warning("Multi-image response is not a JSON array")
+            return parsed
+
+        for order, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            try:
+                position = int(entry.get("image_index", order + 1)) - 1
+            except (TypeError, ValueError):
+                position = order
+            if not 0 <= position < image_count or parsed[position] is not None:
+                continue
+
+            description = entry.get("detailed_description", "")
+            entity_data = entry.get("entity_info")
+            if (
+                not description
+                or not isinstance(entity_data, dict)
+                or not all(
+                    entity_data.get(key)
+                    for key in ["entity_name", "entity_type", "summary"]
+                )
+            ):
+                continue
+
+            entity_data["entity_name"] = (
+                entity_data["entity_name"] + f" ({entity_data['entity_type']})"
+            )
+            parsed[position] = (description, entity_data)
+
+        return parsed
+
+    def _trivial_image_description(
+        self, image_path: str, reason: str, entity_name: str = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a template description for an image flagged by triage"""
+        reason_text = reason.replace("_", " ")
+        description = (
+            f"Decorative or non-informative image ({reason_text}) at {image_path}."
+        )
+        entity_info = {
+            "entity_name": entity_name
+            if entity_name
+            else f"image_{compute_mdhash_id(str(image_path))} (image)",
+            "entity_type": "image",
+            "summary": f"Decorative or non-informative image ({reason_text})",
+        }
+        return description, entity_info
+
     def _parse_response(
         self, response: str, entity_name: str = None
     ) -> Tuple[str, Dict[str, Any]]:
@@ -1032,6 +1591,55 @@ class ImageModalProcessor(BaseModalProcessor):
 class TableModalProcessor(BaseModalProcessor):
     """Processor specialized for table content"""
 
+    def __init__(
+        self,
+        lightrag: LightRAG,
+        modal_caption_func,
+        context_extractor: ContextExtractor = None,
+        table_config: TableAnalysisConfig = None,
+        small_caption_func=None,
+        model_router: ModelRouter = None,
+    ):
+        """Initialize table processor
+
+        Args:
+            lightrag: LightRAG instance
+            modal_caption_func: Function for generating descriptions
+            context_extractor: Context extractor instance
+            table_config: Local table analysis configuration
+            small_caption_func: Optional faster model function for simple items
+            model_router: Optional router choosing between the two model functions
+        """
+        super().__init__(
+            lightrag,
+            modal_caption_func,
+            context_extractor,
+            small_caption_func=small_caption_func,
+            model_router=model_router,
+        )
+        self.table_config = table_config or TableAnalysisConfig()
+
+    def _get_prompt_table_body(self, table_body: str) -> str:
+        """Replace large table bodies with a local summary and sampled rows
+
+        Args:
+            table_body: Table body from the parsed content
+
+        Returns:
+            Table body to place in the LLM prompt
+        """
+        if not self.table_config.enabled:
+            return table_body
+
+        parsed = parse_table_body(table_body)
+        if (
+            parsed is None
+            or parsed.row_count <= self.table_config.summary_row_threshold
+        ):
+            return table_body
+
+        return parsed.prompt_body(self.table_config.sample_rows)
+
     async def generate_description_only(
         self,
         modal_content,
@@ -1064,13 +1672,13 @@ class TableModalProcessor(BaseModalProcessor):
 
             table_img_path = content_data.get("img_path")
             table_caption = content_data.get("table_caption", [])
-            table_body = content_data.get("table_body", "")
+            table_body = self._get_prompt_table_body(content_data.get("table_body", ""))
             table_footnote = content_data.get("table_footnote", [])
 
             # Extract context for current item
             context = ""
             if item_info:
-                context = self._get_context_for_item(item_info)
+                context = await self._get_context_for_item(item_info)
 
             # Build table analysis prompt with context
             if context:
@@ -1098,7 +1706,9 @@ class TableModalProcessor(BaseModalProcessor):
                 )
 
             # Call LLM for table analysis
-            response = await self.modal_caption_func(
+            response = await self._generate_response(
+                "table",
+                content_data,
                 table_prompt,
                 system_prompt=PROMPTS["TABLE_ANALYSIS_SYSTEM"],
             )
@@ -1226,6 +1836,96 @@ class TableModalProcessor(BaseModalProcessor):
 class EquationModalProcessor(BaseModalProcessor):
     """Processor specialized for equation content"""
 
+    def __init__(
+        self,
+        lightrag: LightRAG,
+        modal_caption_func,
+        context_extractor: ContextExtractor = None,
+        equation_config: EquationAnalysisConfig = None,
+        description_cache=None,
+        small_caption_func=None,
+        model_router: ModelRouter = None,
+    ):
+        """Initialize equation processor
+
+        Args:
+            lightrag: LightRAG instance
+            modal_caption_func: Function for generating descriptions
+            context_extractor: Context extractor instance
+            equation_config: Local equation analysis configuration
+            description_cache: Optional KV storage of descriptions keyed by normalized LaTeX
+            small_caption_func: Optional faster model function for simple items
+            model_router: Optional router choosing between the two model functions
+        """
+        super().__init__(
+            lightrag,
+            modal_caption_func,
+            context_extractor,
+            small_caption_func=small_caption_func,
+            model_router=model_router,
+        )
+        self.equation_config = equation_config or EquationAnalysisConfig()
+        self.description_cache = description_cache
+        self.stats: Dict[str, int] = {
+            "equations_described_locally": 0,
+            "equations_from_cache": 0,
+            "equations_described_by_llm": 0,
+        }
+
+    @staticmethod
+    def _get_cache_key(normalized: str) -> str:
+        """Get the description cache key of a normalized equation"""
+        return compute_mdhash_id(normalized, prefix="eq-")
+
+    async def _get_cached_description(
+        self, normalized: str, entity_name: str = None
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Look up the description of an equation with the same normal form"""
+        if self.description_cache is None or not self.equation_config.use_cache:
+            return None
+
+        try:
+            entries = await self.description_cache.get_by_ids(
+                [self._get_cache_key(normalized)]
+            )
+        except Exception as e:
+            logger.debug(f"Equation description cache lookup failed: {e}")
+            return None
+
+        entry = entries[0] if entries else None
+        if not entry or not entry.get("description"):
+            return None
+
+        entity_info = dict(entry.get("entity_info") or {})
+        if entity_name:
+            entity_info["entity_name"] = entity_name
+        return entry["description"], entity_info
+
+    async def _store_cached_description(
+        self, normalized: str, description: str, entity_info: Dict[str, Any]
+    ) -> None:
+        """Store an LLM description under the normal form of its equation"""
+        if self.description_cache is None or not self.equation_config.use_cache:
+            return
+
+        try:
+            await self.description_cache.upsert(
+                {
+                    self._get_cache_key(normalized): {
+                        "normalized": normalized,
+                        "description": description,
+                        "entity_info": entity_info,
+                        "created_at": int(time.time()),
+                    }
+                }
+            )
+        except Exception as e:
+            logger.debug(f"Failed to cache equation description: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get counts of equations by how their description was produced"""
+        return dict(self.stats)
+
     async def generate_description_only(
         self,
         modal_content,
@@ -1259,10 +1959,27 @@ class EquationModalProcessor(BaseModalProcessor):
             equation_text = content_data.get("text")
             equation_format = content_data.get("text_format", "")
 
+            # Trivial and already seen equations do not need the LLM
+            normalized = ""
+            if self.equation_config.enabled:
+                normalized = normalize_latex(equation_text or "")
+            if normalized:
+                if (
+                    latex_complexity(normalized)
+                    < self.equation_config.complexity_threshold
+                ):
+                    self.stats["equations_described_locally"] += 1
+                    return describe_trivial_equation(normalized, entity_name)
+
+                cached = await self._get_cached_description(normalized, entity_name)
+                if cached is not None:
+                    self.stats["equations_from_cache"] += 1
+                    return cached
+
             # Extract context for current item
             context = ""
             if item_info:
-                context = self._get_context_for_item(item_info)
+                context = await self._get_context_for_item(item_info)
 
             # Build equation analysis prompt with context
             if context:
@@ -1286,15 +2003,28 @@ class EquationModalProcessor(BaseModalProcessor):
                 )
 
             # Call LLM for equation analysis
-            response = await self.modal_caption_func(
+            response = await self._generate_response(
+                "equation",
+                content_data,
                 equation_prompt,
                 system_prompt=PROMPTS["EQUATION_ANALYSIS_SYSTEM"],
             )
 
+            self.stats["equations_described_by_llm"] += 1
+
             # Parse response (reuse existing logic)
-            enhanced_caption, entity_info = self._parse_equation_response(
-                response, entity_name
-            )
+            (
+                enhanced_caption,
+                entity_info,
+                cacheable,
+            ) = self._parse_equation_response_with_status(response, entity_name)
+
+            # A fallback built from the raw response must not be reused for
+            # other occurrences of the equation
+            if normalized and cacheable:
+                await self._store_cached_description(
+                    normalized, enhanced_caption, entity_info
+                )
 
             return enhanced_caption, entity_info
 
@@ -1372,6 +2102,20 @@ class EquationModalProcessor(BaseModalProcessor):
         self, response: str, entity_name: str = None
     ) -> Tuple[str, Dict[str, Any]]:
         """Parse equation analysis response with robust JSON handling"""
+        description, entity_data, _ = self._parse_equation_response_with_status(
+            response, entity_name
+        )
+        return description, entity_data
+
+    def _parse_equation_response_with_status(
+        self, response: Union[str, dict], entity_name: str = None
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """Parse equation analysis response, reporting whether it was parsed
+
+        Returns:
+            Tuple of (description, entity info, False if the fallback built
+            from the raw response was used)
+        """
         try:
             response_data = self._robust_json_parse(response)
 
@@ -1392,7 +2136,7 @@ class EquationModalProcessor(BaseModalProcessor):
             if entity_name:
                 entity_data["entity_name"] = entity_name
 
-            return description, entity_data
+            return description, entity_data, True
 
         except (json.JSONDecodeError, AttributeError, ValueError) as e:
             logger.error(f"Error parsing equation analysis response: {e}")
@@ -1404,7 +2148,7 @@ class EquationModalProcessor(BaseModalProcessor):
                 "entity_type": "equation",
                 "summary": response[:100] + "..." if len(response) > 100 else response,
             }
-            return response, fallback_entity
+            return response, fallback_entity, False
 
 
 class GenericModalProcessor(BaseModalProcessor):
@@ -1434,7 +2178,7 @@ class GenericModalProcessor(BaseModalProcessor):
             # Extract context for current item
             context = ""
             if item_info:
-                context = self._get_context_for_item(item_info)
+                context = await self._get_context_for_item(item_info)
 
             # Build generic analysis prompt with context
             if context:
@@ -1458,7 +2202,9 @@ class GenericModalProcessor(BaseModalProcessor):
                 )
 
             # Call LLM for generic analysis
-            response = await self.modal_caption_func(
+            response = await self._generate_response(
+                content_type,
+                modal_content,
                 generic_prompt,
                 system_prompt=PROMPTS["GENERIC_ANALYSIS_SYSTEM"].format(
                     content_type=content_type
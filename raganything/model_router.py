@@ -0,0 +1,207 @@
+"""
+Complexity-based routing of multimodal description calls
+
+Estimates the complexity of an image, table, equation or generic item and
+sends simple items to a small, fast model tier. Responses of the small tier
+that do not validate are escalated to the large tier.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from lightrag.utils import logger
+
+from raganything.equation_analysis import latex_complexity, normalize_latex
+from raganything.table_analysis import parse_table_body
+
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+SMALL_TIER = "small"
+LARGE_TIER = "large"
+
+
+@dataclass
+class ModelRouterConfig:
+    """Configuration for complexity-based model routing"""
+
+    enabled: bool = True
+    image_max_pixels: int = 512 * 512  # Largest image sent to the small tier
+    table_max_cells: int = 200  # Largest table (rows x columns) for the small tier
+    equation_max_complexity: int = 30  # Highest equation score for the small tier
+    generic_max_chars: int = 2000  # Longest generic content for the small tier
+
+
+def estimate_complexity(content_type: str, content_data: Any) -> Optional[int]:
+    """
+    Estimate the complexity of a multimodal item in type-specific units
+
+    Images are measured in pixels, tables in cells, equations by their LaTeX
+    complexity score and other content by its length in characters.
+
+    Args:
+        content_type: Type of modal content
+        content_data: Parsed item content
+
+    Returns:
+        Complexity estimate, or None if it cannot be determined
+    """
+    if not isinstance(content_data, dict):
+        return len(str(content_data))
+
+    if content_type == "image":
+        image_path = content_data.get("img_path")
+        if not PIL_AVAILABLE or not image_path:
+            return None
+        try:
+            # Only the header is read to get the size
+            with Image.open(image_path) as image:
+                width, height = image.size
+        except Exception:
+            return None
+        return width * height
+
+    if content_type == "table":
+        parsed = parse_table_body(content_data.get("table_body", ""))
+        if parsed is None:
+            return None
+        return parsed.row_count * parsed.column_count
+
+    if content_type == "equation":
+        return latex_complexity(normalize_latex(content_data.get("text") or ""))
+
+    return len(str(content_data))
+
+
+class ModelRouter:
+    """
+    Dispatches description calls to a small or large model tier
+
+    Items whose estimated complexity is within the per-type limit go to the
+    small tier. A small-tier response that raises or fails validation is
+    retried on the large tier. Call counts, failures and latencies are
+    tracked per tier.
+    """
+
+    def __init__(self, config: ModelRouterConfig = None):
+        """
+        Initialize model router
+
+        Args:
+            config: Routing configuration
+        """
+        self.config = config or ModelRouterConfig()
+        self.escalations = 0
+        self._tier_stats = {
+            tier: {"calls": 0, "failures": 0, "latency": 0.0}
+            for tier in (SMALL_TIER, LARGE_TIER)
+        }
+
+    def _max_complexity(self, content_type: str) -> int:
+        """Get the small-tier complexity limit for a content type"""
+        if content_type == "image":
+            return self.config.image_max_pixels
+        if content_type == "table":
+            return self.config.table_max_cells
+        if content_type == "equation":
+            return self.config.equation_max_complexity
+        return self.config.generic_max_chars
+
+    def select_tier(self, content_type: str, content_data: Any) -> str:
+        """
+        Select the model tier for an item
+
+        Args:
+            content_type: Type of modal content
+            content_data: Parsed item content
+
+        Returns:
+            SMALL_TIER or LARGE_TIER
+        """
+        if not self.config.enabled:
+            return LARGE_TIER
+
+        complexity = estimate_complexity(content_type, content_data)
+        if complexity is None or complexity > self._max_complexity(content_type):
+            return LARGE_TIER
+        return SMALL_TIER
+
+    async def call_tier(
+        self, tier: str, func: Callable[..., Awaitable[str]], *args, **kwargs
+    ) -> str:
+        """Call a tier's model function and record its latency"""
+        stats = self._tier_stats[tier]
+        stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            stats["failures"] += 1
+            raise
+        finally:
+            stats["latency"] += time.perf_counter() - start
+
+    async def generate(
+        self,
+        content_type: str,
+        content_data: Any,
+        small_func: Optional[Callable[..., Awaitable[str]]],
+        large_func: Callable[..., Awaitable[str]],
+        validate: Callable[[str], Any],
+        *args,
+        **kwargs,
+    ) -> Any:
+        """
+        Generate a description with the tier selected for the item
+
+        Args:
+            content_type: Type of modal content
+            content_data: Parsed item content used to estimate complexity
+            small_func: Model function of the small tier, or None to always use the large tier
+            large_func: Model function of the large tier
+            validate: Returns the parsed response if it can be used, otherwise None
+            *args: Positional arguments for the model function
+            **kwargs: Keyword arguments for the model function
+
+        Returns:
+            Parsed small-tier response, or the large-tier model response
+        """
+        if (
+            small_func is not None
+            and self.select_tier(content_type, content_data) == SMALL_TIER
+        ):
+            try:
+                response = await self.call_tier(SMALL_TIER, small_func, *args, **kwargs)
+                parsed = validate(response)
+                if parsed is not None:
+                    return parsed
+                self._tier_stats[SMALL_TIER]["failures"] += 1
+                reason = "invalid response"
+            except Exception as e:
+                reason = str(e)
+
+            self.escalations += 1
+            logger.debug(
+                f"Escalating {content_type} description to the large model: {reason}"
+            )
+
+        return await self.call_tier(LARGE_TIER, large_func, *args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-tier call counts, failures and latencies"""
+        stats: Dict[str, Any] = {"model_escalations": self.escalations}
+        for tier, tier_stats in self._tier_stats.items():
+            calls = tier_stats["calls"]
+            stats[f"model_{tier}_calls"] = calls
+            stats[f"model_{tier}_failures"] = tier_stats["failures"]
+            stats[f"model_{tier}_latency_seconds"] = round(tier_stats["latency"], 3)
+            stats[f"model_{tier}_avg_latency_seconds"] = (
+                round(tier_stats["latency"] / calls, 3) if calls else 0.0
+            )
+        return stats
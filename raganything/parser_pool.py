@@ -0,0 +1,245 @@
+"""
+Worker process pool for batch parsing
+
+Contains a pool of parser processes for CPU-heavy parsing. Unlike
+concurrent.futures.ProcessPoolExecutor, a single worker can be killed when
+its file exceeds the deadline (together with the subprocesses it started,
+such as the MinerU CLI), and workers are replaced after a fixed number of
+jobs so memory held by native libraries is returned to the system.
+"""
+
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from typing import Any, Dict, Optional
+
+from lightrag.utils import logger
+
+
+# Seconds a new worker may take to import the parser before it is given up
+_STARTUP_TIMEOUT = 120
+
+
+class ParseTimeoutError(TimeoutError):
+    """Raised when a file is not parsed before its deadline"""
+
+
+class WorkerCrashedError(RuntimeError):
+    """Raised when a worker process exits while parsing a file"""
+
+
+def _worker_main(conn, parser_type: str) -> None:
+    """Parse files sent over conn until None is received"""
+    if hasattr(os, "setsid"):
+        # Lead a process group so a timeout also kills the parser's subprocesses
+        os.setsid()
+
+    from raganything.batch_parser import BatchParser
+
+    batch_parser = BatchParser(
+        parser_type=parser_type,
+        max_workers=1,
+        show_progress=False,
+        skip_installation_check=True,
+    )
+    conn.send(True)  # Ready; file deadlines start after the import time
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            return
+        if job is None:
+            return
+
+        file_path, output_dir, parse_method, kwargs = job
+        try:
+            blocks = batch_parser._parse_file(
+                file_path, output_dir, parse_method, **kwargs
+            )
+            conn.send((True, blocks))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """A parser process and the pipe used to send it jobs"""
+
+    def __init__(self, context, parser_type: str):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, parser_type)
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+        try:
+            ready = self.conn.poll(_STARTUP_TIMEOUT) and self.conn.recv()
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise WorkerCrashedError(
+                f"Parser worker failed to start (exit code {self.process.exitcode})"
+            )
+
+    def kill(self) -> None:
+        """Kill the worker and its process group"""
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.join(timeout=5)
+        self.conn.close()
+
+    def stop(self) -> None:
+        """Ask the worker to exit after its current job"""
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class ParserProcessPool:
+    """
+    Pool of parser processes with per-file deadlines and worker recycling
+
+    parse() blocks the calling thread until the file is parsed, so the pool
+    is driven from a thread pool with one thread per worker. Workers are
+    spawned lazily and start with a fresh interpreter.
+    """
+
+    def __init__(
+        self,
+        parser_type: str,
+        max_workers: int = 4,
+        max_tasks_per_worker: Optional[int] = None,
+    ):
+        """
+        Initialize parser process pool
+
+        Args:
+            parser_type: Type of parser to use ("mineru" or "docling")
+            max_workers: Maximum number of worker processes
+            max_tasks_per_worker: Jobs after which a worker is replaced (None keeps workers)
+        """
+        self.parser_type = parser_type
+        self.max_workers = max(1, max_workers)
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.killed_workers = 0
+        self.recycled_workers = 0
+
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        for _ in range(self.max_workers):
+            self._idle.put(None)  # Slot without a started worker
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._closed = False
+
+    def parse(
+        self,
+        file_path: str,
+        output_dir: str,
+        parse_method: str = "auto",
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Parse a file in a worker process
+
+        Args:
+            file_path: Path to the file to process
+            output_dir: Output directory
+            parse_method: Parsing method
+            timeout: Seconds before the worker is killed (None waits forever)
+            **kwargs: Additional parser arguments
+
+        Returns:
+            Dict of content block counts by type
+
+        Raises:
+            ParseTimeoutError: The file was not parsed in time
+            WorkerCrashedError: The worker exited while parsing
+            RuntimeError: The parser raised an error
+        """
+        worker = self._idle.get()
+        if self._closed:
+            self._idle.put(worker)
+            raise RuntimeError("Parser process pool is closed")
+        if worker is None:
+            try:
+                worker = _Worker(self._context, self.parser_type)
+            except BaseException:
+                # Give the slot back so a failed start does not shrink the pool
+                self._idle.put(None)
+                raise
+            with self._lock:
+                self._workers.add(worker)
+
+        try:
+            worker.conn.send((file_path, output_dir, parse_method, kwargs))
+            if not worker.conn.poll(timeout):
+                self._discard(worker, kill=True)
+                worker = None
+                raise ParseTimeoutError(f"Timed out after {timeout}s")
+            success, result = worker.conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            exit_code = None
+            if worker is not None:
+                self._discard(worker, kill=True)
+                exit_code = worker.process.exitcode
+                worker = None
+            raise WorkerCrashedError(
+                f"Parser worker exited unexpectedly (exit code {exit_code})"
+            ) from e
+        finally:
+            if worker is not None:
+                worker.jobs += 1
+                if (
+                    self.max_tasks_per_worker
+                    and worker.jobs >= self.max_tasks_per_worker
+                ):
+                    self._discard(worker, kill=False)
+                    self.recycled_workers += 1
+                    worker = None
+            self._idle.put(worker)
+
+        if not success:
+            raise RuntimeError(result)
+        return result
+
+    def _discard(self, worker: _Worker, kill: bool) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        if kill:
+            self.killed_workers += 1
+            logger.warning(f"Killing parser worker {worker.process.pid}")
+            worker.kill()
+        else:
+            worker.stop()
+
+    def close(self) -> None:
+        """Stop all workers; jobs still running are killed"""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -8,21 +8,60 @@ import os
 import time
 import hashlib
 import json
-from typing import Dict, List, Any, Tuple, Optional
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple, Optional, Set
 from pathlib import Path
 
 from raganything.base import DocStatus
+from raganything.unit_of_work import (
+    FlushPolicy,
+    StorageUnitOfWork,
+    resolve_flush_policy,
+)
 from raganything.parser import MineruParser, DoclingParser, MineruExecutionError
+from raganything.modalprocessors import ModalItemSkipped
+from raganything.table_analysis import ParsedTable, parse_table_body
 from raganything.utils import (
     separate_content,
     insert_text_content,
     insert_text_content_with_multimodal_content,
     get_processor_for_type,
+    compute_file_hash,
+    compute_image_dhash,
+    group_near_duplicate_images,
+    upsert_nodes_batch,
 )
 import asyncio
+from lightrag.constants import GRAPH_FIELD_SEP
 from lightrag.utils import compute_mdhash_id
 
 
+@dataclass(slots=True)
+class MultimodalChunkRecord:
+    """Per-item state carried through the multimodal batch processing stages
+
+    Built once after description generation so the chunk template, chunk id,
+    entity id and token count are not recomputed by every later stage.
+    """
+
+    index: int
+    content_type: str
+    description: str
+    entity_info: Dict[str, Any]
+    original_item: Dict[str, Any]
+    item_info: Dict[str, Any]
+    chunk_order_index: int
+    file_path: str
+    content: str
+    chunk_id: str
+    entity_id: str
+    tokens: int
+
+
 class ProcessorMixin:
     """ProcessorMixin class containing document processing functionality for RAGAnything"""
 
@@ -41,6 +80,138 @@ class ProcessorMixin:
         else:
             return os.path.basename(file_path)
 
+    def _get_flush_marker_path(self) -> str:
+        """Get path of the crash-recovery marker used by deferred flushing"""
+        return os.path.join(self.working_dir, "raganything_pending_flush.json")
+
+    async def _flush_storages(self, *storages):
+        """
+        Persist the given storages, or defer the flush to the active unit of work
+
+        Args:
+            *storages: Storage instances to flush with index_done_callback
+        """
+        unit_of_work = getattr(self, "_unit_of_work", None)
+        if unit_of_work is not None:
+            unit_of_work.defer(*storages)
+            return
+
+        await asyncio.gather(
+            *(storage.index_done_callback() for storage in storages if storage)
+        )
+
+    async def _flush_lightrag_storages(self):
+        """Persist all LightRAG storages, or defer to the active unit of work"""
+        unit_of_work = getattr(self, "_unit_of_work", None)
+        if unit_of_work is not None:
+            unit_of_work.defer_lightrag()
+            return
+
+        await self.lightrag._insert_done()
+
+    def _begin_document_unit(self, doc_id: str):
+        """Register a document with the active unit of work, if any"""
+        unit_of_work = getattr(self, "_unit_of_work", None)
+        if unit_of_work is not None:
+            unit_of_work.begin_document(doc_id)
+
+    async def _end_document_unit(self, doc_id: str):
+        """Complete a document in the active unit of work, if any"""
+        unit_of_work = getattr(self, "_unit_of_work", None)
+        if unit_of_work is not None:
+            await unit_of_work.end_document(doc_id)
+
+    async def _recover_unflushed_documents(self) -> List[str]:
+        """
+        Reset documents left unflushed by a crashed run so they are reprocessed
+
+        Documents listed in the crash-recovery marker get their
+        multimodal_processed flag cleared, which makes the next ingestion run
+        redo their multimodal stages.
+
+        Returns:
+            List of recovered document IDs
+        """
+        marker_path = self._get_flush_marker_path()
+        doc_ids = StorageUnitOfWork.read_marker(marker_path)
+        if not doc_ids:
+            return []
+
+        recovered = []
+        for doc_id in doc_ids:
+            try:
+                doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+                if doc_status and doc_status.get("multimodal_processed", False):
+                    await self.lightrag.doc_status.upsert(
+                        {
+                            doc_id: {
+                                **doc_status,
+                                "multimodal_processed": False,
+                                "updated_at": time.strftime("%Y-%m-%dT%H:%M:%S+00:00"),
+                            }
+                        }
+                    )
+                recovered.append(doc_id)
+            except Exception as e:
+                self.logger.warning(f"Error recovering document {doc_id}: {e}")
+
+        await self.lightrag.doc_status.index_done_callback()
+        StorageUnitOfWork.clear_marker(marker_path)
+
+        self.logger.warning(
+            f"Recovered {len(recovered)} documents with unflushed writes from a "
+            f"previous run; their multimodal content will be reprocessed"
+        )
+        return recovered
+
+    @asynccontextmanager
+    async def storage_unit_of_work(
+        self, policy: str | None = None, batch_size: int | None = None
+    ):
+        """
+        Defer storage flushes until the end of a document or a batch of documents
+
+        Inside the context, multimodal processing stages record their flushes
+        instead of rewriting storages after every stage. Pending writes are
+        always flushed when the context exits. Nested contexts reuse the
+        outer unit of work.
+
+        Args:
+            policy: Flush policy ("immediate", "document" or "batch"),
+                defaults to config.flush_policy
+            batch_size: Documents per flush for the batch policy,
+                defaults to config.flush_batch_size
+
+        Yields:
+            The active StorageUnitOfWork, or None for the immediate policy
+        """
+        existing = getattr(self, "_unit_of_work", None)
+        flush_policy = resolve_flush_policy(policy or self.config.flush_policy)
+
+        if existing is not None or flush_policy == FlushPolicy.IMMEDIATE:
+            yield existing
+            return
+
+        await self._ensure_lightrag_initialized()
+        await self._recover_unflushed_documents()
+
+        unit_of_work = StorageUnitOfWork(
+            self.lightrag,
+            marker_path=self._get_flush_marker_path(),
+            policy=flush_policy,
+            batch_size=batch_size or self.config.flush_batch_size,
+        )
+        self._unit_of_work = unit_of_work
+        try:
+            yield unit_of_work
+        finally:
+            self._unit_of_work = None
+            await unit_of_work.flush()
+            self.logger.info(
+                f"Storage unit of work finished with {unit_of_work.flush_count} "
+                f"flushes (policy: {flush_policy.value})"
+            )
+
     def _generate_cache_key(
         self, file_path: Path, parse_method: str = None, **kwargs
     ) -> str:
@@ -272,17 +443,69 @@ class ProcessorMixin:
             }
             await self.parse_cache.upsert(cache_data)
             # Ensure data is persisted to disk
-            await self.parse_cache.index_done_callback()
+            await self._flush_storages(self.parse_cache)
             self.logger.info(f"Stored parsing result in cache: {cache_key}")
         except Exception as e:
             self.logger.warning(f"Error storing to parse cache: {e}")
 
+    @asynccontextmanager
+    async def parse_process_pool(self, max_workers: int | None = None):
+        """
+        Run parser calls in a pool of worker processes
+
+        Parsing is CPU-bound, so a process pool parses several documents in
+        parallel without taking the GIL away from the event loop. Workers are
+        spawned rather than forked because the parent holds storage and model
+        clients. Nested contexts reuse the outer pool.
+
+        Args:
+            max_workers: Number of parser processes (defaults to config.pipeline_parse_workers)
+
+        Yields:
+            The active ProcessPoolExecutor
+        """
+        if self._parse_executor is not None:
+            yield self._parse_executor
+            return
+
+        executor = ProcessPoolExecutor(
+            max_workers=max(1, max_workers or self.config.pipeline_parse_workers),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._parse_executor = executor
+        try:
+            yield executor
+        finally:
+            self._parse_executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_parser(self, parse_func, **kwargs):
+        """
+        Run a blocking parser call off the event loop
+
+        Uses the parse process pool when one is active (see parse_process_pool)
+        and a worker thread otherwise.
+
+        Args:
+            parse_func: Parser method to call
+            **kwargs: Arguments for the parser method
+
+        Returns:
+            Result of the parser method
+        """
+        if self._parse_executor is None:
+            return await asyncio.to_thread(parse_func, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._parse_executor, functools.partial(parse_func, **kwargs)
+        )
+
     async def parse_document(
         self,
         file_path: str,
         output_dir: str = None,
         parse_method: str = None,
         display_stats: bool = None,
+        stats: Dict[str, Any] | None = None,
         **kwargs,
     ) -> tuple[List[Dict[str, Any]], str]:
         """
@@ -293,6 +516,8 @@ class ProcessorMixin:
             output_dir: Output directory (defaults to config.parser_output_dir)
             parse_method: Parse method (defaults to config.parse_method)
             display_stats: Whether to display content statistics (defaults to config.display_content_stats)
+            stats: Optional dict whose "parse_cache_hit" is set to whether the
+                result came from the parse cache
             **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
 
         Returns:
@@ -319,6 +544,8 @@ class ProcessorMixin:
         cached_result = await self._get_cached_result(
             cache_key, file_path, parse_method, **kwargs
         )
+        if stats is not None:
+            stats["parse_cache_hit"] = cached_result is not None
         if cached_result is not None:
             content_list, doc_id = cached_result
             self.logger.info(f"Using cached parsing result for: {file_path}")
@@ -343,7 +570,7 @@ class ProcessorMixin:
 
             if ext in [".pdf"]:
                 self.logger.info("Detected PDF file, using parser for PDF...")
-                content_list = await asyncio.to_thread(
+                content_list = await self._run_parser(
                     doc_parser.parse_pdf,
                     pdf_path=file_path,
                     output_dir=output_dir,
@@ -363,7 +590,7 @@ class ProcessorMixin:
                 self.logger.info("Detected image file, using parser for images...")
                 # Use the selected parser's image parsing capability
                 if hasattr(doc_parser, "parse_image"):
-                    content_list = await asyncio.to_thread(
+                    content_list = await self._run_parser(
                         doc_parser.parse_image,
                         image_path=file_path,
                         output_dir=output_dir,
@@ -374,8 +601,11 @@ class ProcessorMixin:
                     self.logger.warning(
                         f"{self.config.parser} parser doesn't support image parsing, falling back to MinerU"
                     )
-                    content_list = MineruParser().parse_image(
-                        image_path=file_path, output_dir=output_dir, **kwargs
+                    content_list = await self._run_parser(
+                        MineruParser().parse_image,
+                        image_path=file_path,
+                        output_dir=output_dir,
+                        **kwargs,
                     )
             elif ext in [
                 ".doc",
@@ -391,7 +621,7 @@ class ProcessorMixin:
                 self.logger.info(
                     "Detected Office or HTML document, using parser for Office/HTML..."
                 )
-                content_list = await asyncio.to_thread(
+                content_list = await self._run_parser(
                     doc_parser.parse_office_doc,
                     doc_path=file_path,
                     output_dir=output_dir,
@@ -402,7 +632,7 @@ class ProcessorMixin:
                 self.logger.info(
                     f"Using generic parser for {ext} file (method={parse_method})..."
                 )
-                content_list = await asyncio.to_thread(
+                content_list = await self._run_parser(
                     doc_parser.parse_document,
                     file_path=file_path,
                     method=parse_method,
@@ -475,38 +705,8 @@ class ProcessorMixin:
             self.logger.debug("No multimodal content to process")
             return
 
-        # Check multimodal processing status - handle LightRAG's early DocStatus.PROCESSED marking
-        try:
-            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
-            if existing_doc_status:
-                # Check if multimodal content is already processed
-                multimodal_processed = existing_doc_status.get(
-                    "multimodal_processed", False
-                )
-
-                if multimodal_processed:
-                    self.logger.info(
-                        f"Document {doc_id} multimodal content is already processed"
-                    )
-                    return
-
-                # Even if status is DocStatus.PROCESSED (text processing done),
-                # we still need to process multimodal content if not yet done
-                doc_status = existing_doc_status.get("status", "")
-                if doc_status == DocStatus.PROCESSED and not multimodal_processed:
-                    self.logger.info(
-                        f"Document {doc_id} text processing is complete, but multimodal content still needs processing"
-                    )
-                    # Continue with multimodal processing
-                elif doc_status == DocStatus.PROCESSED and multimodal_processed:
-                    self.logger.info(
-                        f"Document {doc_id} is fully processed (text + multimodal)"
-                    )
-                    return
-
-        except Exception as e:
-            self.logger.debug(f"Error checking document status for {doc_id}: {e}")
-            # Continue with processing if cache check fails
+        if await self._is_multimodal_processed(doc_id):
+            return
 
         # Use ProcessorMixin's own batch processing that can handle multiple content types
         log_message = "Starting multimodal content processing..."
@@ -545,6 +745,53 @@ class ProcessorMixin:
             # Mark multimodal content as processed even after fallback
             await self._mark_multimodal_processing_complete(doc_id)
 
+    async def _is_multimodal_processed(self, doc_id: str) -> bool:
+        """
+        Check whether the multimodal content of a document was already processed
+
+        Handles LightRAG's early DocStatus.PROCESSED marking, which only covers
+        the text content.
+
+        Args:
+            doc_id: Document ID
+
+        Returns:
+            True if multimodal processing can be skipped
+        """
+        try:
+            existing_doc_status = await self.lightrag.doc_status.get_by_id(doc_id)
+            if existing_doc_status:
+                # Check if multimodal content is already processed
+                multimodal_processed = existing_doc_status.get(
+                    "multimodal_processed", False
+                )
+
+                if multimodal_processed:
+                    self.logger.info(
+                        f"Document {doc_id} multimodal content is already processed"
+                    )
+                    return True
+
+                # Even if status is DocStatus.PROCESSED (text processing done),
+                # we still need to process multimodal content if not yet done
+                doc_status = existing_doc_status.get("status", "")
+                if doc_status == DocStatus.PROCESSED and not multimodal_processed:
+                    self.logger.info(
+                        f"Document {doc_id} text processing is complete, but multimodal content still needs processing"
+                    )
+                    # Continue with multimodal processing
+                elif doc_status == DocStatus.PROCESSED and multimodal_processed:
+                    self.logger.info(
+                        f"Document {doc_id} is fully processed (text + multimodal)"
+                    )
+                    return True
+
+        except Exception as e:
+            self.logger.debug(f"Error checking document status for {doc_id}: {e}")
+            # Continue with processing if cache check fails
+
+        return False
+
     async def _process_multimodal_content_individual(
         self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
     ):
@@ -569,6 +816,15 @@ class ProcessorMixin:
             existing_doc_status.get("chunks_count", 0) if existing_doc_status else 0
         )
 
+        # Reuse descriptions checkpointed by the batch path or an earlier run
+        checkpoint_keys = self._get_multimodal_checkpoint_keys(doc_id, multimodal_items)
+        checkpointed = await self._load_multimodal_checkpoints(checkpoint_keys)
+        if checkpointed:
+            self.logger.info(
+                f"Reusing {len(checkpointed)}/{len(multimodal_items)} checkpointed "
+                f"multimodal descriptions"
+            )
+
         for i, item in enumerate(multimodal_items):
             try:
                 content_type = item.get("type", "unknown")
@@ -587,21 +843,37 @@ class ProcessorMixin:
                         "type": content_type,
                     }
 
-                    # Process content and get chunk results instead of immediately merging
-                    (
-                        enhanced_caption,
-                        entity_info,
-                        chunk_results,
-                    ) = await processor.process_multimodal_content(
-                        modal_content=item,
-                        content_type=content_type,
-                        file_path=file_name,
-                        item_info=item_info,  # Pass item info for context extraction
-                        batch_mode=True,
-                        doc_id=doc_id,  # Pass doc_id for proper association
-                        chunk_order_index=existing_chunks_count
-                        + i,  # Proper order index
-                    )
+                    if i in checkpointed:
+                        # Build the chunk from the checkpointed description
+                        description, entity_info = checkpointed[i]
+                        (
+                            enhanced_caption,
+                            entity_info,
+                            chunk_results,
+                        ) = await processor._create_entity_and_chunk(
+                            self._apply_chunk_template(content_type, item, description),
+                            entity_info,
+                            file_name,
+                            batch_mode=True,
+                            doc_id=doc_id,
+                            chunk_order_index=existing_chunks_count + i,
+                        )
+                    else:
+                        # Process content and get chunk results instead of immediately merging
+                        (
+                            enhanced_caption,
+                            entity_info,
+                            chunk_results,
+                        ) = await processor.process_multimodal_content(
+                            modal_content=item,
+                            content_type=content_type,
+                            file_path=file_name,
+                            item_info=item_info,  # Pass item info for context extraction
+                            batch_mode=True,
+                            doc_id=doc_id,  # Pass doc_id for proper association
+                            chunk_order_index=existing_chunks_count
+                            + i,  # Proper order index
+                        )
 
                     # Collect chunk results for batch processing
                     all_chunk_results.extend(chunk_results)
@@ -619,6 +891,9 @@ class ProcessorMixin:
                         f"No suitable processor found for {content_type} type content"
                     )
 
+            except ModalItemSkipped as e:
+                self.logger.debug(f"Skipped {content_type} item {i}: {e.reason}")
+                continue
             except Exception as e:
                 self.logger.error(f"Error processing multimodal content: {str(e)}")
                 self.logger.debug("Exception details:", exc_info=True)
@@ -634,11 +909,16 @@ class ProcessorMixin:
                     existing_chunks_list = current_doc_status.get("chunks_list", [])
                     existing_chunks_count = current_doc_status.get("chunks_count", 0)
 
-                    # Add multimodal chunks to the standard chunks_list
-                    updated_chunks_list = existing_chunks_list + multimodal_chunk_ids
-                    updated_chunks_count = existing_chunks_count + len(
-                        multimodal_chunk_ids
-                    )
+                    # Add multimodal chunks to the standard chunks_list, skipping
+                    # chunks already recorded by an interrupted earlier run
+                    existing_chunk_ids = set(existing_chunks_list)
+                    new_chunk_ids = [
+                        chunk_id
+                        for chunk_id in multimodal_chunk_ids
+                        if chunk_id not in existing_chunk_ids
+                    ]
+                    updated_chunks_list = existing_chunks_list + new_chunk_ids
+                    updated_chunks_count = existing_chunks_count + len(new_chunk_ids)
 
                     # Update document status with integrated chunk list
                     await self.lightrag.doc_status.upsert(
@@ -653,7 +933,7 @@ class ProcessorMixin:
                     )
 
                     # Ensure doc_status update is persisted to disk
-                    await self.lightrag.doc_status.index_done_callback()
+                    await self._flush_storages(self.lightrag.doc_status)
 
                     self.logger.info(
                         f"Updated doc_status with {len(multimodal_chunk_ids)} multimodal chunks integrated into chunks_list"
@@ -693,7 +973,9 @@ class ProcessorMixin:
                 file_path=file_name,
             )
 
-            await self.lightrag._insert_done()
+            await self._flush_lightrag_storages()
+
+        await self._clear_multimodal_checkpoints(checkpoint_keys, doc_id)
 
         self.logger.info("Individual multimodal content processing complete")
 
@@ -712,9 +994,31 @@ class ProcessorMixin:
             file_path: File path for citation
             doc_id: Document ID for proper association
         """
+        records, checkpoint_keys = await self._describe_multimodal_items(
+            multimodal_items, file_path, doc_id
+        )
+        if records:
+            await self._store_multimodal_records(
+                records, checkpoint_keys, file_path, doc_id
+            )
+
+    async def _describe_multimodal_items(
+        self, multimodal_items: List[Dict[str, Any]], file_path: str, doc_id: str
+    ) -> Tuple[List[MultimodalChunkRecord], List[str]]:
+        """
+        Generate descriptions and chunk records for multimodal items (stages 1-2)
+
+        Args:
+            multimodal_items: List of multimodal items with different types
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+
+        Returns:
+            Tuple of (chunk records in document order, checkpoint keys of the items)
+        """
         if not multimodal_items:
             self.logger.debug("No multimodal content to process")
-            return
+            return [], []
 
         # Get existing chunks count for proper order indexing
         try:
@@ -725,199 +1029,694 @@ class ProcessorMixin:
         except Exception:
             existing_chunks_count = 0
 
-        # Use LightRAG's concurrency control
-        semaphore = asyncio.Semaphore(getattr(self.lightrag, "max_parallel_insert", 2))
-
         # Progress tracking variables
         total_items = len(multimodal_items)
+
+        # Use LightRAG's concurrency control: a fixed number of workers pull
+        # items lazily, so only in-flight items hold prompts and image data
+        worker_count = min(
+            max(1, getattr(self.lightrag, "max_parallel_insert", 2)), total_items
+        )
         completed_count = 0
         progress_lock = asyncio.Lock()
 
+        # Load descriptions checkpointed by a previous, interrupted run
+        checkpoint_keys = self._get_multimodal_checkpoint_keys(doc_id, multimodal_items)
+        checkpointed = await self._load_multimodal_checkpoints(checkpoint_keys)
+        checkpoint_interval = max(1, self.config.multimodal_checkpoint_interval)
+        pending_checkpoints = 0
+
+        # Describe each group of near-duplicate images once
+        image_hashes = await self._compute_image_hashes(multimodal_items)
+        duplicate_of = (
+            group_near_duplicate_images(
+                image_hashes, self.config.image_dedup_max_distance
+            )
+            if self.config.enable_image_dedup
+            else {}
+        )
+        corpus_cached = await self._load_corpus_image_descriptions(
+            image_hashes, duplicate_of
+        )
+        shared_descriptions: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+        items_to_describe = total_items - len(duplicate_of)
+
         # Log processing start
         self.logger.info(f"Starting to process {total_items} multimodal content items")
+        if checkpointed:
+            self.logger.info(
+                f"Resuming {len(checkpointed)}/{total_items} multimodal items from checkpoints"
+            )
+        if duplicate_of or corpus_cached:
+            self.logger.info(
+                f"Reusing descriptions for {len(duplicate_of)} near-duplicate images "
+                f"and {len(corpus_cached)} images described in other documents"
+            )
+            self._record_multimodal_stat("images_deduplicated", len(duplicate_of))
+            self._record_multimodal_stat("images_from_corpus_cache", len(corpus_cached))
+
+        def build_item_data(
+            index: int,
+            item: Dict[str, Any],
+            description: str,
+            entity_info: Dict[str, Any],
+        ) -> Dict[str, Any]:
+            """Assemble the stage 1 result for an item"""
+            content_type = item.get("type", "unknown")
+            return {
+                "index": index,
+                "content_type": content_type,
+                "description": description,
+                "entity_info": entity_info,
+                "original_item": item,
+                "item_info": {
+                    "page_idx": item.get("page_idx", 0),
+                    "index": index,
+                    "type": content_type,
+                },
+                "chunk_order_index": existing_chunks_count + index,
+                "file_path": file_path,  # Add file_path to the result
+            }
 
         # Stage 1: Concurrent generation of descriptions using correct processors for each type
         async def process_single_item_with_correct_processor(
-            item: Dict[str, Any], index: int, file_path: str
+            item: Dict[str, Any],
+            index: int,
+            file_path: str,
+            described: Optional[Tuple[str, Dict[str, Any]]] = None,
         ):
             """Process single item using the correct processor for its type"""
-            nonlocal completed_count
-            async with semaphore:
-                try:
-                    content_type = item.get("type", "unknown")
+            nonlocal completed_count, pending_checkpoints
+            try:
+                content_type = item.get("type", "unknown")
 
-                    # Select the correct processor based on content type
-                    processor = get_processor_for_type(
-                        self.modal_processors, content_type
-                    )
+                # Select the correct processor based on content type
+                processor = get_processor_for_type(self.modal_processors, content_type)
 
-                    if not processor:
-                        self.logger.warning(
-                            f"No processor found for type: {content_type}"
+                if not processor:
+                    self.logger.warning(f"No processor found for type: {content_type}")
+                    return None
+
+                item_info = {
+                    "page_idx": item.get("page_idx", 0),
+                    "index": index,
+                    "type": content_type,
+                }
+
+                if index in checkpointed:
+                    # Reuse the description generated before the interruption
+                    description, entity_info = checkpointed[index]
+                elif index in corpus_cached:
+                    # Reuse the description of the same image in another document
+                    description, entity_info = corpus_cached[index]
+                else:
+                    if described is not None:
+                        # Described together with other images of its page
+                        description, entity_info = described
+                    else:
+                        # Call the correct processor's description generation method
+                        (
+                            description,
+                            entity_info,
+                        ) = await processor.generate_description_only(
+                            modal_content=item,
+                            content_type=content_type,
+                            item_info=item_info,
+                            entity_name=None,  # Let LLM auto-generate
                         )
-                        return None
 
-                    item_info = {
-                        "page_idx": item.get("page_idx", 0),
-                        "index": index,
-                        "type": content_type,
-                    }
+                    if self.multimodal_checkpoint is not None:
+                        await self.multimodal_checkpoint.upsert(
+                            {
+                                checkpoint_keys[index]: {
+                                    "doc_id": doc_id,
+                                    "index": index,
+                                    "description": description,
+                                    "entity_info": entity_info,
+                                }
+                            }
+                        )
+                        pending_checkpoints += 1
+                        if pending_checkpoints >= checkpoint_interval:
+                            pending_checkpoints = 0
+                            await self.multimodal_checkpoint.index_done_callback()
+
+                    if index in image_hashes:
+                        await self._store_corpus_image_description(
+                            image_hashes[index][1], description, entity_info
+                        )
 
-                    # Call the correct processor's description generation method
-                    (
-                        description,
-                        entity_info,
-                    ) = await processor.generate_description_only(
-                        modal_content=item,
-                        content_type=content_type,
-                        item_info=item_info,
-                        entity_name=None,  # Let LLM auto-generate
-                    )
+                # Update progress (non-blocking)
+                async with progress_lock:
+                    completed_count += 1
+                    if (
+                        completed_count % max(1, items_to_describe // 10) == 0
+                        or completed_count == items_to_describe
+                    ):
+                        progress_percent = (completed_count / items_to_describe) * 100
+                        self.logger.info(
+                            f"Multimodal chunk generation progress: {completed_count}/{items_to_describe} ({progress_percent:.1f}%)"
+                        )
 
-                    # Update progress (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
-
-                    return {
-                        "index": index,
-                        "content_type": content_type,
-                        "description": description,
-                        "entity_info": entity_info,
-                        "original_item": item,
-                        "item_info": item_info,
-                        "chunk_order_index": existing_chunks_count + index,
-                        "processor": processor,  # Keep reference to the processor used
-                        "file_path": file_path,  # Add file_path to the result
-                    }
+                return build_item_data(index, item, description, entity_info)
 
-                except Exception as e:
-                    # Update progress even on error (non-blocking)
-                    async with progress_lock:
-                        completed_count += 1
-                        if (
-                            completed_count % max(1, total_items // 10) == 0
-                            or completed_count == total_items
-                        ):
-                            progress_percent = (completed_count / total_items) * 100
-                            self.logger.info(
-                                f"Multimodal chunk generation progress: {completed_count}/{total_items} ({progress_percent:.1f}%)"
-                            )
+            except Exception as e:
+                # Update progress even on error (non-blocking)
+                async with progress_lock:
+                    completed_count += 1
+                    if (
+                        completed_count % max(1, items_to_describe // 10) == 0
+                        or completed_count == items_to_describe
+                    ):
+                        progress_percent = (completed_count / items_to_describe) * 100
+                        self.logger.info(
+                            f"Multimodal chunk generation progress: {completed_count}/{items_to_describe} ({progress_percent:.1f}%)"
+                        )
 
+                if isinstance(e, ModalItemSkipped):
+                    self.logger.debug(
+                        f"Skipped {content_type} item {index}: {e.reason}"
+                    )
+                else:
                     self.logger.error(
                         f"Error generating description for {content_type} item {index}: {e}"
                     )
-                    return None
+                return None
 
-        # Process all items concurrently with correct processors
-        tasks = [
-            asyncio.create_task(
-                process_single_item_with_correct_processor(item, i, file_path)
+        # Stage 2 runs as results stream in: each description becomes a chunk
+        # record right away instead of being held until all items finish
+        records: List[MultimodalChunkRecord] = []
+
+        # Images sharing a page are described together; each batch is one
+        # work unit, scheduled at the position of its first image
+        page_batches = {
+            indices[0]: indices
+            for indices in self._group_page_images(
+                multimodal_items,
+                exclude=set(duplicate_of) | set(checkpointed) | set(corpus_cached),
             )
-            for i, item in enumerate(multimodal_items)
-        ]
+        }
+        batched = {index for indices in page_batches.values() for index in indices}
+        pending_units = (
+            page_batches.get(index, [index])
+            for index in range(total_items)
+            if index not in duplicate_of
+            and (index not in batched or index in page_batches)
+        )
+
+        async def description_worker():
+            """Pull work units from the shared iterator until it is exhausted"""
+            for indices in pending_units:
+                described = {}
+                if len(indices) > 1:
+                    described = await self._describe_page_images(
+                        multimodal_items, indices
+                    )
+
+                for index in indices:
+                    result = await process_single_item_with_correct_processor(
+                        multimodal_items[index], index, file_path, described.get(index)
+                    )
+                    if result is None:
+                        continue
+                    shared_descriptions[index] = (
+                        result["description"],
+                        result["entity_info"],
+                    )
+                    try:
+                        records.append(
+                            await self._build_multimodal_chunk_record(result)
+                        )
+                    except Exception as e:
+                        self.logger.error(f"Error building chunk for item {index}: {e}")
 
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.gather(*(description_worker() for _ in range(worker_count)))
 
-        # Filter successful results
-        multimodal_data_list = []
-        for result in results:
-            if isinstance(result, Exception):
-                self.logger.error(f"Task failed: {result}")
+        # Each duplicate keeps its own chunk but shares the representative's
+        # description and therefore its modal entity
+        for index, representative in duplicate_of.items():
+            if representative not in shared_descriptions:
                 continue
-            if result is not None:
-                multimodal_data_list.append(result)
+            description, entity_info = shared_descriptions[representative]
+            try:
+                records.append(
+                    await self._build_multimodal_chunk_record(
+                        build_item_data(
+                            index, multimodal_items[index], description, entity_info
+                        )
+                    )
+                )
+            except Exception as e:
+                self.logger.error(f"Error building chunk for item {index}: {e}")
+
+        # Persist the remaining checkpoints before the storage stages start
+        if self.multimodal_checkpoint is not None and pending_checkpoints:
+            await self.multimodal_checkpoint.index_done_callback()
+        if self.image_description_cache is not None and image_hashes:
+            await self._flush_storages(self.image_description_cache)
+        if self.equation_description_cache is not None and any(
+            item.get("type") == "equation" for item in multimodal_items
+        ):
+            await self._flush_storages(self.equation_description_cache)
 
-        if not multimodal_data_list:
+        if not records:
             self.logger.warning("No valid multimodal descriptions generated")
-            return
+            return [], checkpoint_keys
 
         self.logger.info(
-            f"Generated descriptions for {len(multimodal_data_list)}/{len(multimodal_items)} multimodal items using correct processors"
+            f"Generated descriptions for {len(records)}/{len(multimodal_items)} multimodal items using correct processors"
         )
 
-        # Stage 2: Convert to LightRAG chunks format
+        # Restore document order
+        records.sort(key=lambda record: record.index)
+        return records, checkpoint_keys
+
+    async def _store_multimodal_records(
+        self,
+        records: List[MultimodalChunkRecord],
+        checkpoint_keys: List[str],
+        file_path: str,
+        doc_id: str,
+    ):
+        """
+        Store multimodal chunk records and merge them into the knowledge graph (stages 3-7)
+
+        Args:
+            records: Chunk records in document order
+            checkpoint_keys: Checkpoint keys of the document's items, cleared when done
+            file_path: File path for citation
+            doc_id: Document ID for proper association
+        """
+        # Convert to LightRAG chunks format
         lightrag_chunks = self._convert_to_lightrag_chunks_type_aware(
-            multimodal_data_list, file_path, doc_id
+            records, file_path, doc_id
+        )
+
+        # Huge tables also get row-group chunks, which skip entity extraction
+        row_group_chunks = self._build_table_row_group_chunks(
+            records, file_path, doc_id
         )
 
         # Stage 3: Store chunks to LightRAG storage
-        await self._store_chunks_to_lightrag_storage_type_aware(lightrag_chunks)
+        await self._store_chunks_to_lightrag_storage_type_aware(
+            {**lightrag_chunks, **row_group_chunks}
+        )
 
         # Stage 3.5: Store multimodal main entities to entities_vdb and full_entities
         await self._store_multimodal_main_entities(
-            multimodal_data_list, lightrag_chunks, file_path, doc_id
+            records, lightrag_chunks, file_path, doc_id
         )
 
         # Track chunk IDs for doc_status update
-        chunk_ids = list(lightrag_chunks.keys())
+        chunk_ids = list(lightrag_chunks.keys()) + list(row_group_chunks.keys())
 
-        # Stage 4: Use LightRAG's batch entity relation extraction
-        chunk_results = await self._batch_extract_entities_lightrag_style_type_aware(
-            lightrag_chunks
-        )
+        if self._merge_batch is not None:
+            # Stages 4-6 run once for all documents of the active merge batch
+            await self._merge_batch.submit(doc_id, file_path, lightrag_chunks, records)
+        else:
+            # Stage 4: Use LightRAG's batch entity relation extraction
+            chunk_results = (
+                await self._batch_extract_entities_lightrag_style_type_aware(
+                    lightrag_chunks
+                )
+            )
 
-        # Stage 5: Add belongs_to relations (multimodal-specific)
-        enhanced_chunk_results = await self._batch_add_belongs_to_relations_type_aware(
-            chunk_results, multimodal_data_list
-        )
+            # Stage 5: Add belongs_to relations (multimodal-specific)
+            enhanced_chunk_results = (
+                await self._batch_add_belongs_to_relations_type_aware(
+                    chunk_results, records
+                )
+            )
 
-        # Stage 6: Use LightRAG's batch merge
-        await self._batch_merge_lightrag_style_type_aware(
-            enhanced_chunk_results, file_path, doc_id
-        )
+            # Stage 6: Use LightRAG's batch merge
+            await self._batch_merge_lightrag_style_type_aware(
+                enhanced_chunk_results, file_path, doc_id
+            )
 
         # Stage 7: Update doc_status with integrated chunks_list
         await self._update_doc_status_with_chunks_type_aware(doc_id, chunk_ids)
 
-    def _convert_to_lightrag_chunks_type_aware(
-        self, multimodal_data_list: List[Dict[str, Any]], file_path: str, doc_id: str
-    ) -> Dict[str, Any]:
-        """Convert multimodal data to LightRAG standard chunks format"""
+        # Descriptions are now stored as chunks, drop their checkpoints
+        await self._clear_multimodal_checkpoints(checkpoint_keys, doc_id)
 
-        chunks = {}
+    def _record_multimodal_stat(self, name: str, count: int = 1):
+        """Add to a multimodal ingestion statistics counter"""
+        if count:
+            self.multimodal_stats[name] = self.multimodal_stats.get(name, 0) + count
+
+    def get_multimodal_stats(self) -> Dict[str, Any]:
+        """
+        Get multimodal ingestion statistics
+
+        Returns:
+            Dict of counters accumulated since this instance was created
+        """
+        stats = dict(self.multimodal_stats)
+
+        image_processor = self.modal_processors.get("image")
+        triage = getattr(image_processor, "triage", None)
+        if triage is not None:
+            stats.update(triage.get_stats())
 
-        for data in multimodal_data_list:
-            description = data["description"]
-            entity_info = data["entity_info"]
-            chunk_order_index = data["chunk_order_index"]
-            content_type = data["content_type"]
-            original_item = data["original_item"]
+        equation_processor = self.modal_processors.get("equation")
+        if hasattr(equation_processor, "get_stats"):
+            stats.update(equation_processor.get_stats())
+
+        if self.model_router is not None:
+            stats.update(self.model_router.get_stats())
+
+        return stats
+
+    def _group_page_images(
+        self, multimodal_items: List[Dict[str, Any]], exclude: Set[int]
+    ) -> List[List[int]]:
+        """
+        Group image items by page for multi-image description requests
+
+        Args:
+            multimodal_items: List of multimodal items
+            exclude: Indices of items that already have a description
+
+        Returns:
+            Lists of item indices with at least two images from the same page,
+            split to at most page_image_batch_size images each
+        """
+        image_processor = self.modal_processors.get("image")
+        if not self.config.enable_page_image_batching or not hasattr(
+            image_processor, "generate_page_descriptions"
+        ):
+            return []
+
+        pages: Dict[Any, List[int]] = {}
+        for index, item in enumerate(multimodal_items):
+            if item.get("type") != "image" or index in exclude:
+                continue
+            pages.setdefault(item.get("page_idx", 0), []).append(index)
+
+        batch_size = max(2, self.config.page_image_batch_size)
+        batches = []
+        for indices in pages.values():
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start : start + batch_size]
+                if len(batch) > 1:
+                    batches.append(batch)
+        return batches
+
+    async def _describe_page_images(
+        self, multimodal_items: List[Dict[str, Any]], indices: List[int]
+    ) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """
+        Describe images from the same page with one multi-image request
 
-            # Apply the appropriate chunk template based on content type
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
+        Args:
+            multimodal_items: List of multimodal items
+            indices: Indices of the image items to describe together
+
+        Returns:
+            Dict of item index to (description, entity_info) for images the
+            response covered; the others are described individually
+        """
+        first = multimodal_items[indices[0]]
+        item_info = {
+            "page_idx": first.get("page_idx", 0),
+            "index": indices[0],
+            "type": "image",
+        }
+        try:
+            results = await self.modal_processors["image"].generate_page_descriptions(
+                [multimodal_items[index] for index in indices], item_info=item_info
             )
+        except Exception as e:
+            self.logger.warning(
+                f"Multi-image request for page {item_info['page_idx']} failed, "
+                f"describing its {len(indices)} images individually: {e}"
+            )
+            results = []
 
-            # Generate chunk_id
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
+        described = {
+            index: result
+            for index, result in zip(indices, results)
+            if result is not None
+        }
+        self._record_multimodal_stat("image_page_requests", 1)
+        self._record_multimodal_stat("images_described_per_page", len(described))
+        self._record_multimodal_stat(
+            "image_page_fallbacks", len(indices) - len(described)
+        )
+        return described
 
-            # Calculate tokens
-            tokens = len(self.lightrag.tokenizer.encode(formatted_chunk_content))
+    async def _compute_image_hashes(
+        self, multimodal_items: List[Dict[str, Any]]
+    ) -> Dict[int, Tuple[Optional[int], Optional[str]]]:
+        """
+        Compute perceptual and file hashes for image items
 
-            # Use full path or basename based on config
-            file_ref = self._get_file_reference(file_path)
+        Hashing reads every image file, so it runs in a worker thread.
+
+        Args:
+            multimodal_items: List of multimodal items
+
+        Returns:
+            Dict mapping image item index to (perceptual hash, file hash)
+        """
+        use_dedup = self.config.enable_image_dedup
+        if not use_dedup and self.image_description_cache is None:
+            return {}
+
+        image_paths = {
+            index: item.get("img_path")
+            for index, item in enumerate(multimodal_items)
+            if item.get("type") == "image" and item.get("img_path")
+        }
+        if not image_paths:
+            return {}
+
+        def compute_hashes():
+            hashes = {}
+            for index, image_path in image_paths.items():
+                if not Path(image_path).is_file():
+                    continue
+                hashes[index] = (
+                    compute_image_dhash(image_path) if use_dedup else None,
+                    compute_file_hash(image_path),
+                )
+            return hashes
+
+        return await asyncio.to_thread(compute_hashes)
+
+    async def _load_corpus_image_descriptions(
+        self,
+        image_hashes: Dict[int, Tuple[Optional[int], Optional[str]]],
+        duplicate_of: Dict[int, int],
+    ) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """
+        Load descriptions of identical images from other documents
+
+        Args:
+            image_hashes: Mapping of image item index to (perceptual hash, file hash)
+            duplicate_of: Mapping of duplicate item index to its representative
+
+        Returns:
+            Dict mapping item index to (description, entity_info)
+        """
+        if self.image_description_cache is None:
+            return {}
+
+        indices = [
+            index
+            for index, (_, file_hash) in image_hashes.items()
+            if file_hash is not None and index not in duplicate_of
+        ]
+        if not indices:
+            return {}
+
+        try:
+            entries = await self.image_description_cache.get_by_ids(
+                [f"img-{image_hashes[index][1]}" for index in indices]
+            )
+        except Exception as e:
+            self.logger.warning(f"Error loading image description cache: {e}")
+            return {}
+
+        cached = {}
+        for index, entry in zip(indices, entries):
+            if (
+                isinstance(entry, dict)
+                and entry.get("description") is not None
+                and isinstance(entry.get("entity_info"), dict)
+            ):
+                cached[index] = (entry["description"], entry["entity_info"])
+        return cached
+
+    async def _store_corpus_image_description(
+        self, file_hash: Optional[str], description: str, entity_info: Dict[str, Any]
+    ):
+        """Remember an image description for identical images in other documents"""
+        if self.image_description_cache is None or file_hash is None:
+            return
+
+        try:
+            await self.image_description_cache.upsert(
+                {
+                    f"img-{file_hash}": {
+                        "description": description,
+                        "entity_info": entity_info,
+                    }
+                }
+            )
+        except Exception as e:
+            self.logger.warning(f"Error updating image description cache: {e}")
+
+    def _get_multimodal_checkpoint_keys(
+        self, doc_id: str, multimodal_items: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Generate checkpoint keys for multimodal items
+
+        Keys depend on the document, the item position and the item content, so
+        a changed item never reuses a stale description.
+
+        Args:
+            doc_id: Document ID
+            multimodal_items: List of multimodal items
 
+        Returns:
+            List of checkpoint keys in item order
+        """
+        return [
+            compute_mdhash_id(
+                f"{doc_id}:{index}:{json.dumps(item, sort_keys=True, default=str)}",
+                prefix="mmcp-",
+            )
+            for index, item in enumerate(multimodal_items)
+        ]
+
+    async def _load_multimodal_checkpoints(
+        self, checkpoint_keys: List[str]
+    ) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """
+        Load checkpointed descriptions for multimodal items
+
+        Args:
+            checkpoint_keys: Checkpoint keys in item order
+
+        Returns:
+            Dict mapping item index to (description, entity_info)
+        """
+        if self.multimodal_checkpoint is None or not checkpoint_keys:
+            return {}
+
+        try:
+            entries = await self.multimodal_checkpoint.get_by_ids(checkpoint_keys)
+        except Exception as e:
+            self.logger.warning(f"Error loading multimodal checkpoints: {e}")
+            return {}
+
+        checkpointed = {}
+        for index, entry in enumerate(entries):
+            if (
+                isinstance(entry, dict)
+                and entry.get("description") is not None
+                and isinstance(entry.get("entity_info"), dict)
+            ):
+                checkpointed[index] = (entry["description"], entry["entity_info"])
+
+        return checkpointed
+
+    async def _clear_multimodal_checkpoints(
+        self, checkpoint_keys: List[str], doc_id: str
+    ):
+        """
+        Remove checkpoints for multimodal items whose chunks have been stored
+
+        Under a deferred storage unit of work the checkpoints are kept until the
+        chunks they protect have been flushed, so a crash before the flush
+        resumes from them instead of describing every item again.
+
+        Args:
+            checkpoint_keys: Checkpoint keys to remove
+            doc_id: Document ID the checkpoints belong to
+        """
+        if self.multimodal_checkpoint is None or not checkpoint_keys:
+            return
+
+        async def delete_checkpoints():
+            try:
+                await self.multimodal_checkpoint.delete(checkpoint_keys)
+                await self.multimodal_checkpoint.index_done_callback()
+            except Exception as e:
+                self.logger.warning(f"Error clearing multimodal checkpoints: {e}")
+
+        unit_of_work = getattr(self, "_unit_of_work", None)
+        if unit_of_work is not None:
+            await unit_of_work.when_durable(doc_id, delete_checkpoints)
+        else:
+            await delete_checkpoints()
+
+    async def _build_multimodal_chunk_record(
+        self, data: Dict[str, Any]
+    ) -> MultimodalChunkRecord:
+        """
+        Build the chunk record for a generated description
+
+        The chunk template, chunk id, entity id and token count are computed here
+        exactly once per item and reused by all later stages.
+
+        Args:
+            data: Stage 1 result with description and entity info
+
+        Returns:
+            MultimodalChunkRecord for the item
+        """
+        content_type = data["content_type"]
+        original_item = data["original_item"]
+        description = data["description"]
+        entity_info = data["entity_info"]
+
+        # Apply the appropriate chunk template based on content type
+        formatted_chunk_content = self._apply_chunk_template(
+            content_type, original_item, description
+        )
+
+        return MultimodalChunkRecord(
+            index=data["index"],
+            content_type=content_type,
+            description=description,
+            entity_info=entity_info,
+            original_item=original_item,
+            item_info=data["item_info"],
+            chunk_order_index=data["chunk_order_index"],
+            file_path=data.get("file_path", "multimodal_content"),
+            content=formatted_chunk_content,
+            chunk_id=compute_mdhash_id(formatted_chunk_content, prefix="chunk-"),
+            entity_id=compute_mdhash_id(entity_info["entity_name"], prefix="ent-"),
+            tokens=await self.token_cache.count_async(formatted_chunk_content),
+        )
+
+    def _convert_to_lightrag_chunks_type_aware(
+        self, records: List[MultimodalChunkRecord], file_path: str, doc_id: str
+    ) -> Dict[str, Any]:
+        """Convert multimodal chunk records to LightRAG standard chunks format"""
+
+        chunks = {}
+
+        # Use full path or basename based on config
+        file_ref = self._get_file_reference(file_path)
+
+        for record in records:
             # Build LightRAG standard chunk format
-            chunks[chunk_id] = {
-                "content": formatted_chunk_content,  # Now uses the templated content
-                "tokens": tokens,
+            chunks[record.chunk_id] = {
+                "content": record.content,  # Now uses the templated content
+                "tokens": record.tokens,
                 "full_doc_id": doc_id,
-                "chunk_order_index": chunk_order_index,
+                "chunk_order_index": record.chunk_order_index,
                 "file_path": file_ref,
                 "llm_cache_list": [],  # LightRAG will populate this field
                 # Multimodal-specific metadata
                 "is_multimodal": True,
-                "modal_entity_name": entity_info["entity_name"],
-                "original_type": data["content_type"],
-                "page_idx": data["item_info"].get("page_idx", 0),
+                "modal_entity_name": record.entity_info["entity_name"],
+                "original_type": record.content_type,
+                "page_idx": record.item_info.get("page_idx", 0),
             }
 
         self.logger.debug(
@@ -964,6 +1763,11 @@ class ProcessorMixin:
                 table_body = original_item.get("table_body", "")
                 table_footnote = original_item.get("table_footnote", [])
 
+                # Rows of huge tables live in row-group chunks, keep a summary here
+                parsed_table = self._get_row_grouped_table(table_body)
+                if parsed_table is not None:
+                    table_body = parsed_table.prompt_body(self.config.table_sample_rows)
+
                 return PROMPTS["table_chunk"].format(
                     table_img_path=table_img_path,
                     table_caption=", ".join(table_caption) if table_caption else "None",
@@ -1000,6 +1804,89 @@ class ProcessorMixin:
             # Fallback to just the description if template fails
             return description
 
+    def _get_row_grouped_table(self, table_body: str) -> Optional[ParsedTable]:
+        """
+        Parse a table body if it is large enough to be split into row groups
+
+        Args:
+            table_body: Table body from the parsed content
+
+        Returns:
+            ParsedTable for tables above the row-group threshold, otherwise None
+        """
+        if not self.config.enable_table_analysis:
+            return None
+
+        parsed_table = parse_table_body(table_body)
+        if (
+            parsed_table is None
+            or parsed_table.row_count <= self.config.table_row_group_threshold
+        ):
+            return None
+        return parsed_table
+
+    def _build_table_row_group_chunks(
+        self, records: List[MultimodalChunkRecord], file_path: str, doc_id: str
+    ) -> Dict[str, Any]:
+        """
+        Split huge tables into row-group chunks for retrieval
+
+        Row-group chunks are stored and indexed like other chunks but are not
+        sent to entity extraction; the table's main chunk carries its entity.
+
+        Args:
+            records: Multimodal chunk records
+            file_path: File path for citation
+            doc_id: Document ID
+
+        Returns:
+            Dict of row-group chunks in LightRAG format
+        """
+        from raganything.prompt import PROMPTS
+
+        chunks = {}
+        file_ref = self._get_file_reference(file_path)
+
+        for record in records:
+            if record.content_type != "table":
+                continue
+
+            table_item = record.original_item
+            parsed_table = self._get_row_grouped_table(table_item.get("table_body", ""))
+            if parsed_table is None:
+                continue
+
+            table_caption = table_item.get("table_caption", [])
+            row_groups = parsed_table.row_groups(self.config.table_row_group_size)
+            for group_index, group_body in enumerate(row_groups):
+                content = PROMPTS["table_chunk"].format(
+                    table_img_path=table_item.get("img_path", ""),
+                    table_caption=", ".join(table_caption) if table_caption else "None",
+                    table_body=group_body,
+                    table_footnote="None",
+                    enhanced_caption=(
+                        f"Rows of {record.entity_info['entity_name']} "
+                        f"(part {group_index + 1} of {len(row_groups)})"
+                    ),
+                )
+                chunk_id = compute_mdhash_id(content, prefix="chunk-")
+                chunks[chunk_id] = {
+                    "content": content,
+                    "tokens": self.token_cache.count(content),
+                    "full_doc_id": doc_id,
+                    "chunk_order_index": record.chunk_order_index,
+                    "file_path": file_ref,
+                    "llm_cache_list": [],
+                    "is_multimodal": True,
+                    "modal_entity_name": record.entity_info["entity_name"],
+                    "original_type": "table_rows",
+                    "page_idx": record.item_info.get("page_idx", 0),
+                }
+
+        if chunks:
+            self.logger.info(f"Split large tables into {len(chunks)} row-group chunks")
+        return chunks
+
     async def _store_chunks_to_lightrag_storage_type_aware(
         self, chunks: Dict[str, Any]
     ):
@@ -1019,7 +1906,7 @@ class ProcessorMixin:
 
     async def _store_multimodal_main_entities(
         self,
-        multimodal_data_list: List[Dict[str, Any]],
+        records: List[MultimodalChunkRecord],
         lightrag_chunks: Dict[str, Any],
         file_path: str,
         doc_id: str = None,
@@ -1029,12 +1916,12 @@ class ProcessorMixin:
         This ensures that entities like "TableName (table)" are properly indexed.
 
         Args:
-            multimodal_data_list: List of processed multimodal data with entity info
+            records: Multimodal chunk records with entity info
             lightrag_chunks: Chunks in LightRAG format (already formatted with templates)
             file_path: File path for the entities
             doc_id: Document ID for full_entities storage
         """
-        if not multimodal_data_list:
+        if not records:
             return
 
         # Create entities_vdb entries for all multimodal main entities
@@ -1043,59 +1930,52 @@ class ProcessorMixin:
         # Use full path or basename based on config
         file_ref = self._get_file_reference(file_path)
 
-        for data in multimodal_data_list:
-            entity_info = data["entity_info"]
-            entity_name = entity_info["entity_name"]
-            description = data["description"]
-            content_type = data["content_type"]
-            original_item = data["original_item"]
+        for record in records:
+            entity_info = record.entity_info
 
-            # Apply the same chunk template to get the formatted content
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
-            )
-
-            # Generate chunk_id using the formatted content (same as in _convert_to_lightrag_chunks)
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
-
-            # Generate entity_id using LightRAG's standard format
-            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            # Near-duplicate images share one entity sourced from all their chunks
+            if record.entity_id in entities_to_store:
+                entity_data = entities_to_store[record.entity_id]
+                entity_data["source_id"] = GRAPH_FIELD_SEP.join(
+                    [entity_data["source_id"], record.chunk_id]
+                )
+                continue
 
             # Create entity data in LightRAG format
             entity_data = {
-                "entity_name": entity_name,
-                "entity_type": entity_info.get("entity_type", content_type),
-                "content": entity_info.get("summary", description),
-                "source_id": chunk_id,
+                "entity_name": entity_info["entity_name"],
+                "entity_type": entity_info.get("entity_type", record.content_type),
+                "content": entity_info.get("summary", record.description),
+                "source_id": record.chunk_id,
                 "file_path": file_ref,
             }
 
-            entities_to_store[entity_id] = entity_data
+            entities_to_store[record.entity_id] = entity_data
 
         if entities_to_store:
             try:
-                # Store entities in knowledge graph
-                for entity_id, entity_data in entities_to_store.items():
-                    entity_name = entity_data["entity_name"]
-
-                    # Create node data for knowledge graph
-                    node_data = {
-                        "entity_id": entity_name,
-                        "entity_type": entity_data["entity_type"],
-                        "description": entity_data["content"],
-                        "source_id": entity_data["source_id"],
-                        "file_path": entity_data["file_path"],
-                        "created_at": int(time.time()),
-                    }
-
-                    # Store in knowledge graph
-                    await self.lightrag.chunk_entity_relation_graph.upsert_node(
-                        entity_name, node_data
+                # Store entities in knowledge graph with a single batched upsert
+                created_at = int(time.time())
+                nodes = [
+                    (
+                        entity_data["entity_name"],
+                        {
+                            "entity_id": entity_data["entity_name"],
+                            "entity_type": entity_data["entity_type"],
+                            "description": entity_data["content"],
+                            "source_id": entity_data["source_id"],
+                            "file_path": entity_data["file_path"],
+                            "created_at": created_at,
+                        },
                     )
+                    for entity_data in entities_to_store.values()
+                ]
+                await upsert_nodes_batch(
+                    self.lightrag.chunk_entity_relation_graph, nodes
+                )
 
-                # Store in entities_vdb
+                # Store in entities_vdb (persisted by the merge stage's flush)
                 await self.lightrag.entities_vdb.upsert(entities_to_store)
-                await self.lightrag.entities_vdb.index_done_callback()
 
                 # NEW: Store multimodal main entities in full_entities storage
                 if doc_id and self.lightrag.full_entities:
@@ -1156,9 +2036,8 @@ class ProcessorMixin:
                     "update_time": int(time.time()),
                 }
 
-            # Store updated data
+            # Store updated data (persisted by the merge stage's flush)
             await self.lightrag.full_entities.upsert({doc_id: doc_entities_data})
-            await self.lightrag.full_entities.index_done_callback()
 
             self.logger.debug(
                 f"Added {len(entities_to_store)} multimodal main entities to full_entities for doc {doc_id}"
@@ -1200,26 +2079,16 @@ class ProcessorMixin:
         return chunk_results
 
     async def _batch_add_belongs_to_relations_type_aware(
-        self, chunk_results: List[Tuple], multimodal_data_list: List[Dict[str, Any]]
+        self, chunk_results: List[Tuple], records: List[MultimodalChunkRecord]
     ) -> List[Tuple]:
         """Add belongs_to relations for multimodal entities"""
         # Create mapping from chunk_id to modal_entity_name
         chunk_to_modal_entity = {}
         chunk_to_file_path = {}
 
-        for data in multimodal_data_list:
-            description = data["description"]
-            content_type = data["content_type"]
-            original_item = data["original_item"]
-
-            # Use the same template formatting as in _convert_to_lightrag_chunks_type_aware
-            formatted_chunk_content = self._apply_chunk_template(
-                content_type, original_item, description
-            )
-            chunk_id = compute_mdhash_id(formatted_chunk_content, prefix="chunk-")
-
-            chunk_to_modal_entity[chunk_id] = data["entity_info"]["entity_name"]
-            chunk_to_file_path[chunk_id] = data.get("file_path", "multimodal_content")
+        for record in records:
+            chunk_to_modal_entity[record.chunk_id] = record.entity_info["entity_name"]
+            chunk_to_file_path[record.chunk_id] = record.file_path
 
         enhanced_chunk_results = []
         belongs_to_count = 0
@@ -1296,7 +2165,7 @@ class ProcessorMixin:
             file_path=file_ref,
         )
 
-        await self.lightrag._insert_done()
+        await self._flush_lightrag_storages()
 
     async def _update_doc_status_with_chunks_type_aware(
         self, doc_id: str, chunk_ids: List[str]
@@ -1310,9 +2179,16 @@ class ProcessorMixin:
                 existing_chunks_list = current_doc_status.get("chunks_list", [])
                 existing_chunks_count = current_doc_status.get("chunks_count", 0)
 
-                # Add multimodal chunks to the standard chunks_list
-                updated_chunks_list = existing_chunks_list + chunk_ids
-                updated_chunks_count = existing_chunks_count + len(chunk_ids)
+                # Add multimodal chunks to the standard chunks_list, skipping
+                # chunks already recorded by an interrupted earlier run
+                existing_chunk_ids = set(existing_chunks_list)
+                new_chunk_ids = [
+                    chunk_id
+                    for chunk_id in chunk_ids
+                    if chunk_id not in existing_chunk_ids
+                ]
+                updated_chunks_list = existing_chunks_list + new_chunk_ids
+                updated_chunks_count = existing_chunks_count + len(new_chunk_ids)
 
                 # Update document status with integrated chunk list
                 await self.lightrag.doc_status.upsert(
@@ -1327,7 +2203,7 @@ class ProcessorMixin:
                 )
 
                 # Ensure doc_status update is persisted to disk
-                await self.lightrag.doc_status.index_done_callback()
+                await self._flush_storages(self.lightrag.doc_status)
 
                 self.logger.info(
                     f"Updated doc_status: added {len(chunk_ids)} multimodal chunks to standard chunks_list "
@@ -1353,7 +2229,7 @@ class ProcessorMixin:
                         }
                     }
                 )
-                await self.lightrag.doc_status.index_done_callback()
+                await self._flush_storages(self.lightrag.doc_status)
                 self.logger.debug(
                     f"Marked multimodal content processing as complete for document {doc_id}"
                 )
@@ -1448,6 +2324,7 @@ class ProcessorMixin:
         split_by_character_only: bool = False,
         doc_id: str | None = None,
         file_name: str | None = None,
+        stats: Dict[str, Any] | None = None,
         **kwargs,
     ):
         """
@@ -1461,7 +2338,13 @@ class ProcessorMixin:
             split_by_character: Optional character to split the text by
             split_by_character_only: If True, split only by the specified character
             doc_id: Optional document ID, if not provided will be generated from content
+            stats: Optional dict that receives per-stage timings ("timings"),
+                content block counts by type ("blocks") and whether the parse
+                cache was hit ("parse_cache_hit") as processing progresses
             **kwargs: Additional parameters for parser (e.g., lang, device, start_page, end_page, formula, table, backend, source)
+
+        Returns:
+            str: Document ID the file was ingested under
         """
         # Ensure LightRAG is initialized
         await self._ensure_lightrag_initialized()
@@ -1475,16 +2358,31 @@ class ProcessorMixin:
             display_stats = self.config.display_content_stats
 
         self.logger.info(f"Starting complete document processing: {file_path}")
+        if stats is None:
+            stats = {}
+        timings = stats.setdefault("timings", {})
 
         # Step 1: Parse document
+        stage_start = time.perf_counter()
         content_list, content_based_doc_id = await self.parse_document(
-            file_path, output_dir, parse_method, display_stats, **kwargs
+            file_path, output_dir, parse_method, display_stats, stats=stats, **kwargs
         )
+        timings["parse"] = time.perf_counter() - stage_start
+
+        blocks = stats.setdefault("blocks", {})
+        for block in content_list:
+            block_type = (
+                block.get("type", "unknown") if isinstance(block, dict) else "unknown"
+            )
+            blocks[block_type] = blocks.get(block_type, 0) + 1
 
         # Use provided doc_id or fall back to content-based doc_id
         if doc_id is None:
             doc_id = content_based_doc_id
 
+        # Track the document in the active storage unit of work, if any
+        self._begin_document_unit(doc_id)
+
         # Step 2: Separate text and multimodal content
         text_content, multimodal_items = separate_content(content_list)
 
@@ -1498,6 +2396,7 @@ class ProcessorMixin:
             )
 
         # Step 3: Insert pure text content with all parameters
+        stage_start = time.perf_counter()
         if text_content.strip():
             if file_name is None:
                 # Use full path or basename based on config
@@ -1515,7 +2414,10 @@ class ProcessorMixin:
             if file_name is None:
                 file_name = self._get_file_reference(file_path)
 
+        timings["text"] = time.perf_counter() - stage_start
+
         # Step 4: Process multimodal content (using specialized processors)
+        stage_start = time.perf_counter()
         if multimodal_items:
             await self._process_multimodal_content(multimodal_items, file_name, doc_id)
         else:
@@ -1526,7 +2428,17 @@ class ProcessorMixin:
                 f"No multimodal content found in document {doc_id}, marked multimodal processing as complete"
             )
 
+        timings["multimodal"] = time.perf_counter() - stage_start
+        if self._merge_batch is not None:
+            # Part of the multimodal stage spent waiting for other documents
+            merge_wait = self._merge_batch.pop_wait_seconds(doc_id)
+            if merge_wait:
+                timings["merge_wait"] = merge_wait
+
+        await self._end_document_unit(doc_id)
+
         self.logger.info(f"Document {file_path} processing complete!")
+        return doc_id
 
     async def process_document_complete_lightrag_api(
         self,
@@ -1802,6 +2714,9 @@ class ProcessorMixin:
         if doc_id is None:
             doc_id = self._generate_content_based_doc_id(content_list)
 
+        # Track the document in the active storage unit of work, if any
+        self._begin_document_unit(doc_id)
+
         # Display content statistics if requested
         if display_stats:
             self.logger.info("\nContent Information:")
@@ -1858,4 +2773,6 @@ class ProcessorMixin:
                 f"No multimodal content found in document {doc_id}, marked multimodal processing as complete"
             )
 
+        await self._end_document_unit(doc_id)
+
         self.logger.info(f"Content list insertion complete for: {file_path}")
@@ -88,6 +88,41 @@ Image details:
 
 Focus on providing accurate, detailed visual analysis that incorporates the context and would be useful for knowledge retrieval."""
 
+# Multi-image analysis prompt for images from the same page
+PROMPTS[
+    "vision_page_prompt"
+] = """Please analyze each of the {image_count} images below, which all appear on the same page of a document. Provide a JSON array with exactly one object per image, in the order the images are given, each with the following structure:
+
+[
+    {{
+        "image_index": 1,
+        "detailed_description": "A comprehensive and detailed visual description of the image following these guidelines:
+        - Describe the overall composition and layout
+        - Identify all objects, people, text, and visual elements
+        - Explain relationships between elements and how they relate to the surrounding context
+        - Note colors, lighting, and visual style
+        - Include technical details if relevant (charts, diagrams, etc.)
+        - Always use specific names instead of pronouns",
+        "entity_info": {{
+            "entity_name": "unique descriptive name for this image",
+            "entity_type": "image",
+            "summary": "concise summary of the image content, its significance, and relationship to surrounding content (max 100 words)"
+        }}
+    }}
+]
+
+Context from surrounding content:
+{context}
+
+Describe each image on its own; do not merge images into one description.
+Return only the JSON array."""
+
+# Per-image details attached before each image of a multi-image request
+PROMPTS["vision_page_image_details"] = """Image {image_number}:
+- Image Path: {image_path}
+- Captions: {captions}
+- Footnotes: {footnotes}"""
+
 # Image analysis prompt with text fallback
 PROMPTS["text_prompt"] = """Based on the following image information, provide analysis:
 
@@ -32,6 +32,7 @@ from raganything.config import RAGAnythingConfig
 from raganything.query import QueryMixin
 from raganything.processor import ProcessorMixin
 from raganything.batch import BatchMixin
+from raganything.token_cache import TokenCountCache
 from raganything.utils import get_processor_supports
 from raganything.parser import MineruParser, DoclingParser
 
@@ -43,7 +44,12 @@ from raganything.modalprocessors import (
     GenericModalProcessor,
     ContextExtractor,
     ContextConfig,
+    ImageTriage,
+    ImageTriageConfig,
 )
+from raganything.equation_analysis import EquationAnalysisConfig
+from raganything.model_router import ModelRouter, ModelRouterConfig
+from raganything.table_analysis import TableAnalysisConfig
 
 
 @dataclass
@@ -61,6 +67,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     vision_model_func: Optional[Callable] = field(default=None)
     """Vision model function for image analysis."""
 
+    small_model_func: Optional[Callable] = field(default=None)
+    """Optional small, fast LLM function for simple tables, equations and generic items."""
+
+    small_vision_model_func: Optional[Callable] = field(default=None)
+    """Optional small, fast vision model function for simple images."""
+
     embedding_func: Optional[Callable] = field(default=None)
     """Embedding function for text vectorization."""
 
@@ -90,12 +102,42 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
     context_extractor: Optional[ContextExtractor] = field(default=None, init=False)
     """Context extractor for providing surrounding content to modal processors."""
 
+    token_cache: Optional[TokenCountCache] = field(default=None, init=False)
+    """Token count cache shared by context extraction and multimodal processing."""
+
+    model_router: Optional[ModelRouter] = field(default=None, init=False)
+    """Router dispatching multimodal description calls to the small or large model tier."""
+
     parse_cache: Optional[Any] = field(default=None, init=False)
     """Parse result cache storage using LightRAG KV storage."""
 
+    multimodal_checkpoint: Optional[Any] = field(default=None, init=False)
+    """Per-item multimodal description checkpoints using LightRAG KV storage."""
+
+    image_description_cache: Optional[Any] = field(default=None, init=False)
+    """Corpus-wide image descriptions keyed by file hash using LightRAG KV storage."""
+
+    equation_description_cache: Optional[Any] = field(default=None, init=False)
+    """Corpus-wide equation descriptions keyed by normalized LaTeX using LightRAG KV storage."""
+
+    multimodal_stats: Dict[str, int] = field(default_factory=dict, init=False)
+    """Multimodal ingestion statistics counters."""
+
     _parser_installation_checked: bool = field(default=False, init=False)
     """Flag to track if parser installation has been checked."""
 
+    _unit_of_work: Optional[Any] = field(default=None, init=False)
+    """Active storage unit of work that defers flushes, if any."""
+
+    _merge_batch: Optional[Any] = field(default=None, init=False)
+    """Active cross-document multimodal merge batch, if any."""
+
+    _parse_executor: Optional[Any] = field(default=None, init=False)
+    """Process pool running parser calls, if one is active."""
+
+    _work_schedulers: Dict[str, Any] = field(default_factory=dict, init=False)
+    """Work schedulers by profile, created on first use."""
+
     def __post_init__(self):
         """Post-initialization setup following LightRAG pattern"""
         # Initialize configuration if not provided
@@ -157,6 +199,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             context_window=self.config.context_window,
             context_mode=self.config.context_mode,
             max_context_tokens=self.config.max_context_tokens,
+            context_assembly=self.config.context_assembly,
             include_headers=self.config.include_headers,
             include_captions=self.config.include_captions,
             filter_content_types=self.config.context_filter_content_types,
@@ -169,9 +212,66 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "LightRAG must be initialized before creating context extractor"
             )
 
+        if self.token_cache is None:
+            self.token_cache = TokenCountCache(
+                tokenizer=self.lightrag.tokenizer,
+                max_size=self.config.token_cache_size,
+                thread_threshold=self.config.token_count_thread_threshold,
+            )
+        else:
+            self.token_cache.set_tokenizer(self.lightrag.tokenizer)
+
         context_config = self._create_context_config()
         return ContextExtractor(
-            config=context_config, tokenizer=self.lightrag.tokenizer
+            config=context_config,
+            tokenizer=self.lightrag.tokenizer,
+            token_cache=self.token_cache,
+        )
+
+    def _create_image_triage(self) -> ImageTriage:
+        """Create image triage from RAGAnything config"""
+        return ImageTriage(
+            ImageTriageConfig(
+                enabled=self.config.enable_image_triage,
+                trivial_action=self.config.image_triage_action,
+                min_side=self.config.image_triage_min_side,
+                min_entropy=self.config.image_triage_min_entropy,
+                min_stddev=self.config.image_triage_min_stddev,
+                min_page_area_ratio=self.config.image_triage_min_page_area_ratio,
+            )
+        )
+
+    def _create_table_analysis_config(self) -> TableAnalysisConfig:
+        """Create table analysis configuration from RAGAnything config"""
+        return TableAnalysisConfig(
+            enabled=self.config.enable_table_analysis,
+            summary_row_threshold=self.config.table_summary_row_threshold,
+            sample_rows=self.config.table_sample_rows,
+            row_group_threshold=self.config.table_row_group_threshold,
+            row_group_size=self.config.table_row_group_size,
+        )
+
+    def _create_model_router(self) -> ModelRouter:
+        """Create the model router from RAGAnything config, keeping existing statistics"""
+        router_config = ModelRouterConfig(
+            enabled=self.config.enable_model_routing,
+            image_max_pixels=self.config.router_image_max_pixels,
+            table_max_cells=self.config.router_table_max_cells,
+            equation_max_complexity=self.config.router_equation_max_complexity,
+            generic_max_chars=self.config.router_generic_max_chars,
+        )
+        if self.model_router is None:
+            self.model_router = ModelRouter(router_config)
+        else:
+            self.model_router.config = router_config
+        return self.model_router
+
+    def _create_equation_analysis_config(self) -> EquationAnalysisConfig:
+        """Create equation analysis configuration from RAGAnything config"""
+        return EquationAnalysisConfig(
+            enabled=self.config.enable_equation_analysis,
+            complexity_threshold=self.config.equation_complexity_threshold,
+            use_cache=self.config.enable_equation_cache,
         )
 
     def _initialize_processors(self):
@@ -183,6 +283,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
 
         # Create context extractor
         self.context_extractor = self._create_context_extractor()
+        model_router = self._create_model_router()
 
         # Create different multimodal processors based on configuration
         self.modal_processors = {}
@@ -192,6 +293,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.vision_model_func or self.llm_model_func,
                 context_extractor=self.context_extractor,
+                small_caption_func=self.small_vision_model_func,
+                model_router=model_router,
+                triage=self._create_image_triage(),
             )
 
         if self.config.enable_table_processing:
@@ -199,6 +303,9 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                table_config=self._create_table_analysis_config(),
+                small_caption_func=self.small_model_func,
+                model_router=model_router,
             )
 
         if self.config.enable_equation_processing:
@@ -206,6 +313,10 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 lightrag=self.lightrag,
                 modal_caption_func=self.llm_model_func,
                 context_extractor=self.context_extractor,
+                equation_config=self._create_equation_analysis_config(),
+                description_cache=self.equation_description_cache,
+                small_caption_func=self.small_model_func,
+                model_router=model_router,
             )
 
         # Always include generic processor as fallback
@@ -213,8 +324,13 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             lightrag=self.lightrag,
             modal_caption_func=self.llm_model_func,
             context_extractor=self.context_extractor,
+            small_caption_func=self.small_model_func,
+            model_router=model_router,
         )
 
+        for processor in self.modal_processors.values():
+            processor.json_mode = self.config.enable_llm_json_mode
+
         self.logger.info("Multimodal processors initialized with context support")
         self.logger.info(f"Available processors: {list(self.modal_processors.keys())}")
         self.logger.info(f"Context configuration: {self._create_context_config()}")
@@ -275,20 +391,12 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
 
                         await initialize_pipeline_status()
 
-                    # Initialize parse cache if not already done
+                    # Initialize parse cache and checkpoints if not already done
                     if self.parse_cache is None:
                         self.logger.info(
                             "Initializing parse cache for pre-provided LightRAG instance"
                         )
-                        self.parse_cache = (
-                            self.lightrag.key_string_value_json_storage_cls(
-                                namespace="parse_cache",
-                                workspace=self.lightrag.workspace,
-                                global_config=self.lightrag.__dict__,
-                                embedding_func=self.embedding_func,
-                            )
-                        )
-                        await self.parse_cache.initialize()
+                    await self._initialize_kv_caches()
 
                     # Initialize processors if not already done
                     if not self.modal_processors:
@@ -341,14 +449,8 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 await self.lightrag.initialize_storages()
                 await initialize_pipeline_status()
 
-                # Initialize parse cache storage using LightRAG's KV storage
-                self.parse_cache = self.lightrag.key_string_value_json_storage_cls(
-                    namespace="parse_cache",
-                    workspace=self.lightrag.workspace,
-                    global_config=self.lightrag.__dict__,
-                    embedding_func=self.embedding_func,
-                )
-                await self.parse_cache.initialize()
+                # Initialize parse cache and checkpoints using LightRAG's KV storage
+                await self._initialize_kv_caches()
 
                 # Initialize processors after LightRAG is ready
                 self._initialize_processors()
@@ -368,6 +470,49 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
             self.logger.error(error_msg, exc_info=True)
             return {"success": False, "error": error_msg}
 
+    def _create_kv_storage(self, namespace: str):
+        """Create a KV storage in the LightRAG workspace for RAGAnything data"""
+        return self.lightrag.key_string_value_json_storage_cls(
+            namespace=namespace,
+            workspace=self.lightrag.workspace,
+            global_config=self.lightrag.__dict__,
+            embedding_func=self.embedding_func,
+        )
+
+    async def _initialize_kv_caches(self):
+        """Initialize parse cache, checkpoint and description cache storages if needed"""
+        if self.parse_cache is None:
+            self.parse_cache = self._create_kv_storage("parse_cache")
+            await self.parse_cache.initialize()
+
+        if (
+            self.config.enable_multimodal_checkpoint
+            and self.multimodal_checkpoint is None
+        ):
+            self.multimodal_checkpoint = self._create_kv_storage(
+                "multimodal_checkpoint"
+            )
+            await self.multimodal_checkpoint.initialize()
+
+        if (
+            self.config.enable_corpus_image_cache
+            and self.image_description_cache is None
+        ):
+            self.image_description_cache = self._create_kv_storage(
+                "image_description_cache"
+            )
+            await self.image_description_cache.initialize()
+
+        if (
+            self.config.enable_equation_analysis
+            and self.config.enable_equation_cache
+            and self.equation_description_cache is None
+        ):
+            self.equation_description_cache = self._create_kv_storage(
+                "equation_description_cache"
+            )
+            await self.equation_description_cache.initialize()
+
     async def finalize_storages(self):
         """Finalize all storages including parse cache and LightRAG storages
 
@@ -398,6 +543,21 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 tasks.append(self.parse_cache.finalize())
                 self.logger.debug("Scheduled parse cache finalization")
 
+            # Finalize multimodal checkpoint storage if it exists
+            if self.multimodal_checkpoint is not None:
+                tasks.append(self.multimodal_checkpoint.finalize())
+                self.logger.debug("Scheduled multimodal checkpoint finalization")
+
+            # Finalize image description cache if it exists
+            if self.image_description_cache is not None:
+                tasks.append(self.image_description_cache.finalize())
+                self.logger.debug("Scheduled image description cache finalization")
+
+            # Finalize equation description cache if it exists
+            if self.equation_description_cache is not None:
+                tasks.append(self.equation_description_cache.finalize())
+                self.logger.debug("Scheduled equation description cache finalization")
+
             # Finalize LightRAG storages if LightRAG is initialized
             if self.lightrag is not None:
                 tasks.append(self.lightrag.finalize_storages())
@@ -450,11 +610,31 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "enable_image_processing": self.config.enable_image_processing,
                 "enable_table_processing": self.config.enable_table_processing,
                 "enable_equation_processing": self.config.enable_equation_processing,
+                "enable_multimodal_checkpoint": self.config.enable_multimodal_checkpoint,
+                "multimodal_checkpoint_interval": self.config.multimodal_checkpoint_interval,
+                "enable_image_dedup": self.config.enable_image_dedup,
+                "image_dedup_max_distance": self.config.image_dedup_max_distance,
+                "enable_corpus_image_cache": self.config.enable_corpus_image_cache,
+                "enable_image_triage": self.config.enable_image_triage,
+                "image_triage_action": self.config.image_triage_action,
+                "enable_page_image_batching": self.config.enable_page_image_batching,
+                "page_image_batch_size": self.config.page_image_batch_size,
+                "enable_table_analysis": self.config.enable_table_analysis,
+                "table_summary_row_threshold": self.config.table_summary_row_threshold,
+                "table_row_group_threshold": self.config.table_row_group_threshold,
+                "enable_equation_analysis": self.config.enable_equation_analysis,
+                "equation_complexity_threshold": self.config.equation_complexity_threshold,
+                "enable_equation_cache": self.config.enable_equation_cache,
+                "enable_model_routing": self.config.enable_model_routing,
+                "enable_llm_json_mode": self.config.enable_llm_json_mode,
             },
             "context_extraction": {
                 "context_window": self.config.context_window,
                 "context_mode": self.config.context_mode,
                 "max_context_tokens": self.config.max_context_tokens,
+                "context_assembly": self.config.context_assembly,
+                "token_cache_size": self.config.token_cache_size,
+                "token_count_thread_threshold": self.config.token_count_thread_threshold,
                 "include_headers": self.config.include_headers,
                 "include_captions": self.config.include_captions,
                 "filter_content_types": self.config.context_filter_content_types,
@@ -463,6 +643,25 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                 "max_concurrent_files": self.config.max_concurrent_files,
                 "supported_file_extensions": self.config.supported_file_extensions,
                 "recursive_folder_processing": self.config.recursive_folder_processing,
+                "flush_policy": self.config.flush_policy,
+                "flush_batch_size": self.config.flush_batch_size,
+                "multimodal_merge_batch_size": self.config.multimodal_merge_batch_size,
+                "use_ingest_queue": self.config.use_ingest_queue,
+                "ingest_max_attempts": self.config.ingest_max_attempts,
+                "use_folder_sync": self.config.use_folder_sync,
+                "watch_debounce_seconds": self.config.watch_debounce_seconds,
+                "watch_batch_size": self.config.watch_batch_size,
+                "use_staged_pipeline": self.config.use_staged_pipeline,
+                "pipeline_parse_workers": self.config.pipeline_parse_workers,
+                "pipeline_describe_workers": self.config.pipeline_describe_workers,
+                "pipeline_store_workers": self.config.pipeline_store_workers,
+                "parse_executor": self.config.parse_executor,
+                "parser_max_tasks_per_worker": self.config.parser_max_tasks_per_worker,
+                "schedule_largest_first": self.config.schedule_largest_first,
+                "distributed_workers": self.config.distributed_workers,
+                "claim_lease_seconds": self.config.claim_lease_seconds,
+                "estimate_llm_seconds_per_call": self.config.estimate_llm_seconds_per_call,
+                "estimate_vlm_seconds_per_call": self.config.estimate_vlm_seconds_per_call,
             },
             "logging": {
                 "note": "Logging fields have been removed - configure logging externally",
@@ -582,4 +781,7 @@ class RAGAnything(QueryMixin, ProcessorMixin, BatchMixin):
                     "enabled": True,
                 }
 
+        if self.token_cache is not None:
+            base_info["token_cache"] = self.token_cache.get_stats()
+
         return base_info
@@ -0,0 +1,113 @@
+"""
+Directory scanning for RAGAnything
+
+Contains a single-pass directory walker shared by folder processing, batch
+parsing and folder sync. Every directory is listed once with os.scandir,
+files are matched against a precomputed suffix set, and size and
+modification time come from the directory entry instead of separate path
+lookups.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import AbstractSet, FrozenSet, Iterable, Iterator, Optional
+
+from lightrag.utils import logger
+
+
+@dataclass(slots=True)
+class ScannedFile:
+    """A file found by scan_files"""
+
+    path: str
+    size: Optional[int] = None  # None when scanned without stat
+    mtime_ns: Optional[int] = None
+
+
+def normalize_suffixes(file_extensions: Iterable[str]) -> FrozenSet[str]:
+    """Build the suffix set matched by has_supported_suffix"""
+    return frozenset(ext.lower() for ext in file_extensions)
+
+
+def has_supported_suffix(name: str, suffixes: AbstractSet[str]) -> bool:
+    """
+    Check whether a file name has one of the supported extensions
+
+    Only the last suffix counts and is compared case-insensitively; names
+    starting with their only dot (hidden files such as ".pdf") never match.
+
+    Args:
+        name: File name without directory
+        suffixes: Set from normalize_suffixes
+
+    Returns:
+        True if the file is supported
+    """
+    dot = name.rfind(".")
+    return dot > 0 and name[dot:].lower() in suffixes
+
+
+def scan_files(
+    root: str,
+    file_extensions: Iterable[str],
+    recursive: bool = True,
+    with_stat: bool = True,
+    follow_symlinks: bool = False,
+) -> Iterator[ScannedFile]:
+    """
+    Walk a folder once and lazily yield files with supported extensions
+
+    Args:
+        root: Folder to scan
+        file_extensions: Extensions to include, with leading dot; matched
+            case-insensitively against the last suffix of the file name
+        recursive: Whether to descend into subfolders
+        with_stat: Whether to fill in size and mtime_ns
+        follow_symlinks: Whether to descend into symlinked folders
+
+    Yields:
+        ScannedFile for every matching file
+    """
+    suffixes = normalize_suffixes(file_extensions)
+    pending = [os.fspath(root)]
+    visited = set()
+
+    while pending:
+        directory = pending.pop()
+        if follow_symlinks:
+            # Symlinks can form cycles, so every real folder is listed once
+            real_path = os.path.realpath(directory)
+            if real_path in visited:
+                continue
+            visited.add(real_path)
+
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            logger.warning(f"Cannot read folder {directory}: {e}")
+            continue
+
+        subdirectories = []
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if recursive:
+                            subdirectories.append(entry.path)
+                        continue
+
+                    if not has_supported_suffix(entry.name, suffixes):
+                        continue
+                    if not entry.is_file():
+                        continue
+
+                    if with_stat:
+                        stat = entry.stat()
+                        yield ScannedFile(entry.path, stat.st_size, stat.st_mtime_ns)
+                    else:
+                        yield ScannedFile(entry.path)
+                except OSError as e:
+                    logger.debug(f"Skipping {entry.path}: {e}")
+
+        # Depth-first in listing order
+        pending.extend(reversed(subdirectories))
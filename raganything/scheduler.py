@@ -0,0 +1,358 @@
+"""
+Size-aware work scheduling for RAGAnything
+
+Contains a cost estimator for input files and the scheduling built on it.
+The cost of a file is estimated from its type, its size and, for PDFs, the
+page count read from the head and tail of the file. Files are ordered
+largest-first (or packed into per-worker bins) so a long document is not
+started last and left running after every other worker is idle. Measured
+durations are compared with the predictions and fold back into per-type
+calibration factors, which are persisted between runs.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from lightrag.utils import logger
+
+from raganything.parser import Parser
+
+# Bytes read from each end of a PDF when looking for the page count
+_PDF_PROBE_BYTES = 256 * 1024
+
+_PDF_PAGES_COUNT = re.compile(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)", re.S)
+_PDF_COUNT_PAGES = re.compile(rb"/Count\s+(\d+)[^>]*?/Type\s*/Pages\b", re.S)
+_PDF_LINEARIZED = re.compile(rb"/Linearized\b[^>]*?/N\s+(\d+)", re.S)
+
+# Prior cost model in seconds: fixed cost, cost per page and cost per MB.
+# These only set the relative order of files until calibration has seen
+# real durations.
+_DEFAULT_COEFFICIENTS: Dict[str, Dict[str, float]] = {
+    "pdf": {"base": 2.0, "per_page": 1.0, "per_mb": 0.2},
+    "office": {"base": 5.0, "per_page": 0.0, "per_mb": 8.0},
+    "image": {"base": 3.0, "per_page": 0.0, "per_mb": 0.5},
+    "text": {"base": 0.5, "per_page": 0.0, "per_mb": 2.0},
+    "other": {"base": 2.0, "per_page": 0.0, "per_mb": 2.0},
+}
+
+# Average PDF page size used when the page count cannot be read
+_PDF_BYTES_PER_PAGE = 100 * 1024
+
+# Weight of a new measurement in the calibration factor
+_CALIBRATION_WEIGHT = 0.2
+
+# Largest change of the calibration factor from one measurement, so outliers
+# such as cache hits do not reset it
+_MAX_CALIBRATION_STEP = math.log(4.0)
+
+
+@dataclass(slots=True)
+class WorkEstimate:
+    """Predicted cost of one file"""
+
+    path: str
+    file_type: str
+    size: int
+    pages: Optional[int]  # None when not known
+    cost: float  # Predicted seconds, including calibration
+
+
+def get_file_type(file_path: str) -> str:
+    """Classify a file as pdf, office, image, text or other by extension"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        return "pdf"
+    if ext in Parser.OFFICE_FORMATS:
+        return "office"
+    if ext in Parser.IMAGE_FORMATS:
+        return "image"
+    if ext in Parser.TEXT_FORMATS:
+        return "text"
+    return "other"
+
+
+def find_pdf_page_counts(data) -> List[int]:
+    """Find the /Count of every page tree node in uncompressed PDF bytes"""
+    return [
+        int(match.group(1))
+        for pattern in (_PDF_PAGES_COUNT, _PDF_COUNT_PAGES)
+        for match in pattern.finditer(data)
+    ]
+
+
+def read_pdf_page_count(file_path: str) -> Optional[int]:
+    """
+    Read the page count of a PDF without parsing it
+
+    Looks at the linearization dictionary at the start of the file and at the
+    page tree near the trailer. Page trees inside compressed object streams
+    are not visible this way.
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        Number of pages, or None when it cannot be found
+    """
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(_PDF_PROBE_BYTES)
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if size > _PDF_PROBE_BYTES:
+                f.seek(max(_PDF_PROBE_BYTES, size - _PDF_PROBE_BYTES))
+                tail = f.read()
+            else:
+                tail = b""
+    except OSError:
+        return None
+
+    match = _PDF_LINEARIZED.search(head)
+    if match:
+        return int(match.group(1))
+
+    # The root of the page tree carries the largest count
+    counts = find_pdf_page_counts(tail) + find_pdf_page_counts(head)
+    return max(counts) if counts else None
+
+
+def pack_estimates(
+    estimates: Iterable[WorkEstimate], bins: int
+) -> List[List[WorkEstimate]]:
+    """
+    Split work into bins of similar total cost
+
+    Uses the longest-processing-time rule: the largest remaining file always
+    goes to the bin with the smallest total so far.
+
+    Args:
+        estimates: Estimated files
+        bins: Number of bins (for example workers or machines)
+
+    Returns:
+        List of bins, each ordered largest-first
+    """
+    packed: List[List[WorkEstimate]] = [[] for _ in range(max(1, bins))]
+    heap = [(0.0, index) for index in range(len(packed))]
+    for estimate in sorted(estimates, key=lambda e: e.cost, reverse=True):
+        total, index = heapq.heappop(heap)
+        packed[index].append(estimate)
+        heapq.heappush(heap, (total + estimate.cost, index))
+    return packed
+
+
+class WorkScheduler:
+    """
+    Cost estimator and scheduler for batch work
+
+    Each scheduler calibrates one profile, such as "parse" for parser calls
+    or "ingest" for complete document ingestion, since the same file costs
+    very different amounts in each. Several profiles can share a calibration
+    file.
+    """
+
+    def __init__(self, calibration_path: Optional[str] = None, profile: str = "parse"):
+        """
+        Initialize work scheduler
+
+        Args:
+            calibration_path: JSON file the calibration is loaded from and
+                saved to (None keeps it in memory)
+            profile: Name of the kind of work being scheduled
+        """
+        self.calibration_path = calibration_path
+        self.profile = profile
+
+        self._lock = threading.Lock()
+        self._estimates: Dict[str, WorkEstimate] = {}
+        # Per file type: scale factor, sample count and mean relative error
+        self._calibration: Dict[str, Dict[str, float]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.calibration_path or not os.path.exists(self.calibration_path):
+            return
+        try:
+            with open(self.calibration_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._calibration = {
+                file_type: dict(values)
+                for file_type, values in data.get("profiles", {})
+                .get(self.profile, {})
+                .items()
+            }
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(
+                f"Ignoring unreadable cost calibration {self.calibration_path}: {e}"
+            )
+
+    def save(self) -> None:
+        """Write the calibration of this profile, keeping other profiles"""
+        if not self.calibration_path:
+            return
+        with self._lock:
+            calibration = {k: dict(v) for k, v in self._calibration.items()}
+
+        data = {"version": 1, "profiles": {}}
+        try:
+            with open(self.calibration_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+        data.setdefault("profiles", {})[self.profile] = calibration
+
+        directory = os.path.dirname(os.path.abspath(self.calibration_path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.calibration_path)
+        except OSError as e:
+            logger.warning(f"Failed to save cost calibration: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _raw_cost(self, file_type: str, size: int, pages: Optional[int]) -> float:
+        coefficients = _DEFAULT_COEFFICIENTS[file_type]
+        if file_type == "pdf" and pages is None:
+            pages = max(1, size // _PDF_BYTES_PER_PAGE)
+        return (
+            coefficients["base"]
+            + coefficients["per_page"] * (pages or 0)
+            + coefficients["per_mb"] * size / (1024 * 1024)
+        )
+
+    def estimate(
+        self,
+        file_path: str,
+        size: Optional[int] = None,
+        pages: Optional[int] = None,
+    ) -> WorkEstimate:
+        """
+        Estimate the cost of a file
+
+        Args:
+            file_path: Path to the file
+            size: File size in bytes, if already known
+            pages: Page count, if already known
+
+        Returns:
+            WorkEstimate of the file
+        """
+        file_type = get_file_type(file_path)
+        if size is None:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+        if pages is None and file_type == "pdf":
+            pages = read_pdf_page_count(file_path)
+
+        with self._lock:
+            scale = self._calibration.get(file_type, {}).get("scale", 1.0)
+        estimate = WorkEstimate(
+            path=file_path,
+            file_type=file_type,
+            size=size,
+            pages=pages,
+            cost=self._raw_cost(file_type, size, pages) * scale,
+        )
+        with self._lock:
+            self._estimates[file_path] = estimate
+        return estimate
+
+    def order(self, file_paths: Iterable[str]) -> List[str]:
+        """
+        Order files largest-first
+
+        With workers that pull the next file when they become free, starting
+        the most expensive files first keeps the batch from ending on a long
+        file while the other workers are idle.
+
+        Args:
+            file_paths: Files to order
+
+        Returns:
+            File paths by decreasing estimated cost
+        """
+        estimates = [self.estimate(file_path) for file_path in file_paths]
+        estimates.sort(key=lambda e: e.cost, reverse=True)
+        return [estimate.path for estimate in estimates]
+
+    def pack(self, file_paths: Iterable[str], bins: int) -> List[List[str]]:
+        """
+        Split files into bins of similar estimated total cost
+
+        Args:
+            file_paths: Files to split
+            bins: Number of bins
+
+        Returns:
+            List of bins of file paths, each ordered largest-first
+        """
+        estimates = [self.estimate(file_path) for file_path in file_paths]
+        return [
+            [estimate.path for estimate in packed]
+            for packed in pack_estimates(estimates, bins)
+        ]
+
+    def record(self, file_path: str, actual_seconds: float) -> None:
+        """
+        Record the measured duration of a file and update the calibration
+
+        The calibration factor of the file type moves towards actual over
+        predicted cost; the first samples of a type weigh the most and a
+        single sample moves it by at most a factor of four.
+
+        Args:
+            file_path: Path to the file
+            actual_seconds: Measured duration
+        """
+        if actual_seconds <= 0:
+            return
+        with self._lock:
+            estimate = self._estimates.pop(file_path, None)
+        if estimate is None:
+            estimate = self.estimate(file_path)
+            with self._lock:
+                self._estimates.pop(file_path, None)
+
+        raw_cost = self._raw_cost(estimate.file_type, estimate.size, estimate.pages)
+        with self._lock:
+            entry = self._calibration.setdefault(
+                estimate.file_type, {"scale": 1.0, "samples": 0, "mean_error": 0.0}
+            )
+            samples = int(entry.get("samples", 0))
+            weight = max(_CALIBRATION_WEIGHT, 1.0 / (samples + 1))
+            # Average in log space so over- and underestimates count alike
+            log_scale = math.log(entry.get("scale", 1.0))
+            step = math.log(actual_seconds / raw_cost) - log_scale
+            step = max(-_MAX_CALIBRATION_STEP, min(_MAX_CALIBRATION_STEP, step))
+            log_scale += weight * step
+            error = abs(actual_seconds - estimate.cost) / actual_seconds
+            entry["scale"] = round(math.exp(log_scale), 6)
+            entry["samples"] = samples + 1
+            entry["mean_error"] = round(
+                entry.get("mean_error", 0.0)
+                + weight * (error - entry.get("mean_error", 0.0)),
+                6,
+            )
+
+        logger.debug(
+            f"{file_path}: predicted {estimate.cost:.1f}s, took {actual_seconds:.1f}s"
+        )
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get calibration factor, sample count and mean relative error per file type"""
+        with self._lock:
+            return {k: dict(v) for k, v in self._calibration.items()}
@@ -0,0 +1,267 @@
+"""
+Local structured analysis of table content
+
+Parses HTML or markdown table bodies into typed columns, computes a schema
+with per-column statistics, and renders compact summaries, row samples and
+row-group chunks so large tables do not have to be sent to the LLM verbatim.
+"""
+
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+@dataclass
+class TableAnalysisConfig:
+    """Configuration for local table analysis"""
+
+    enabled: bool = True
+    summary_row_threshold: int = 50  # Summarize prompts for tables above this
+    sample_rows: int = 20  # Rows included in a summarized prompt
+    row_group_threshold: int = 500  # Split tables above this into row groups
+    row_group_size: int = 100  # Rows per row-group chunk
+
+
+@dataclass
+class ColumnSummary:
+    """Schema and statistics of a single table column"""
+
+    name: str
+    dtype: str  # "numeric" or "text"
+    non_empty: int
+    distinct: int
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    mean: Optional[float] = None
+    top_values: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """Render the column as a single summary line"""
+        parts = [f"{self.non_empty} values", f"{self.distinct} distinct"]
+        if self.dtype == "numeric" and self.minimum is not None:
+            parts.append(
+                f"min={self.minimum:g}, max={self.maximum:g}, mean={self.mean:.4g}"
+            )
+        elif self.top_values:
+            parts.append("top: " + ", ".join(self.top_values))
+        return f"- {self.name} ({self.dtype}): " + "; ".join(parts)
+
+
+class _HTMLTableParser(HTMLParser):
+    """Collect the cell text of every row in an HTML table"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows: List[List[str]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._colspan = 1
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            self._row = []
+        elif tag in ("td", "th") and self._row is not None:
+            self._cell = []
+            try:
+                self._colspan = max(1, int(dict(attrs).get("colspan") or 1))
+            except ValueError:
+                self._colspan = 1
+        elif tag == "br" and self._cell is not None:
+            self._cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self._cell is not None:
+            text = " ".join("".join(self._cell).split())
+            self._row.extend([text] * self._colspan)
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            if self._row:
+                self.rows.append(self._row)
+            self._row = None
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+
+_MARKDOWN_SEPARATOR = re.compile(r"^\s*\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?\s*$")
+_NUMERIC_CLEANUP = re.compile(r"[,\s$€£¥%]")
+
+
+def _parse_rows(table_body: str) -> List[List[str]]:
+    """Split an HTML or markdown table body into rows of cell strings"""
+    if re.search(r"<t[rdh][\s>]", table_body, re.IGNORECASE):
+        parser = _HTMLTableParser()
+        parser.feed(table_body)
+        parser.close()
+        return parser.rows
+
+    rows = []
+    for line in table_body.splitlines():
+        if "|" not in line or _MARKDOWN_SEPARATOR.match(line):
+            continue
+        cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+        rows.append(cells)
+    return rows
+
+
+def _to_number(value: str) -> float:
+    """Convert a cell to float, returning NaN for non-numeric text"""
+    cleaned = _NUMERIC_CLEANUP.sub("", value)
+    if cleaned.startswith("(") and cleaned.endswith(")"):
+        cleaned = "-" + cleaned[1:-1]
+    try:
+        return float(cleaned)
+    except ValueError:
+        return float("nan")
+
+
+class ParsedTable:
+    """Table parsed into a header and a NumPy cell matrix with typed columns"""
+
+    # Share of non-empty cells that must parse as numbers for a numeric column
+    NUMERIC_RATIO = 0.8
+
+    def __init__(self, header: List[str], cells: np.ndarray):
+        """
+        Initialize parsed table
+
+        Args:
+            header: Column names
+            cells: 2D array of cell strings (rows x columns)
+        """
+        self.header = header
+        self.cells = cells
+        self.columns = [
+            self._summarize_column(index) for index in range(len(self.header))
+        ]
+
+    @property
+    def row_count(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def column_count(self) -> int:
+        return self.cells.shape[1]
+
+    def _summarize_column(self, index: int) -> ColumnSummary:
+        """Infer the type of a column and compute its statistics"""
+        values = self.cells[:, index]
+        non_empty = values[values != ""]
+        distinct_values, counts = np.unique(non_empty, return_counts=True)
+
+        numbers = np.array([_to_number(value) for value in non_empty], dtype=float)
+        valid = numbers[~np.isnan(numbers)]
+        if non_empty.size and valid.size >= self.NUMERIC_RATIO * non_empty.size:
+            return ColumnSummary(
+                name=self.header[index],
+                dtype="numeric",
+                non_empty=int(non_empty.size),
+                distinct=int(distinct_values.size),
+                minimum=float(valid.min()),
+                maximum=float(valid.max()),
+                mean=float(valid.mean()),
+            )
+
+        top = distinct_values[np.argsort(-counts, kind="stable")[:3]]
+        return ColumnSummary(
+            name=self.header[index],
+            dtype="text",
+            non_empty=int(non_empty.size),
+            distinct=int(distinct_values.size),
+            top_values=[str(value)[:40] for value in top],
+        )
+
+    def schema(self) -> List[Dict[str, Any]]:
+        """Get the column schema with statistics"""
+        return [
+            {
+                "name": column.name,
+                "dtype": column.dtype,
+                "non_empty": column.non_empty,
+                "distinct": column.distinct,
+                "min": column.minimum,
+                "max": column.maximum,
+                "mean": column.mean,
+            }
+            for column in self.columns
+        ]
+
+    def summary(self) -> str:
+        """Render the table shape and column statistics as text"""
+        lines = [
+            f"Table with {self.row_count} rows and {self.column_count} columns.",
+            "Columns:",
+        ]
+        lines.extend(column.describe() for column in self.columns)
+        return "\n".join(lines)
+
+    def to_markdown(self, row_indices: Optional[np.ndarray] = None) -> str:
+        """Render the header and the selected rows as a markdown table"""
+        rows = self.cells if row_indices is None else self.cells[row_indices]
+        lines = [
+            "| " + " | ".join(self.header) + " |",
+            "|" + "---|" * self.column_count,
+        ]
+        lines.extend("| " + " | ".join(row) + " |" for row in rows)
+        return "\n".join(lines)
+
+    def sample_rows(self, count: int) -> str:
+        """Render evenly spaced rows, always including the first and last row"""
+        if self.row_count <= count:
+            return self.to_markdown()
+        indices = np.unique(np.linspace(0, self.row_count - 1, count).astype(int))
+        return self.to_markdown(indices)
+
+    def prompt_body(self, sample_rows: int) -> str:
+        """Render the summary and a row sample for use in place of the full body"""
+        shown = min(sample_rows, self.row_count)
+        return (
+            f"{self.summary()}\n\n"
+            f"Sample rows ({shown} of {self.row_count}):\n"
+            f"{self.sample_rows(sample_rows)}"
+        )
+
+    def row_groups(self, size: int) -> List[str]:
+        """Split the rows into markdown tables of at most size rows each"""
+        size = max(1, size)
+        return [
+            self.to_markdown(np.arange(start, min(start + size, self.row_count)))
+            for start in range(0, self.row_count, size)
+        ]
+
+
+@lru_cache(maxsize=32)
+def parse_table_body(table_body: str) -> Optional[ParsedTable]:
+    """
+    Parse an HTML or markdown table body into a ParsedTable
+
+    Results are cached because the same body is analyzed for the prompt, the
+    chunk template and row-group chunking.
+
+    Args:
+        table_body: Table body as produced by the document parser
+
+    Returns:
+        ParsedTable, or None if the body has no header and data rows
+    """
+    if not table_body or not isinstance(table_body, str):
+        return None
+
+    rows = _parse_rows(table_body)
+    if len(rows) < 2:
+        return None
+
+    width = max(len(row) for row in rows)
+    header = [
+        name or f"column_{index + 1}"
+        for index, name in enumerate(rows[0] + [""] * (width - len(rows[0])))
+    ]
+    cells = np.array(
+        [row + [""] * (width - len(row)) for row in rows[1:]], dtype=object
+    ).astype(str)
+    return ParsedTable(header, cells)
@@ -0,0 +1,152 @@
+"""
+Token counting cache for RAGAnything
+
+Contains a bounded LRU cache of token counts shared by context extraction,
+multimodal chunk building and storage, so the same string is only encoded once.
+"""
+
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+class TokenCountCache:
+    """
+    Bounded LRU cache of token counts keyed by a digest of the text
+
+    Keys are fixed-size digests so long chunks and context windows do not stay
+    referenced by the cache. Without a tokenizer, the character count is used,
+    matching the character-based fallbacks elsewhere in the pipeline. The cache
+    can be used from worker threads.
+    """
+
+    def __init__(
+        self,
+        tokenizer=None,
+        max_size: int = 8192,
+        thread_threshold: int = 20000,
+    ):
+        """
+        Initialize token count cache
+
+        Args:
+            tokenizer: Tokenizer with an encode() method, or None for character counts
+            max_size: Maximum number of cached counts
+            thread_threshold: Minimum text length (characters) counted in a worker thread by count_async
+        """
+        self.tokenizer = tokenizer
+        self.max_size = max(1, max_size)
+        self.thread_threshold = thread_threshold
+
+        self.hits = 0
+        self.misses = 0
+        self._counts: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_tokenizer(self, tokenizer) -> None:
+        """Replace the tokenizer, dropping counts computed with the previous one"""
+        if tokenizer is self.tokenizer:
+            return
+        self.tokenizer = tokenizer
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all cached counts"""
+        with self._lock:
+            self._counts.clear()
+
+    @staticmethod
+    def _digest(text: str) -> bytes:
+        """Compute the cache key for a text"""
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"), digest_size=16
+        ).digest()
+
+    def _lookup(self, key: bytes) -> Optional[int]:
+        """Return a cached count and refresh its LRU position"""
+        with self._lock:
+            count = self._counts.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._counts.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def _store(self, key: bytes, count: int) -> None:
+        """Cache a count, evicting the least recently used entry if full"""
+        with self._lock:
+            self._counts[key] = count
+            self._counts.move_to_end(key)
+            if len(self._counts) > self.max_size:
+                self._counts.popitem(last=False)
+
+    def _encode_length(self, text: str) -> int:
+        """Count tokens without the cache"""
+        if self.tokenizer is None:
+            return len(text)
+        return len(self.tokenizer.encode(text))
+
+    def count(self, text: str) -> int:
+        """
+        Count tokens of a text, using the cache when possible
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens (characters when no tokenizer is set)
+        """
+        if not text:
+            return 0
+        if self.tokenizer is None:
+            return len(text)
+
+        key = self._digest(text)
+        count = self._lookup(key)
+        if count is None:
+            count = self._encode_length(text)
+            self._store(key, count)
+        return count
+
+    async def count_async(self, text: str) -> int:
+        """
+        Count tokens of a text without blocking the event loop on long texts
+
+        Texts of at least thread_threshold characters are encoded in a worker
+        thread; shorter texts are counted inline since the thread hand-off
+        would cost more than the encoding.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens (characters when no tokenizer is set)
+        """
+        if not text or self.tokenizer is None or len(text) < self.thread_threshold:
+            return self.count(text)
+
+        key = self._digest(text)
+        count = self._lookup(key)
+        if count is None:
+            count = await asyncio.to_thread(self._encode_length, text)
+            self._store(key, count)
+        return count
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "size": len(self._counts),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
@@ -0,0 +1,246 @@
+"""
+Deferred storage flushing for RAGAnything ingestion
+
+Contains the unit-of-work that collects storage flushes issued by the
+multimodal processing stages and persists them once per document or once per
+batch of documents, together with a crash-recovery marker that records which
+documents have writes that are not yet durable.
+"""
+
+import asyncio
+import json
+import os
+import time
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from lightrag.utils import logger
+
+
+class FlushPolicy(str, Enum):
+    """Durability policy for storage flushes during ingestion"""
+
+    IMMEDIATE = "immediate"  # Flush after every stage (default behaviour)
+    DOCUMENT = "document"  # Flush once per completed document
+    BATCH = "batch"  # Flush once every N completed documents
+
+
+class StorageUnitOfWork:
+    """
+    Collects deferred storage flushes and persists them according to a policy
+
+    Stages call defer()/defer_lightrag() instead of flushing. Documents are
+    bracketed with begin_document()/end_document(); every begun document is
+    listed in an on-disk marker until a flush that happens after its completion
+    has made its writes durable. Documents left in the marker after a crash are
+    reprocessed on the next run. Callers that record completion elsewhere (such
+    as a job queue) register it with when_durable().
+    """
+
+    def __init__(
+        self,
+        lightrag,
+        marker_path: str,
+        policy: FlushPolicy = FlushPolicy.DOCUMENT,
+        batch_size: int = 1,
+    ):
+        """
+        Initialize unit of work
+
+        Args:
+            lightrag: LightRAG instance whose storages are flushed with _insert_done
+            marker_path: Path of the crash-recovery marker file
+            policy: Flush policy
+            batch_size: Number of completed documents per flush for the batch policy
+        """
+        self.lightrag = lightrag
+        self.marker_path = marker_path
+        self.policy = FlushPolicy(policy)
+        self.batch_size = max(1, batch_size)
+
+        self.flush_count = 0
+        self._dirty_storages: Dict[int, Any] = {}
+        self._lightrag_dirty = False
+        self._in_progress: Set[str] = set()
+        self._completed: List[str] = []
+        self._flushing: Set[str] = set()
+        self._durable_callbacks: Dict[str, List[Callable[[], Awaitable[Any]]]] = {}
+        self._next_flush_callbacks: List[Callable[[], Awaitable[Any]]] = []
+        self._lock = asyncio.Lock()
+
+    def defer(self, *storages) -> None:
+        """Record storages whose index_done_callback should run at the next flush"""
+        for storage in storages:
+            if storage is not None:
+                self._dirty_storages[id(storage)] = storage
+
+    def defer_lightrag(self) -> None:
+        """Record that all LightRAG storages need to be flushed"""
+        self._lightrag_dirty = True
+
+    def begin_document(self, doc_id: str) -> None:
+        """Mark a document as having writes that are not yet durable"""
+        if doc_id in self._in_progress:
+            return
+        self._in_progress.add(doc_id)
+        self._write_marker()
+
+    async def end_document(self, doc_id: str) -> None:
+        """Mark a document as complete and flush if the policy requires it"""
+        self._in_progress.discard(doc_id)
+        self._completed.append(doc_id)
+
+        if self.policy == FlushPolicy.DOCUMENT or (
+            self.policy == FlushPolicy.BATCH and len(self._completed) >= self.batch_size
+        ):
+            await self.flush()
+
+    async def when_durable(
+        self, doc_id: str, callback: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """
+        Run a callback once the writes of a document have been flushed
+
+        The callback runs after the flush that persists the document's writes.
+        For a document not tracked with begin_document() it runs after the next
+        flush if any storage has deferred writes, otherwise right away.
+
+        Args:
+            doc_id: Document ID
+            callback: Coroutine function to await
+        """
+        if (
+            doc_id in self._in_progress
+            or doc_id in self._completed
+            or doc_id in self._flushing
+        ):
+            self._durable_callbacks.setdefault(doc_id, []).append(callback)
+        elif self._lightrag_dirty or self._dirty_storages:
+            self._next_flush_callbacks.append(callback)
+        else:
+            await callback()
+
+    async def flush(self) -> None:
+        """Flush all deferred storages and clear completed documents from the marker"""
+        async with self._lock:
+            completed = self._completed
+            self._completed = []
+            self._flushing.update(completed)
+            callbacks = self._next_flush_callbacks
+            self._next_flush_callbacks = []
+
+            storages = list(self._dirty_storages.values())
+            flush_lightrag = self._lightrag_dirty
+            if flush_lightrag or storages:
+                self._dirty_storages.clear()
+                self._lightrag_dirty = False
+
+                tasks = [storage.index_done_callback() for storage in storages]
+                if flush_lightrag:
+                    tasks.append(self.lightrag._insert_done())
+                try:
+                    await asyncio.gather(*tasks)
+                except BaseException:
+                    # Keep everything pending so the next flush retries it and
+                    # the marker still lists the unflushed documents
+                    for storage in storages:
+                        self._dirty_storages.setdefault(id(storage), storage)
+                    self._lightrag_dirty = self._lightrag_dirty or flush_lightrag
+                    self._completed = completed + self._completed
+                    self._next_flush_callbacks = callbacks + self._next_flush_callbacks
+                    self._flushing.clear()
+                    self._write_marker()
+                    raise
+                self.flush_count += 1
+
+            self._flushing.clear()
+            callbacks.extend(
+                callback
+                for doc_id in completed
+                for callback in self._durable_callbacks.pop(doc_id, [])
+            )
+            if completed:
+                logger.debug(
+                    f"Flushed storages for {len(completed)} completed documents"
+                )
+            self._write_marker()
+
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.warning(f"Callback after flush failed: {e}")
+
+    def _write_marker(self) -> None:
+        """Atomically persist the set of documents with non-durable writes"""
+        # Completed documents stay listed until a flush has persisted them
+        pending = self._in_progress.union(self._completed, self._flushing)
+        try:
+            if not pending:
+                if os.path.exists(self.marker_path):
+                    os.remove(self.marker_path)
+                return
+
+            tmp_path = f"{self.marker_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "doc_ids": sorted(pending),
+                        "updated_at": time.time(),
+                    },
+                    f,
+                )
+            os.replace(tmp_path, self.marker_path)
+        except OSError as e:
+            logger.warning(f"Failed to update flush marker {self.marker_path}: {e}")
+
+    @staticmethod
+    def read_marker(marker_path: str) -> List[str]:
+        """
+        Read document IDs left in a crash-recovery marker
+
+        Args:
+            marker_path: Path of the marker file
+
+        Returns:
+            List of document IDs whose writes may not have been flushed
+        """
+        if not os.path.exists(marker_path):
+            return []
+
+        try:
+            with open(marker_path, "r", encoding="utf-8") as f:
+                return list(json.load(f).get("doc_ids", []))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable flush marker {marker_path}: {e}")
+            return []
+
+    @staticmethod
+    def clear_marker(marker_path: str) -> None:
+        """Remove a crash-recovery marker after recovery has been handled"""
+        try:
+            os.remove(marker_path)
+        except FileNotFoundError:
+            pass
+
+
+def resolve_flush_policy(policy: Optional[str]) -> FlushPolicy:
+    """
+    Convert a policy name to FlushPolicy
+
+    Args:
+        policy: Policy name ("immediate", "document" or "batch")
+
+    Returns:
+        FlushPolicy value
+
+    Raises:
+        ValueError: If the policy name is unknown
+    """
+    try:
+        return FlushPolicy(str(policy).lower())
+    except ValueError:
+        raise ValueError(
+            f"Unsupported flush policy: {policy}. "
+            f"Use one of: {', '.join(p.value for p in FlushPolicy)}"
+        )
@@ -4,11 +4,20 @@ Utility functions for RAGAnything
 Contains helper functions for content separation, text insertion, and other utilities
 """
 
+import asyncio
 import base64
-from typing import Dict, List, Any, Tuple
+import hashlib
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
 from lightrag.utils import logger
 
+try:
+    from PIL import Image
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
 
 def separate_content(
     content_list: List[Dict[str, Any]],
@@ -139,6 +148,117 @@ def validate_image_file(image_path: str, max_size_mb: int = 50) -> bool:
         return False
 
 
+def compute_file_hash(file_path: str) -> Optional[str]:
+    """
+    Compute the SHA-256 hash of a file's bytes
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex digest, or None if the file cannot be read
+    """
+    try:
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    except OSError as e:
+        logger.debug(f"Failed to hash file {file_path}: {e}")
+        return None
+
+
+def compute_image_dhash(image_path: str, hash_size: int = 8) -> Optional[int]:
+    """
+    Compute the difference hash (dHash) of an image
+
+    The image is reduced to a (hash_size + 1) x hash_size grayscale thumbnail
+    and each bit records whether a pixel is brighter than its right neighbour,
+    so re-encoded or slightly rescaled copies of the same picture hash to
+    values within a small Hamming distance.
+
+    Args:
+        image_path: Path to the image file
+        hash_size: Hash width and height (the hash has hash_size**2 bits)
+
+    Returns:
+        Hash as an integer, or None if Pillow is missing or the image cannot be read
+    """
+    if not PIL_AVAILABLE:
+        return None
+
+    try:
+        with Image.open(image_path) as img:
+            pixels = list(
+                img.convert("L")
+                .resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+                .getdata()
+            )
+    except Exception as e:
+        logger.debug(f"Failed to compute perceptual hash for {image_path}: {e}")
+        return None
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    """Count differing bits between two perceptual hashes"""
+    return (hash_a ^ hash_b).bit_count()
+
+
+def group_near_duplicate_images(
+    image_hashes: Dict[int, Tuple[Optional[int], Optional[str]]],
+    max_distance: int = 4,
+) -> Dict[int, int]:
+    """
+    Group images whose perceptual hashes are within a Hamming distance
+
+    Images without a perceptual hash fall back to exact file hash matching.
+
+    Args:
+        image_hashes: Mapping of item index to (perceptual hash, file hash)
+        max_distance: Maximum Hamming distance for two images to be duplicates
+
+    Returns:
+        Mapping of duplicate item index to the index of its representative
+    """
+    duplicates = {}
+    by_file_hash: Dict[str, int] = {}
+    representatives: List[Tuple[int, int]] = []
+
+    for index in sorted(image_hashes):
+        phash, file_hash = image_hashes[index]
+
+        # Byte-identical files are duplicates regardless of the perceptual hash
+        if file_hash is not None and file_hash in by_file_hash:
+            duplicates[index] = by_file_hash[file_hash]
+            continue
+
+        representative = None
+        if phash is not None:
+            for rep_index, rep_hash in representatives:
+                if hamming_distance(phash, rep_hash) <= max_distance:
+                    representative = rep_index
+                    break
+
+        if representative is not None:
+            duplicates[index] = representative
+            continue
+
+        if file_hash is not None:
+            by_file_hash[file_hash] = index
+        if phash is not None:
+            representatives.append((index, phash))
+
+    return duplicates
+
+
 async def insert_text_content(
     lightrag,
     input: str | list[str],
@@ -221,6 +341,97 @@ async def insert_text_content_with_multimodal_content(
     logger.info("Text content insertion complete")
 
 
+def _has_native_batch_method(storage, method_name: str) -> bool:
+    """Check whether a storage backend implements its own bulk method
+
+    LightRAG's base graph storage ships serial fallbacks for the bulk methods,
+    so only an override in the concrete backend counts as native support.
+    """
+    method = getattr(type(storage), method_name, None)
+    if method is None:
+        return False
+
+    try:
+        from lightrag.base import BaseGraphStorage
+    except ImportError:
+        return True
+
+    return method is not getattr(BaseGraphStorage, method_name, None)
+
+
+async def upsert_nodes_batch(
+    graph_storage,
+    nodes: List[Tuple[str, Dict[str, Any]]],
+    max_concurrency: int = 16,
+) -> None:
+    """
+    Upsert multiple knowledge graph nodes in one call
+
+    Uses the backend's bulk node upsert when it provides one, otherwise runs
+    individual upserts concurrently.
+
+    Args:
+        graph_storage: LightRAG graph storage instance
+        nodes: List of (node_id, node_data) tuples
+        max_concurrency: Maximum concurrent upserts for backends without bulk support
+    """
+    if not nodes:
+        return
+
+    if _has_native_batch_method(graph_storage, "upsert_nodes_batch"):
+        await graph_storage.upsert_nodes_batch(nodes)
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def upsert_single_node(node_id: str, node_data: Dict[str, Any]):
+        async with semaphore:
+            await graph_storage.upsert_node(node_id, node_data)
+
+    await asyncio.gather(
+        *(upsert_single_node(node_id, node_data) for node_id, node_data in nodes)
+    )
+
+
+async def upsert_edges_batch(
+    graph_storage,
+    edges: List[Tuple[str, str, Dict[str, Any]]],
+    max_concurrency: int = 16,
+) -> None:
+    """
+    Upsert multiple knowledge graph edges in one call
+
+    Uses the backend's bulk edge upsert when it provides one, otherwise runs
+    individual upserts concurrently.
+
+    Args:
+        graph_storage: LightRAG graph storage instance
+        edges: List of (source_id, target_id, edge_data) tuples
+        max_concurrency: Maximum concurrent upserts for backends without bulk support
+    """
+    if not edges:
+        return
+
+    if _has_native_batch_method(graph_storage, "upsert_edges_batch"):
+        await graph_storage.upsert_edges_batch(edges)
+        return
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def upsert_single_edge(
+        source_id: str, target_id: str, edge_data: Dict[str, Any]
+    ):
+        async with semaphore:
+            await graph_storage.upsert_edge(source_id, target_id, edge_data)
+
+    await asyncio.gather(
+        *(
+            upsert_single_edge(source_id, target_id, edge_data)
+            for source_id, target_id, edge_data in edges
+        )
+    )
+
+
 def get_processor_for_type(modal_processors: Dict[str, Any], content_type: str):
     """
     Get appropriate processor based on content type